@@ -3,11 +3,22 @@ import random
 import time
 import os
 import threading
-from dataclasses import dataclass
-from collections import defaultdict
-from typing import TYPE_CHECKING, Optional, Tuple, List, Dict, NamedTuple
+from array import array
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, NamedTuple, Optional, Tuple, List, Dict
 from enum import Enum
 
+from core.bitboard import (
+    Bitboard, EMPTY, WP, WN, WB, WR, WQ, WK, BP, BN, BB, BR, BQ, BK,
+    WHITE, BLACK, PIECE_CODES, PIECE_NAMES,
+    KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, PAWN_SHIELD, ROOK_ATTACKS, ROOK_MASKS,
+    BISHOP_ATTACKS, BISHOP_MASKS, ZOBRIST, ZOBRIST_SIDE, FULL_BOARD,
+    RANK_1, RANK_3, RANK_6, RANK_8, FILE_A, FILE_H, FILE_MASKS, PASSED_PAWN_MASKS,
+    popcount, square_attacked, zobrist_key
+)
+
 if TYPE_CHECKING:
     from core.game_state import GameState
     from core.move import Move
@@ -30,285 +41,359 @@ class AIConfig:
     use_null_move_pruning: bool = True
     use_lmr: bool = True
     use_killer_moves: bool = True
+    search_workers: int = 1  # >1 enables Lazy SMP helper processes sharing the TT
     
     # Evaluation weights
     piece_values: Dict[str, int] = None
+    # piece_values re-indexed by piece code (see core.bitboard), for the hot paths
+    piece_value_table: Tuple[int, ...] = field(init=False, repr=False)
     
     def __post_init__(self):
         if self.piece_values is None:
             self.piece_values = {"K": 0, "Q": 900, "R": 500, "B": 330, "N": 320, "p": 100}
+        self.piece_value_table = tuple(
+            self.piece_values.get(name[1], 0) if code != EMPTY else 0
+            for code, name in enumerate(PIECE_NAMES)
+        )
 
 class MoveType(Enum):
     ALL = "all"
     CAPTURES = "captures"
     QUIET = "quiet"
 
-class Move(NamedTuple):
-    """Lightweight move representation"""
-    from_row: int
-    from_col: int
-    to_row: int  
-    to_col: int
-    piece: str = ""
-    captured: str = ""
-    special_flag: str = ""  # promotion, castle, en_passant
+# Internal moves are packed into a single int:
+# bits 0-5 to-square, 6-11 from-square, 12-15 moving piece, 16-19 captured piece, 20+ flags
+# (squares are row * 8 + col, pieces are core.bitboard codes)
+FLAG_PROMOTION = 1 << 20
+FLAG_EN_PASSANT = 1 << 21
+FLAG_CASTLE = 1 << 22
+CAPTURED_MASK = 0xF << 16
+
+MAX_PLY = 128
+
+# With a clock, each move may plan on SOFT_TIME_SHARE of the remaining time and
+# never search past HARD_TIME_SHARE of it
+SOFT_TIME_SHARE = 0.10
+HARD_TIME_SHARE = 0.25
+DEFAULT_BRANCHING = 4.0  # assumed until two iterations have been timed
+
+def index_moves(moves: List) -> Dict[Tuple[int, int, int, int], Move]:
+    """GUI moves keyed by (start_row, start_col, end_row, end_col) for O(1) lookup"""
+    return {(move.start_row, move.start_col, move.end_row, move.end_col): move for move in moves}
 
-class TranspositionEntry(NamedTuple):
-    """Transposition table entry"""
-    score: int
-    depth: int
-    flag: int  # EXACT, LOWER_BOUND, UPPER_BOUND
-    best_move: Optional[Move]
-    age: int
+
+def encode_move(from_sq: int, to_sq: int, piece: int, captured: int = EMPTY, flags: int = 0) -> int:
+    return to_sq | (from_sq << 6) | (piece << 12) | (captured << 16) | flags
 
 class TranspositionTable:
-    """High-performance transposition table"""
+    """High-performance transposition table
+    
+    Entries are interleaved in one flat ``array('Q')`` as two-entry buckets
+    ``[key0, data0, key1, data1]``, so a probe touches a single 32-byte span.
+    Slot 0 is depth-preferred, slot 1 is always-replace. Each data word packs
+    one entry: bits 0-22 best move, 23-46 score (offset by SCORE_BIAS),
+    47-54 depth, 55-56 flag, 57-63 age.
+    
+    The key word holds ``key ^ data`` so an entry torn by a concurrent writer
+    (Lazy SMP helpers share ``buffer``) fails verification instead of
+    returning another position's data.
+    
+    Probes that hit but cannot cut off forget the entry with probability
+    ``forget_rate``, so an entry poisoned by a key collision eventually heals
+    without rehashing the table.
+    """
     
     EXACT = 0
     LOWER_BOUND = 1
     UPPER_BOUND = 2
     
-    def __init__(self, size_mb: int = 64):
-        self.size = (size_mb * 1024 * 1024) // 32  # ~32 bytes per entry
-        self.table: Dict[int, TranspositionEntry] = {}
+    SCORE_BIAS = 1 << 23
+    
+    def __init__(self, size_mb: int = 64, buffer=None, forget_rate: float = 0.1):
+        self.forget_rate = forget_rate
+        self.buckets = self.bucket_count(size_mb)
+        self.size = self.buckets * 2
+        self.mask = self.buckets - 1
+        self.buffer = buffer
+        if buffer is not None:
+            self.table = memoryview(buffer).cast('Q')
+        else:
+            self.table = array('Q', bytes(32 * self.buckets))
         self.generation = 0
         self.hits = 0
         self.misses = 0
+    
+    @staticmethod
+    def bucket_count(size_mb: int) -> int:
+        buckets = (size_mb * 1024 * 1024) // 32  # 2 entries x 16 bytes per bucket
+        return 1 << max(buckets.bit_length() - 1, 9)
 
     def clear(self):
-        self.table.clear()
+        if self.buffer is not None:
+            self.buffer[:32 * self.buckets] = bytes(32 * self.buckets)
+        else:
+            self.table = array('Q', bytes(32 * self.buckets))
         self.generation = 0
         self.hits = 0
         self.misses = 0
     
     def new_search(self):
         self.generation += 1
+        # Hit rate is reported per search, not accumulated over the game
+        self.hits = 0
+        self.misses = 0
     
-    def store(self, key: int, depth: int, score: int, flag: int, best_move: Optional[Move] = None):
-        if key in self.table:
-            old_entry = self.table[key]
-            # Replace if deeper or newer
-            if depth >= old_entry.depth or abs(self.generation - old_entry.age) > 2:
-                self.table[key] = TranspositionEntry(score, depth, flag, best_move, self.generation)
+    def store(self, key: int, depth: int, score: int, flag: int, best_move: Optional[int] = None):
+        table = self.table
+        index = (key & self.mask) << 2
+        data = ((best_move or 0) |
+                (score + self.SCORE_BIAS) << 23 |
+                depth << 47 |
+                flag << 55 |
+                (self.generation & 0x7F) << 57)
+        
+        # Depth-preferred slot: take it when empty, same position, not shallower or stale
+        old_data = table[index + 1]
+        old_key = table[index] ^ old_data
+        if (not old_data or old_key == key or depth >= old_data >> 47 & 0xFF or
+                (self.generation - (old_data >> 57)) & 0x7F > 2):
+            if old_data and old_key != key:
+                # Demote the displaced entry to the always-replace slot
+                table[index + 2] = old_key ^ old_data
+                table[index + 3] = old_data
+            table[index] = key ^ data
+            table[index + 1] = data
         else:
-            if len(self.table) < self.size:
-                self.table[key] = TranspositionEntry(score, depth, flag, best_move, self.generation)
+            table[index + 2] = key ^ data
+            table[index + 3] = data
     
-    def probe(self, key: int, depth: int, alpha: int, beta: int) -> Tuple[Optional[int], Optional[Move]]:
-        if key not in self.table:
+    def probe(self, key: int, depth: int, alpha: int, beta: int) -> Tuple[Optional[int], Optional[int]]:
+        table = self.table
+        index = (key & self.mask) << 2
+        data = table[index + 1]
+        if not data or table[index] ^ data != key:
+            index += 2
+            data = table[index + 1]
+            if not data or table[index] ^ data != key:
+                data = 0
+        if not data:
             self.misses += 1
             return None, None
         
         self.hits += 1
-        entry = self.table[key]
-        
-        if entry.depth >= depth:
-            if entry.flag == self.EXACT:
-                return entry.score, entry.best_move
-            elif entry.flag == self.LOWER_BOUND and entry.score >= beta:
-                return entry.score, entry.best_move
-            elif entry.flag == self.UPPER_BOUND and entry.score <= alpha:
-                return entry.score, entry.best_move
-        
-        return None, entry.best_move
+        best_move = (data & 0x7FFFFF) or None
+        
+        if data >> 47 & 0xFF >= depth:
+            score = (data >> 23 & 0xFFFFFF) - self.SCORE_BIAS
+            flag = data >> 55 & 3
+            if flag == self.EXACT:
+                return score, best_move
+            elif flag == self.LOWER_BOUND and score >= beta:
+                return score, best_move
+            elif flag == self.UPPER_BOUND and score <= alpha:
+                return score, best_move
+        
+        # Forgetful probe: only entries that did not produce a cutoff are dropped
+        if random.random() < self.forget_rate:
+            table[index] = 0
+            table[index + 1] = 0
+        
+        return None, best_move
     
     def get_hit_rate(self) -> float:
         total = self.hits + self.misses
         return self.hits / total if total > 0 else 0.0
 
 class MoveGenerator:
-    """Unified move generation system"""
+    """Unified move generation system
     
-    @staticmethod
-    def is_valid_square(row: int, col: int) -> bool:
-        return 0 <= row < 8 and 0 <= col < 8
+    Captures and quiet moves have separate generators so neither tests the
+    move type (or whether a target is occupied) inside its loops.
+    """
     
     @staticmethod
-    def generate_moves(board: List[List[str]], is_white_turn: bool, move_type: MoveType = MoveType.ALL) -> List[Move]:
-        """Generate moves of specified type"""
-        moves = []
-        color = 'w' if is_white_turn else 'b'
-        
-        for row in range(8):
-            for col in range(8):
-                piece = board[row][col]
-                if piece != "--" and piece[0] == color:
-                    piece_moves = MoveGenerator._get_piece_moves(board, row, col, piece, move_type)
-                    moves.extend(piece_moves)
-        
-        return moves
+    def generate_moves(bb: Bitboard, is_white_turn: bool, move_type: MoveType = MoveType.ALL) -> List[int]:
+        """Generate packed moves of specified type"""
+        if move_type is MoveType.CAPTURES:
+            return MoveGenerator.generate_captures(bb, is_white_turn)
+        if move_type is MoveType.QUIET:
+            return MoveGenerator.generate_quiets(bb, is_white_turn)
+        return MoveGenerator.generate_all(bb, is_white_turn)
     
     @staticmethod
-    def _get_piece_moves(board: List[List[str]], row: int, col: int, piece: str, move_type: MoveType) -> List[Move]:
-        """Get moves for a specific piece"""
-        piece_type = piece[1].lower()
-        color = piece[0]
-        
-        if piece_type == 'p':
-            return MoveGenerator._get_pawn_moves(board, row, col, color, move_type)
-        elif piece_type == 'r':
-            return MoveGenerator._get_sliding_moves(board, row, col, color, 
-                                                  [(0,1), (0,-1), (1,0), (-1,0)], move_type)
-        elif piece_type == 'n':
-            return MoveGenerator._get_knight_moves(board, row, col, color, move_type)
-        elif piece_type == 'b':
-            return MoveGenerator._get_sliding_moves(board, row, col, color,
-                                                  [(1,1), (1,-1), (-1,1), (-1,-1)], move_type)
-        elif piece_type == 'q':
-            return MoveGenerator._get_sliding_moves(board, row, col, color,
-                                                  [(0,1), (0,-1), (1,0), (-1,0), (1,1), (1,-1), (-1,1), (-1,-1)], move_type)
-        elif piece_type == 'k':
-            return MoveGenerator._get_king_moves(board, row, col, color, move_type)
-        
-        return []
+    def generate_all(bb: Bitboard, is_white_turn: bool) -> List[int]:
+        """Every pseudo-legal move, captures first"""
+        moves = MoveGenerator.generate_captures(bb, is_white_turn)
+        moves += MoveGenerator.generate_quiets(bb, is_white_turn)
+        return moves
     
     @staticmethod
-    def _get_pawn_moves(board: List[List[str]], row: int, col: int, color: str, move_type: MoveType) -> List[Move]:
+    def generate_captures(bb: Bitboard, is_white_turn: bool) -> List[int]:
+        """Pseudo-legal captures, including capturing promotions"""
         moves = []
-        direction = -1 if color == 'w' else 1
-        start_row = 6 if color == 'w' else 1
-        
-        # Forward moves (quiet)
-        if move_type in [MoveType.ALL, MoveType.QUIET]:
-            new_row = row + direction
-            if MoveGenerator.is_valid_square(new_row, col) and board[new_row][col] == "--":
-                moves.append(Move(row, col, new_row, col, piece=color+'p'))
-                
-                # Double move
-                if row == start_row and board[new_row + direction][col] == "--":
-                    moves.append(Move(row, col, new_row + direction, col, piece=color+'p'))
-        
-        # Captures
-        if move_type in [MoveType.ALL, MoveType.CAPTURES]:
-            for dc in [-1, 1]:
-                new_row, new_col = row + direction, col + dc
-                if (MoveGenerator.is_valid_square(new_row, new_col) and 
-                    board[new_row][new_col] != "--" and 
-                    board[new_row][new_col][0] != color):
-                    moves.append(Move(row, col, new_row, new_col, piece=color+'p', 
-                                    captured=board[new_row][new_col]))
+        append = moves.append
+        pieces = bb.pieces
+        mailbox = bb.mailbox
+        occupied = bb.white | bb.black
+        if is_white_turn:
+            enemy, first = bb.black, WP
+        else:
+            enemy, first = bb.white, BP
+        
+        MoveGenerator._get_pawn_captures(bb, is_white_turn, moves)
+        
+        # Queens are visited twice: once along diagonals and once along ranks/files
+        for piece, attacks, masks in ((first + 1, KNIGHT_ATTACKS, None),
+                                      (first + 2, BISHOP_ATTACKS, BISHOP_MASKS),
+                                      (first + 4, BISHOP_ATTACKS, BISHOP_MASKS),
+                                      (first + 3, ROOK_ATTACKS, ROOK_MASKS),
+                                      (first + 4, ROOK_ATTACKS, ROOK_MASKS),
+                                      (first + 5, KING_ATTACKS, None)):
+            piece_bb = pieces[piece]
+            piece_bits = piece << 12
+            while piece_bb:
+                sq = (piece_bb & -piece_bb).bit_length() - 1
+                piece_bb &= piece_bb - 1
+                if masks is None:
+                    targets = attacks[sq] & enemy
+                else:
+                    targets = attacks[sq][occupied & masks[sq]] & enemy
+                base = (sq << 6) | piece_bits
+                while targets:
+                    to_bit = targets & -targets
+                    targets ^= to_bit
+                    to_sq = to_bit.bit_length() - 1
+                    append(base | to_sq | (mailbox[to_sq] << 16))
         
         return moves
     
     @staticmethod
-    def _get_sliding_moves(board: List[List[str]], row: int, col: int, color: str, 
-                          directions: List[Tuple[int, int]], move_type: MoveType) -> List[Move]:
+    def generate_quiets(bb: Bitboard, is_white_turn: bool) -> List[int]:
+        """Pseudo-legal non-captures, including pushes to the promotion rank"""
         moves = []
-        piece = board[row][col]
-        
-        for dr, dc in directions:
-            for i in range(1, 8):
-                new_row, new_col = row + i * dr, col + i * dc
-                if not MoveGenerator.is_valid_square(new_row, new_col):
-                    break
-                
-                target = board[new_row][new_col]
-                if target == "--":
-                    if move_type in [MoveType.ALL, MoveType.QUIET]:
-                        moves.append(Move(row, col, new_row, new_col, piece=piece))
-                elif target[0] != color:
-                    if move_type in [MoveType.ALL, MoveType.CAPTURES]:
-                        moves.append(Move(row, col, new_row, new_col, piece=piece, captured=target))
-                    break
+        append = moves.append
+        pieces = bb.pieces
+        occupied = bb.white | bb.black
+        empty = ~occupied & FULL_BOARD
+        first = WP if is_white_turn else BP
+        
+        MoveGenerator._get_pawn_pushes(bb, is_white_turn, moves)
+        
+        for piece, attacks, masks in ((first + 1, KNIGHT_ATTACKS, None),
+                                      (first + 2, BISHOP_ATTACKS, BISHOP_MASKS),
+                                      (first + 4, BISHOP_ATTACKS, BISHOP_MASKS),
+                                      (first + 3, ROOK_ATTACKS, ROOK_MASKS),
+                                      (first + 4, ROOK_ATTACKS, ROOK_MASKS),
+                                      (first + 5, KING_ATTACKS, None)):
+            piece_bb = pieces[piece]
+            piece_bits = piece << 12
+            while piece_bb:
+                sq = (piece_bb & -piece_bb).bit_length() - 1
+                piece_bb &= piece_bb - 1
+                if masks is None:
+                    targets = attacks[sq] & empty
                 else:
-                    break
+                    targets = attacks[sq][occupied & masks[sq]] & empty
+                base = (sq << 6) | piece_bits
+                while targets:
+                    to_bit = targets & -targets
+                    targets ^= to_bit
+                    append(base | (to_bit.bit_length() - 1))
         
         return moves
     
     @staticmethod
-    def _get_knight_moves(board: List[List[str]], row: int, col: int, color: str, move_type: MoveType) -> List[Move]:
-        moves = []
-        piece = board[row][col]
-        knight_offsets = [(-2,-1), (-2,1), (-1,-2), (-1,2), (1,-2), (1,2), (2,-1), (2,1)]
-        
-        for dr, dc in knight_offsets:
-            new_row, new_col = row + dr, col + dc
-            if MoveGenerator.is_valid_square(new_row, new_col):
-                target = board[new_row][new_col]
-                if target == "--":
-                    if move_type in [MoveType.ALL, MoveType.QUIET]:
-                        moves.append(Move(row, col, new_row, new_col, piece=piece))
-                elif target[0] != color:
-                    if move_type in [MoveType.ALL, MoveType.CAPTURES]:
-                        moves.append(Move(row, col, new_row, new_col, piece=piece, captured=target))
-        
-        return moves
+    def _get_pawn_pushes(bb: Bitboard, is_white: bool, moves: List[int]):
+        """Setwise single and double pawn pushes"""
+        append = moves.append
+        empty = ~(bb.white | bb.black) & FULL_BOARD
+        
+        # Target sets plus the step back from a target to its origin square
+        if is_white:
+            single = bb.pieces[WP] >> 8 & empty
+            double = (single & RANK_3) >> 8 & empty
+            piece_bits, push, promotion_rank = WP << 12, 8, RANK_8
+        else:
+            single = bb.pieces[BP] << 8 & empty
+            double = (single & RANK_6) << 8 & empty
+            piece_bits, push, promotion_rank = BP << 12, -8, RANK_1
+        
+        targets = single
+        while targets:
+            to_bit = targets & -targets
+            targets ^= to_bit
+            to_sq = to_bit.bit_length() - 1
+            move = to_sq | (to_sq + push) << 6 | piece_bits
+            append(move | FLAG_PROMOTION if to_bit & promotion_rank else move)
+        
+        push *= 2
+        while double:
+            to_bit = double & -double
+            double ^= to_bit
+            to_sq = to_bit.bit_length() - 1
+            append(to_sq | (to_sq + push) << 6 | piece_bits)
     
     @staticmethod
-    def _get_king_moves(board: List[List[str]], row: int, col: int, color: str, move_type: MoveType) -> List[Move]:
-        moves = []
-        piece = board[row][col]
-        king_offsets = [(0,1), (0,-1), (1,0), (-1,0), (1,1), (1,-1), (-1,1), (-1,-1)]
-        
-        for dr, dc in king_offsets:
-            new_row, new_col = row + dr, col + dc
-            if MoveGenerator.is_valid_square(new_row, new_col):
-                target = board[new_row][new_col]
-                if target == "--":
-                    if move_type in [MoveType.ALL, MoveType.QUIET]:
-                        moves.append(Move(row, col, new_row, new_col, piece=piece))
-                elif target[0] != color:
-                    if move_type in [MoveType.ALL, MoveType.CAPTURES]:
-                        moves.append(Move(row, col, new_row, new_col, piece=piece, captured=target))
-        
-        return moves
+    def _get_pawn_captures(bb: Bitboard, is_white: bool, moves: List[int]):
+        """Setwise pawn captures: shift the whole pawn bitboard once per direction"""
+        append = moves.append
+        mailbox = bb.mailbox
+        
+        if is_white:
+            pawns, enemy = bb.pieces[WP], bb.black
+            left = (pawns & ~FILE_A) >> 9 & enemy
+            right = (pawns & ~FILE_H) >> 7 & enemy
+            piece_bits, left_step, right_step, promotion_rank = WP << 12, 9, 7, RANK_8
+        else:
+            pawns, enemy = bb.pieces[BP], bb.white
+            left = (pawns & ~FILE_A) << 7 & enemy
+            right = (pawns & ~FILE_H) << 9 & enemy
+            piece_bits, left_step, right_step, promotion_rank = BP << 12, -7, -9, RANK_1
+        
+        for targets, step in ((left, left_step), (right, right_step)):
+            while targets:
+                to_bit = targets & -targets
+                targets ^= to_bit
+                to_sq = to_bit.bit_length() - 1
+                move = to_sq | (to_sq + step) << 6 | piece_bits | mailbox[to_sq] << 16
+                append(move | FLAG_PROMOTION if to_bit & promotion_rank else move)
 
 class BoardAnalyzer:
     """Single-pass board analysis for evaluation"""
     
-    @dataclass
-    class BoardInfo:
-        """Complete board analysis in one pass"""
-        material_balance: int = 0
-        white_king_pos: Optional[Tuple[int, int]] = None
-        black_king_pos: Optional[Tuple[int, int]] = None
-        white_pawns: List[Tuple[int, int]] = None
-        black_pawns: List[Tuple[int, int]] = None
-        piece_positions: Dict[str, List[Tuple[int, int]]] = None
-        
-        def __post_init__(self):
-            if self.white_pawns is None:
-                self.white_pawns = []
-            if self.black_pawns is None:
-                self.black_pawns = []
-            if self.piece_positions is None:
-                self.piece_positions = defaultdict(list)
+    class BoardInfo(NamedTuple):
+        """Complete board analysis in one pass
+        
+        King squares are square indices (-1 when the king is missing) and the
+        pawn fields are the pawn bitboards themselves, so no per-square tuples
+        or lists are built.
+        """
+        material_balance: int
+        white_king_sq: int
+        black_king_sq: int
+        white_pawns: int
+        black_pawns: int
     
     @staticmethod
-    def analyze_board(board: List[List[str]], piece_values: Dict[str, int]) -> BoardInfo:
+    def analyze_board(bb: Bitboard, piece_values: Tuple[int, ...]) -> BoardInfo:
         """Single pass board analysis"""
-        info = BoardAnalyzer.BoardInfo()
-        
-        for row in range(8):
-            for col in range(8):
-                piece = board[row][col]
-                if piece == "--":
-                    continue
-                
-                color, piece_type = piece[0], piece[1]
-                pos = (row, col)
-                
-                # Material balance
-                value = piece_values.get(piece_type, 0)
-                if color == 'w':
-                    info.material_balance += value
+        pieces = bb.pieces
+        
+        # Material balance
+        material_balance = 0
+        for code in range(WP, BK + 1):
+            piece_bb = pieces[code]
+            if piece_bb:
+                value = piece_values[code] * popcount(piece_bb)
+                if code <= WK:
+                    material_balance += value
                 else:
-                    info.material_balance -= value
-                
-                # Special positions
-                if piece == 'wK':
-                    info.white_king_pos = pos
-                elif piece == 'bK':
-                    info.black_king_pos = pos
-                elif piece == 'wp':
-                    info.white_pawns.append(pos)
-                elif piece == 'bp':
-                    info.black_pawns.append(pos)
-                
-                # All piece positions
-                info.piece_positions[piece].append(pos)
+                    material_balance -= value
         
-        return info
+        return BoardAnalyzer.BoardInfo(material_balance,
+                                       pieces[WK].bit_length() - 1,
+                                       pieces[BK].bit_length() - 1,
+                                       pieces[WP], pieces[BP])
 
 class Evaluator:
     """Position evaluation system"""
@@ -316,6 +401,8 @@ class Evaluator:
     def __init__(self, config: AIConfig):
         self.config = config
         self.piece_square_tables = self._init_piece_square_tables()
+        self.pst = self._flatten_piece_square_tables()
+        self.pst_codes = tuple(code for code in range(WP, BK + 1) if any(self.pst[code]))
     
     def _init_piece_square_tables(self) -> Dict[str, List[List[int]]]:
         """Initialize piece-square tables"""
@@ -352,87 +439,74 @@ class Evaluator:
             ]
         }
     
-    def evaluate_position(self, board: List[List[str]], is_white_turn: bool) -> int:
+    def _flatten_piece_square_tables(self) -> Tuple[Tuple[int, ...], ...]:
+        """Signed per-piece-code tables indexed by square
+        
+        Black entries are pre-flipped and negated, so the bonus of any piece
+        is simply ``pst[code][sq]`` added to a white-relative score.
+        """
+        pst = [(0,) * 64 for _ in range(13)]
+        for piece_type, table in self.piece_square_tables.items():
+            white_code, black_code = PIECE_CODES['w' + piece_type], PIECE_CODES['b' + piece_type]
+            pst[white_code] = tuple(table[sq // 8][sq % 8] for sq in range(64))
+            pst[black_code] = tuple(-table[7 - sq // 8][sq % 8] for sq in range(64))
+        return tuple(pst)
+    
+    def evaluate_position(self, bb: Bitboard, is_white_turn: bool) -> int:
         """Comprehensive position evaluation"""
-        info = BoardAnalyzer.analyze_board(board, self.config.piece_values)
+        info = BoardAnalyzer.analyze_board(bb, self.config.piece_value_table)
         
         score = 0
         score += info.material_balance
-        score += self._evaluate_piece_square_bonus(info)
-        score += self._evaluate_king_safety(board, info)
-        score += self._evaluate_pawn_structure(board, info)
-        score += self._evaluate_mobility(board, is_white_turn)
+        score += self._evaluate_piece_square_bonus(bb)
+        score += self._evaluate_king_safety(bb, info)
+        score += self._evaluate_pawn_structure(bb, info)
+        score += self._evaluate_mobility(bb, is_white_turn)
         
         return score if is_white_turn else -score
     
-    def _evaluate_piece_square_bonus(self, info: BoardAnalyzer.BoardInfo) -> int:
+    def _evaluate_piece_square_bonus(self, bb: Bitboard) -> int:
         """Evaluate piece-square table bonuses"""
         score = 0
+        pieces = bb.pieces
         
-        for piece, positions in info.piece_positions.items():
-            if len(positions) == 0:
-                continue
-                
-            color, piece_type = piece[0], piece[1].lower()
-            if piece_type not in self.piece_square_tables:
-                continue
-            
-            table = self.piece_square_tables[piece_type]
-            
-            for row, col in positions:
-                # Flip table for black pieces
-                eval_row = row if color == 'w' else 7 - row
-                bonus = table[eval_row][col]
-                
-                if color == 'w':
-                    score += bonus
-                else:
-                    score -= bonus
+        for code in self.pst_codes:
+            piece_bb = pieces[code]
+            table = self.pst[code]
+            while piece_bb:
+                sq = (piece_bb & -piece_bb).bit_length() - 1
+                piece_bb &= piece_bb - 1
+                score += table[sq]
         
         return score
     
-    def _evaluate_king_safety(self, board: List[List[str]], info: BoardAnalyzer.BoardInfo) -> int:
+    def _evaluate_king_safety(self, bb: Bitboard, info: BoardAnalyzer.BoardInfo) -> int:
         """Evaluate king safety"""
         score = 0
         
-        if info.white_king_pos:
-            score += self._evaluate_pawn_shield(board, info.white_king_pos, 'w')
+        if info.white_king_sq >= 0:
+            score += self._evaluate_pawn_shield(info.white_pawns, info.white_king_sq, WHITE)
         
-        if info.black_king_pos:
-            score -= self._evaluate_pawn_shield(board, info.black_king_pos, 'b')
+        if info.black_king_sq >= 0:
+            score -= self._evaluate_pawn_shield(info.black_pawns, info.black_king_sq, BLACK)
         
         return score
     
-    def _evaluate_pawn_shield(self, board: List[List[str]], king_pos: Tuple[int, int], color: str) -> int:
-        """Evaluate pawn shield around king"""
-        row, col = king_pos
-        shield_score = 0
-        direction = -1 if color == 'w' else 1
-        
-        for dc in [-1, 0, 1]:
-            shield_col = col + dc
-            if 0 <= shield_col < 8:
-                shield_row = row + direction
-                if 0 <= shield_row < 8:
-                    piece = board[shield_row][shield_col]
-                    if piece == color + 'p':
-                        shield_score += 10
-                    else:
-                        shield_score -= 15
-        
-        return shield_score
-    
-    def _evaluate_pawn_structure(self, board: List[List[str]], info: BoardAnalyzer.BoardInfo) -> int:
+    def _evaluate_pawn_shield(self, own_pawns: int, king_sq: int, color: int) -> int:
+        """Evaluate pawn shield around king: +10 per shielding pawn, -15 per hole"""
+        shield = PAWN_SHIELD[color][king_sq]
+        pawns = popcount(own_pawns & shield)
+        return pawns * 10 - (popcount(shield) - pawns) * 15
+    
+    def _evaluate_pawn_structure(self, bb: Bitboard, info: BoardAnalyzer.BoardInfo) -> int:
         """Evaluate pawn structure"""
         score = 0
+        white_pawns, black_pawns = info.white_pawns, info.black_pawns
         
         # Doubled pawns penalty
-        white_files = [col for row, col in info.white_pawns]
-        black_files = [col for row, col in info.black_pawns]
-        
-        for file in range(8):
-            white_count = white_files.count(file)
-            black_count = black_files.count(file)
+        for file_mask in FILE_MASKS:
+            white_count = popcount(white_pawns & file_mask)
+            black_count = popcount(black_pawns & file_mask)
             
             if white_count > 1:
                 score -= 10 * (white_count - 1)
@@ -440,55 +514,119 @@ class Evaluator:
                 score += 10 * (black_count - 1)
         
         # Passed pawns
-        for row, col in info.white_pawns:
-            if self._is_passed_pawn(board, row, col, 'w'):
-                score += 20 + (7 - row) * 5
-        
-        for row, col in info.black_pawns:
-            if self._is_passed_pawn(board, row, col, 'b'):
-                score -= 20 + row * 5
+        pawns = white_pawns
+        while pawns:
+            sq = (pawns & -pawns).bit_length() - 1
+            pawns &= pawns - 1
+            if self._is_passed_pawn(black_pawns, sq, WHITE):
+                score += 20 + (7 - (sq >> 3)) * 5
+        
+        pawns = black_pawns
+        while pawns:
+            sq = (pawns & -pawns).bit_length() - 1
+            pawns &= pawns - 1
+            if self._is_passed_pawn(white_pawns, sq, BLACK):
+                score -= 20 + (sq >> 3) * 5
         
         return score
     
-    def _is_passed_pawn(self, board: List[List[str]], row: int, col: int, color: str) -> bool:
+    def _is_passed_pawn(self, enemy_pawns: int, sq: int, color: int) -> bool:
         """Check if pawn is passed"""
-        direction = -1 if color == 'w' else 1
-        enemy_color = 'b' if color == 'w' else 'w'
-        
-        for check_col in [col - 1, col, col + 1]:
-            if 0 <= check_col < 8:
-                check_row = row + direction
-                while 0 <= check_row < 8:
-                    piece = board[check_row][check_col]
-                    if piece == enemy_color + 'p':
-                        return False
-                    check_row += direction
-        
-        return True
+        return not enemy_pawns & PASSED_PAWN_MASKS[color][sq]
     
-    def _evaluate_mobility(self, board: List[List[str]], is_white_turn: bool) -> int:
+    def _evaluate_mobility(self, bb: Bitboard, is_white_turn: bool) -> int:
         """Evaluate piece mobility"""
-        white_mobility = len(MoveGenerator.generate_moves(board, True, MoveType.ALL))
-        black_mobility = len(MoveGenerator.generate_moves(board, False, MoveType.ALL))
+        white_mobility = self._count_mobility(bb, True)
+        black_mobility = self._count_mobility(bb, False)
         
         return (white_mobility - black_mobility) * 2
+    
+    def _count_mobility(self, bb: Bitboard, is_white: bool) -> int:
+        """Number of pseudo-legal moves, counted from attack sets without building moves"""
+        pieces = bb.pieces
+        occupied = bb.white | bb.black
+        empty = ~occupied & FULL_BOARD
+        
+        # Pawns, setwise: single pushes, double pushes and both capture directions
+        if is_white:
+            friendly, enemy, first = bb.white, bb.black, WP
+            pawns = pieces[WP]
+            single = pawns >> 8 & empty
+            mobility = (popcount(single) + popcount((single & RANK_3) >> 8 & empty) +
+                        popcount((pawns & ~FILE_A) >> 9 & enemy) +
+                        popcount((pawns & ~FILE_H) >> 7 & enemy))
+        else:
+            friendly, enemy, first = bb.black, bb.white, BP
+            pawns = pieces[BP]
+            single = pawns << 8 & empty
+            mobility = (popcount(single) + popcount((single & RANK_6) << 8 & empty) +
+                        popcount((pawns & ~FILE_A) << 7 & enemy) +
+                        popcount((pawns & ~FILE_H) << 9 & enemy))
+        
+        targets = ~friendly
+        
+        knights = pieces[first + 1]
+        while knights:
+            sq = (knights & -knights).bit_length() - 1
+            knights &= knights - 1
+            mobility += popcount(KNIGHT_ATTACKS[sq] & targets)
+        
+        diagonal = pieces[first + 2] | pieces[first + 4]
+        while diagonal:
+            sq = (diagonal & -diagonal).bit_length() - 1
+            diagonal &= diagonal - 1
+            mobility += popcount(BISHOP_ATTACKS[sq][occupied & BISHOP_MASKS[sq]] & targets)
+        
+        straight = pieces[first + 3] | pieces[first + 4]
+        while straight:
+            sq = (straight & -straight).bit_length() - 1
+            straight &= straight - 1
+            mobility += popcount(ROOK_ATTACKS[sq][occupied & ROOK_MASKS[sq]] & targets)
+        
+        king = pieces[first + 5]
+        if king:
+            mobility += popcount(KING_ATTACKS[king.bit_length() - 1] & targets)
+        
+        return mobility
 
 class SearchEngine:
     """Main search engine with all optimizations"""
     
-    def __init__(self, config: AIConfig):
+    def __init__(self, config: AIConfig, tt_buffer=None):
         self.config = config
-        self.tt = TranspositionTable(config.tt_size_mb)
+        self.tt = TranspositionTable(config.tt_size_mb, tt_buffer)
         self.evaluator = Evaluator(config)
         
+        # Lazy SMP helpers (created on first parallel search)
+        self.shared_tt = None
+        self.helper_pool = None
+        self.helper_count = 0
+        self.helper_futures = []
+        self.stop_signal = None  # shared byte another process sets to stop this search (helpers, GUI)
+        
         # Search state
         self.nodes_searched = 0
         self.start_time = 0
+        self.soft_limit = config.time_limit  # don't start an iteration expected to end past this
+        self.hard_limit = config.time_limit  # abort the search past this
+        self.last_iter_time = 0.0
+        self.completed_depth = 0
         self.cancel_search = False
         
         # Move ordering
-        self.killer_moves = defaultdict(list)  # ply -> [move1, move2]
-        self.history_scores = defaultdict(int)  # (piece, to_square) -> score
+        self.mvv_lva = self._init_mvv_lva()
+        self.killer_moves = [[0, 0] for _ in range(MAX_PLY)]  # ply -> [move1, move2]
+        self.history_scores = [0] * (13 * 64)  # piece * 64 + to_square -> score
+        
+        # Zobrist keys along the current search line, indexed by ply
+        self.path_keys = [0] * MAX_PLY
+        
+        # Principal variation: pv_table[ply] is the best line found below ply in
+        # this iteration; pv_moves maps the previous iteration's PV positions
+        # (by key) to the move to try first there
+        self.pv_table = [()] * (MAX_PLY + 1)
+        self.pv_moves = {}
+        self.principal_variation = ()
         
         # Statistics
         self.stats = {
@@ -498,15 +636,19 @@ class SearchEngine:
             'lmr_saves': 0
         }
     
-    def find_best_move(self, board: List[List[str]], is_white_turn: bool, valid_moves: List) -> Optional:
-        """Find best move using iterative deepening"""
+    def find_best_move(self, board: List[List[str]], is_white_turn: bool, valid_moves: List,
+                       remaining_time: Optional[float] = None) -> Optional:
+        """Find best move using iterative deepening (remaining_time: seconds left on the clock, if any)"""
         self.nodes_searched = 0
         self.start_time = time.time()
         self.cancel_search = False
+        self._allocate_time(remaining_time)
         
         self.tt.new_search()
-        self.killer_moves.clear()
-        self.history_scores.clear()
+        self.killer_moves = [[0, 0] for _ in range(MAX_PLY)]
+        self.history_scores = [0] * (13 * 64)
+        self.pv_moves = {}
+        self.principal_variation = ()
         self._reset_stats()
         
         if not valid_moves:
@@ -515,54 +657,191 @@ class SearchEngine:
         if len(valid_moves) == 1:
             return valid_moves[0]
         
-        # Convert to internal move format
-        moves = self._convert_moves(board, valid_moves)
-        
-        best_move = None
+        # Convert to internal board and move format
+        bb = Bitboard.from_board(board)
+        root_key = zobrist_key(bb, is_white_turn)
+        moves = self._convert_moves(bb, valid_moves)
         
         print(f"Starting search with {len(moves)} moves...")
         
-        # Iterative deepening
-        for depth in range(1, self.config.max_depth + 1):
+        if self.config.search_workers > 1:
+            self._start_helpers(bb, root_key, is_white_turn, moves)
+        
+        best_move = self._iterative_deepening(bb, root_key, is_white_turn, moves)
+        if self.helper_futures:
+            best_move = self._collect_helpers(best_move)
+        
+        self._print_search_stats()
+        if not best_move:
+            return random.choice(valid_moves)
+        return self._convert_back_to_original_move(best_move, index_moves(valid_moves))
+    
+    def _iterative_deepening(self, bb: Bitboard, root_key: int, is_white_turn: bool,
+                             moves: List[int], start_depth: int = 1, verbose: bool = True) -> Optional[int]:
+        """Search depth 1, 2, ... until max_depth or the time limit"""
+        best_move = None
+        last_nodes = 0
+        self.completed_depth = 0
+        
+        for depth in range(start_depth, self.config.max_depth + 1):
             if self._should_stop_search():
                 break
             
-            current_best = self._search_root(board, is_white_turn, moves, depth)
+            iter_start = time.time()
+            nodes_before = self.nodes_searched
+            current_best = self._search_root(bb, root_key, is_white_turn, moves, depth)
+            
+            # Only a completed iteration is trusted; its PV seeds the next one
+            if self._should_stop_search() or not current_best:
+                break
+            best_move = current_best
+            self.completed_depth = depth
+            self._set_principal_variation(bb, root_key, self.pv_table[0])
             
-            if not self._should_stop_search() and current_best:
-                best_move = current_best
-                elapsed = time.time() - self.start_time
+            now = time.time()
+            elapsed = now - self.start_time
+            self.last_iter_time = now - iter_start
+            iter_nodes = self.nodes_searched - nodes_before
+            if verbose:
                 nps = int(self.nodes_searched / max(elapsed, 0.001))
                 print(f"Depth {depth}: {nps:,} nps")
+            
+            # Don't start an iteration that probably can't finish: its result would be discarded
+            branching = iter_nodes / last_nodes if last_nodes else DEFAULT_BRANCHING
+            last_nodes = iter_nodes
+            if elapsed + self.last_iter_time * branching > self.soft_limit:
+                break
         
-        self._print_search_stats()
-        return self._convert_back_to_original_move(best_move, valid_moves) if best_move else random.choice(valid_moves)
+        return best_move
     
-    def _search_root(self, board: List[List[str]], is_white_turn: bool, moves: List[Move], depth: int) -> Optional[Move]:
-        """Root search with move ordering"""
+    def _allocate_time(self, remaining_time: Optional[float]):
+        """Set the soft/hard limits for this move; config.time_limit caps both"""
+        time_limit = self.config.time_limit
+        if remaining_time is None:
+            self.soft_limit = self.hard_limit = time_limit
+        else:
+            self.soft_limit = min(SOFT_TIME_SHARE * remaining_time, time_limit)
+            self.hard_limit = min(HARD_TIME_SHARE * remaining_time, time_limit)
+    
+    def _start_helpers(self, bb: Bitboard, root_key: int, is_white_turn: bool, moves: List[int]):
+        """Launch Lazy SMP helper searches that share this engine's TT"""
+        helpers = self.config.search_workers - 1
+        
+        try:
+            if self.shared_tt is None:
+                # Move the TT into shared memory once; helpers attach to it by name
+                # followed by one word whose first byte tells helpers to stop
+                size = 32 * TranspositionTable.bucket_count(self.config.tt_size_mb) + 8
+                self.shared_tt = shared_memory.SharedMemory(create=True, size=size)
+                generation = self.tt.generation
+                self.tt = TranspositionTable(self.config.tt_size_mb, self.shared_tt.buf)
+                self.tt.generation = generation
+            
+            if self.helper_pool is None or self.helper_count != helpers:
+                if self.helper_pool is not None:
+                    self.helper_pool.shutdown(wait=False, cancel_futures=True)
+                self.helper_pool = ProcessPoolExecutor(max_workers=helpers)
+                self.helper_count = helpers
+            
+            self.shared_tt.buf[32 * self.tt.buckets] = 0
+            # Arguments are pickled later by the pool's feeder thread, while this
+            # process is already searching (and mutating bb.pieces): pass copies
+            pieces, root_moves = tuple(bb.pieces), tuple(moves)
+            for helper_id in range(helpers):
+                # Odd helpers start one ply deeper so the searches desynchronize
+                self.helper_futures.append(self.helper_pool.submit(
+                    _lazy_smp_helper, self.config, self.shared_tt.name, self.tt.generation,
+                    pieces, bb.white, bb.black, root_key, is_white_turn,
+                    root_moves, self.start_time, self.hard_limit, 1 + (helper_id + 1) % 2
+                ))
+        except Exception as e:
+            print(f"Parallel search unavailable, searching single-threaded: {e}")
+    
+    def _collect_helpers(self, best_move: Optional[int]) -> Optional[int]:
+        """Stop the helpers and keep the deepest completed iteration (ties go to the main search)"""
+        self.shared_tt.buf[32 * self.tt.buckets] = 1
+        done, _ = wait(self.helper_futures, timeout=1.0)
+        self.helper_futures = []
+        
+        best_depth = self.completed_depth
+        for future in done:
+            try:
+                depth, move, nodes = future.result()
+            except Exception as e:
+                print(f"Search helper failed: {e}")
+                continue
+            self.nodes_searched += nodes
+            if move and depth > best_depth:
+                best_depth, best_move = depth, move
+        return best_move
+    
+    def shutdown(self):
+        """Stop helper processes and release the shared TT"""
+        if self.helper_pool is not None:
+            self.helper_pool.shutdown(wait=False, cancel_futures=True)
+            self.helper_pool = None
+            self.helper_futures = []
+        if self.shared_tt is not None:
+            generation = self.tt.generation
+            self.tt.table.release()
+            self.tt = TranspositionTable(self.config.tt_size_mb)
+            self.tt.generation = generation
+            self.shared_tt.close()
+            self.shared_tt.unlink()
+            self.shared_tt = None
+    
+    def _set_principal_variation(self, board: Bitboard, key: int, pv: Tuple[int, ...]):
+        """Remember a completed iteration's PV, keyed by the position each move is played from"""
+        pv_moves = {}
+        played = []
+        for move in pv:
+            pv_moves[key] = move
+            key = self._make_move(board, key, move)
+            played.append(move)
+        for move in reversed(played):
+            self._undo_move(board, move)
+        self.pv_moves = pv_moves
+        self.principal_variation = pv
+    
+    def _search_root(self, board: Bitboard, key: int, is_white_turn: bool, moves: List[int], depth: int) -> Optional[int]:
+        """Root search: previous PV move first, then null-window (PVS) searches"""
         best_move = None
-        best_score = -999999
+        best_score = alpha = -999999
+        beta = 999999
+        pv_table = self.pv_table
+        pv_table[0] = ()
         
         # Order moves
-        ordered_moves = self._order_moves(board, moves, 0, None)
+        pv_move = self.principal_variation[0] if self.principal_variation else None
+        ordered_moves = self._order_moves(board, moves, 0, pv_move)
+        self.path_keys[0] = key
+        opponent = not is_white_turn
         
-        for move in ordered_moves:
+        for i, move in enumerate(ordered_moves):
             if self._should_stop_search():
                 break
             
             # Make move
-            new_board = self._make_move(board, move)
+            new_key = self._make_move(board, key, move)
             
-            # Search
-            score = -self._alpha_beta(new_board, not is_white_turn, depth - 1, -999999, 999999, 1)
+            # Search: full window for the first move, then prove the rest are no better
+            if i == 0:
+                score = -self._alpha_beta(board, new_key, opponent, depth - 1, -beta, -alpha, 1)
+            else:
+                score = -self._alpha_beta(board, new_key, opponent, depth - 1, -alpha - 1, -alpha, 1)
+                if score > alpha:
+                    score = -self._alpha_beta(board, new_key, opponent, depth - 1, -beta, -alpha, 1)
+            self._undo_move(board, move)
             
             if score > best_score:
                 best_score = score
                 best_move = move
+                pv_table[0] = (move,) + pv_table[1]
+                alpha = max(alpha, score)
         
         return best_move
     
-    def _alpha_beta(self, board: List[List[str]], is_white_turn: bool, depth: int, 
+    def _alpha_beta(self, board: Bitboard, key: int, is_white_turn: bool, depth: int, 
                    alpha: int, beta: int, ply: int) -> int:
         """Alpha-beta search with all optimizations"""
         
@@ -570,97 +849,128 @@ class SearchEngine:
             return 0
         
         self.nodes_searched += 1
+        pv_table = self.pv_table
+        pv_table[ply] = ()
+        alpha_orig = alpha
+        
+        # Repetition of a position earlier on this line (same side to move) is a draw
+        path_keys = self.path_keys
+        path_keys[ply] = key
+        if ply >= 4 and key in path_keys[ply - 4::-2]:
+            return 0
         
         # Transposition table probe
-        pos_key = self._get_position_key(board, is_white_turn)
-        tt_score, tt_move = self.tt.probe(pos_key, depth, alpha, beta)
+        tt_score, tt_move = self.tt.probe(key, depth, alpha, beta)
         
         if tt_score is not None and depth > 0:
             return tt_score
         
+        # On the previous iteration's PV, its move goes first (ahead of the hash move)
+        pv_move = self.pv_moves.get(key)
+        if pv_move:
+            tt_move = pv_move
+        
         # Terminal nodes
         if depth <= 0:
-            return self._quiescence_search(board, is_white_turn, alpha, beta)
-        
-        # Generate moves
-        moves = MoveGenerator.generate_moves(board, is_white_turn, MoveType.ALL)
+            return self._quiescence_search(board, key, is_white_turn, alpha, beta)
         
-        if not moves:
-            if self._is_king_in_check(board, is_white_turn):
-                return -999999 + ply  # Checkmate
-            else:
-                return 0  # Stalemate
+        # Check detection inlined: a king bit-scan plus one table-driven attack test
+        pieces = board.pieces
+        if is_white_turn:
+            own_king, enemy_king = WK, BK
+        else:
+            own_king, enemy_king = BK, WK
+        king_bb = pieces[own_king]
+        in_check = bool(king_bb) and square_attacked(board, king_bb.bit_length() - 1, not is_white_turn)
         
         # Null move pruning
         if (self.config.use_null_move_pruning and depth >= 3 and 
-            not self._is_king_in_check(board, is_white_turn) and 
+            not in_check and 
             self._has_non_pawn_pieces(board, is_white_turn)):
             
             reduction = 3 + depth // 4
-            null_score = -self._alpha_beta(board, not is_white_turn, depth - reduction - 1, 
+            null_score = -self._alpha_beta(board, key ^ ZOBRIST_SIDE, not is_white_turn, depth - reduction - 1, 
                                          -beta, -beta + 1, ply + 1)
             
             if null_score >= beta:
                 self.stats['null_move_cuts'] += 1
                 return beta
         
-        # Search moves
-        ordered_moves = self._order_moves(board, moves, ply, tt_move)
+        # Search moves; later stages are only generated if no cutoff happens first
         best_score = -999999
+        best_move = None
         moves_searched = 0
         
-        for i, move in enumerate(ordered_moves):
-            # Make move
-            new_board = self._make_move(board, move)
+        # Hoist attribute lookups out of the move loop
+        make_move = self._make_move
+        undo_move = self._undo_move
+        alpha_beta = self._alpha_beta
+        opponent = not is_white_turn
+        use_lmr = self.config.use_lmr and depth > 2
+        
+        for i, move in enumerate(self._pick_moves(board, is_white_turn, ply, tt_move)):
+            # Make move, skipping pseudo-legal moves that leave our king attacked
+            new_key = make_move(board, key, move)
+            king_bb = pieces[own_king]
+            if king_bb and square_attacked(board, king_bb.bit_length() - 1, opponent):
+                undo_move(board, move)
+                continue
             
             # Late move reductions
             reduction = 0
-            if (self.config.use_lmr and i > 3 and depth > 2 and moves_searched > 0 and 
-                not move.captured and not self._is_king_in_check(new_board, not is_white_turn)):
+            if (use_lmr and i > 3 and moves_searched > 0 and not move & CAPTURED_MASK and
+                    not square_attacked(board, pieces[enemy_king].bit_length() - 1, is_white_turn)):
                 reduction = min(depth - 1, 1 + (depth - 1) * (i - 3) // 20)
             
             # Search
             if moves_searched == 0:
-                score = -self._alpha_beta(new_board, not is_white_turn, depth - 1, -beta, -alpha, ply + 1)
+                score = -alpha_beta(board, new_key, opponent, depth - 1, -beta, -alpha, ply + 1)
             else:
-                score = -self._alpha_beta(new_board, not is_white_turn, depth - 1 - reduction, 
-                                        -alpha - 1, -alpha, ply + 1)
+                score = -alpha_beta(board, new_key, opponent, depth - 1 - reduction, 
+                                    -alpha - 1, -alpha, ply + 1)
                 
                 if score > alpha and (reduction > 0 or score < beta):
                     self.stats['lmr_saves'] += 1 if reduction > 0 else 0
-                    score = -self._alpha_beta(new_board, not is_white_turn, depth - 1, -beta, -alpha, ply + 1)
+                    score = -alpha_beta(board, new_key, opponent, depth - 1, -beta, -alpha, ply + 1)
+            
+            undo_move(board, move)
             
             moves_searched += 1
             
             if score > best_score:
                 best_score = score
+                best_move = move
             
             if score > alpha:
                 alpha = score
+                pv_table[ply] = (move,) + pv_table[ply + 1]
                 self._update_history(move, depth, True)
             
             if alpha >= beta:
                 self.stats['beta_cutoffs'] += 1
-                if i == 0:
+                if moves_searched == 1:
                     self.stats['first_move_cutoffs'] += 1
                 
                 # Update killers and history
-                if not move.captured and self.config.use_killer_moves:
+                if not move & CAPTURED_MASK and self.config.use_killer_moves:
                     self._add_killer_move(move, ply)
                 
                 self._update_history(move, depth, True)
                 break
         
+        if moves_searched == 0:
+            return -999999 + ply if in_check else 0  # Checkmate or stalemate
+        
         # Store in transposition table
-        tt_flag = (TranspositionTable.EXACT if best_score > -999999 and best_score < beta else
-                  TranspositionTable.LOWER_BOUND if best_score >= beta else
-                  TranspositionTable.UPPER_BOUND)
+        tt_flag = (TranspositionTable.LOWER_BOUND if best_score >= beta else
+                  TranspositionTable.UPPER_BOUND if best_score <= alpha_orig else
+                  TranspositionTable.EXACT)
         
-        self.tt.store(pos_key, depth, best_score, tt_flag, ordered_moves[0] if ordered_moves else None)
+        self.tt.store(key, depth, best_score, tt_flag, best_move)
         
         return best_score
     
-    def _quiescence_search(self, board: List[List[str]], is_white_turn: bool, alpha: int, beta: int) -> int:
+    def _quiescence_search(self, board: Bitboard, key: int, is_white_turn: bool, alpha: int, beta: int) -> int:
         """Quiescence search"""
         self.nodes_searched += 1
         
@@ -673,11 +983,24 @@ class SearchEngine:
             alpha = stand_pat
         
         # Search captures
-        captures = MoveGenerator.generate_moves(board, is_white_turn, MoveType.CAPTURES)
+        captures = MoveGenerator.generate_captures(board, is_white_turn)
+        
+        make_move = self._make_move
+        undo_move = self._undo_move
+        quiescence_search = self._quiescence_search
+        opponent = not is_white_turn
+        pieces = board.pieces
+        own_king = WK if is_white_turn else BK
         
         for capture in captures:
-            new_board = self._make_move(board, capture)
-            score = -self._quiescence_search(new_board, not is_white_turn, -beta, -alpha)
+            new_key = make_move(board, key, capture)
+            king_bb = pieces[own_king]
+            if king_bb and square_attacked(board, king_bb.bit_length() - 1, opponent):
+                undo_move(board, capture)
+                continue
+            
+            score = -quiescence_search(board, new_key, opponent, -beta, -alpha)
+            undo_move(board, capture)
             
             if score >= beta:
                 return beta
@@ -687,171 +1010,263 @@ class SearchEngine:
         
         return alpha
     
-    def _order_moves(self, board: List[List[str]], moves: List[Move], ply: int, tt_move: Optional[Move]) -> List[Move]:
+    def _order_moves(self, board: Bitboard, moves: List[int], ply: int, tt_move: Optional[int]) -> List[int]:
         """Order moves for optimal search"""
-        scored_moves = []
-        
-        for move in moves:
-            score = 0
-            
-            # 1. Hash move (highest priority)
-            if tt_move and move == tt_move:
-                score += 10000000
-            
-            # 2. Captures (MVV-LVA)
-            elif move.captured:
-                victim_value = self.config.piece_values.get(move.captured[1], 0)
-                attacker_value = self.config.piece_values.get(move.piece[1], 0)
-                score += 1000000 + victim_value * 10 - attacker_value
-            
-            # 3. Killer moves
-            elif self.config.use_killer_moves and move in self.killer_moves[ply]:
-                killer_index = self.killer_moves[ply].index(move)
-                score += 900000 - killer_index * 1000
-            
-            # 4. History heuristic
-            else:
-                history_key = (move.piece, move.to_row * 8 + move.to_col)
-                score += self.history_scores[history_key]
-            
-            scored_moves.append((score, move))
+        history = self.history_scores
+        mvv_lva = self.mvv_lva
+        if self.config.use_killer_moves:
+            killer1, killer2 = self.killer_moves[ply]
+        else:
+            killer1 = killer2 = 0
+        
+        # Score every move in one pass:
+        # 1. hash move, 2. captures (MVV-LVA), 3. killers, 4. history (piece * 64 + to_square)
+        scores = [10000000 if move == tt_move else
+                  mvv_lva[move >> 12 & 0xFF] if move & CAPTURED_MASK else
+                  900000 if move == killer1 else
+                  899000 if move == killer2 else
+                  history[(move >> 6 & 0x3C0) | (move & 63)]
+                  for move in moves]
+        
+        # Sort indices by score (highest first, stable) with a C-level key function
+        order = sorted(range(len(moves)), key=scores.__getitem__, reverse=True)
+        return [moves[i] for i in order]
+    
+    def _pick_moves(self, board: Bitboard, is_white_turn: bool, ply: int, tt_move: Optional[int]):
+        """Staged move picker: hash move, captures (MVV-LVA), killers, quiets (history)"""
+        if tt_move and self._is_pseudo_legal(board, tt_move, is_white_turn):
+            yield tt_move
+        
+        captures = MoveGenerator.generate_captures(board, is_white_turn)
+        mvv_lva = self.mvv_lva
+        scores = [mvv_lva[move >> 12 & 0xFF] for move in captures]
+        for i in sorted(range(len(captures)), key=scores.__getitem__, reverse=True):
+            if captures[i] != tt_move:
+                yield captures[i]
+        
+        if self.config.use_killer_moves:
+            killer1, killer2 = self.killer_moves[ply]
+            for killer in (killer1, killer2):
+                if (killer and killer != tt_move and not killer & CAPTURED_MASK and
+                        self._is_pseudo_legal(board, killer, is_white_turn)):
+                    yield killer
+        else:
+            killer1 = killer2 = 0
+        
+        quiets = MoveGenerator.generate_quiets(board, is_white_turn)
+        history = self.history_scores
+        scores = [history[(move >> 6 & 0x3C0) | (move & 63)] for move in quiets]
+        for i in sorted(range(len(quiets)), key=scores.__getitem__, reverse=True):
+            move = quiets[i]
+            if move != tt_move and move != killer1 and move != killer2:
+                yield move
+    
+    def _is_pseudo_legal(self, board: Bitboard, move: int, is_white_turn: bool) -> bool:
+        """Validate a hash or killer move against the current position"""
+        piece = move >> 12 & 15
+        from_sq = move >> 6 & 63
+        to_sq = move & 63
+        captured = move >> 16 & 15
+        pieces = board.pieces
+        occupied = board.white | board.black
+        
+        if (piece <= WK) != is_white_turn or not pieces[piece] >> from_sq & 1:
+            return False
+        if move & (FLAG_EN_PASSANT | FLAG_CASTLE):
+            return False  # Never generated below the root
+        if captured:
+            if not pieces[captured] >> to_sq & 1:
+                return False
+        elif occupied >> to_sq & 1:
+            return False
         
-        # Sort by score (highest first)
-        scored_moves.sort(key=lambda x: x[0], reverse=True)
-        return [move for _, move in scored_moves]
+        to_bit = 1 << to_sq
+        if piece == WP or piece == BP:
+            if captured:
+                return bool(PAWN_ATTACKS[WHITE if is_white_turn else BLACK][from_sq] & to_bit)
+            step = -8 if is_white_turn else 8
+            if to_sq == from_sq + step:
+                return True
+            # Double push also needs the square in between to be empty
+            return (to_sq == from_sq + 2 * step and from_sq >> 3 == (6 if is_white_turn else 1) and
+                    not occupied >> (from_sq + step) & 1)
+        if piece == WN or piece == BN:
+            return bool(KNIGHT_ATTACKS[from_sq] & to_bit)
+        if piece == WK or piece == BK:
+            return bool(KING_ATTACKS[from_sq] & to_bit)
+        if piece == WB or piece == BB:
+            return bool(BISHOP_ATTACKS[from_sq][occupied & BISHOP_MASKS[from_sq]] & to_bit)
+        if piece == WR or piece == BR:
+            return bool(ROOK_ATTACKS[from_sq][occupied & ROOK_MASKS[from_sq]] & to_bit)
+        return bool((ROOK_ATTACKS[from_sq][occupied & ROOK_MASKS[from_sq]] |
+                     BISHOP_ATTACKS[from_sq][occupied & BISHOP_MASKS[from_sq]]) & to_bit)
     
-    def _add_killer_move(self, move: Move, ply: int):
+    def _init_mvv_lva(self) -> List[int]:
+        """Capture scores indexed by (captured << 4) | attacker, i.e. packed move bits 12-19"""
+        values = self.config.piece_value_table
+        table = [0] * 256
+        for captured in range(WP, BK + 1):
+            for attacker in range(WP, BK + 1):
+                table[captured << 4 | attacker] = 1000000 + values[captured] * 10 - values[attacker]
+        return table
+    
+    def _add_killer_move(self, move: int, ply: int):
         """Add killer move at ply"""
-        if move not in self.killer_moves[ply]:
-            self.killer_moves[ply].insert(0, move)
+        killers = self.killer_moves[ply]
+        if move != killers[0] and move != killers[1]:
             # Keep only 2 killer moves per ply
-            if len(self.killer_moves[ply]) > 2:
-                self.killer_moves[ply].pop()
+            killers[1] = killers[0]
+            killers[0] = move
     
-    def _update_history(self, move: Move, depth: int, is_good: bool):
+    def _update_history(self, move: int, depth: int, is_good: bool):
         """Update history heuristic"""
-        history_key = (move.piece, move.to_row * 8 + move.to_col)
+        history_key = (move >> 6 & 0x3C0) | (move & 63)
         bonus = depth * depth if is_good else -depth * depth
         
         # Gravity-based update to prevent saturation
         current = self.history_scores[history_key]
         self.history_scores[history_key] = current + bonus - (current * abs(bonus) // 512)
     
-    def _make_move(self, board: List[List[str]], move: Move) -> List[List[str]]:
-        """Make move on board copy"""
-        new_board = [row[:] for row in board]  # Copy board
+    def _make_move(self, board: Bitboard, key: int, move: int) -> int:
+        """Play move in place and return the updated Zobrist key
+        
+        Every board update is an XOR toggle, so applying the same move a
+        second time restores the position (see _undo_move).
+        """
+        pieces = board.pieces
+        mailbox = board.mailbox
+        white, black = board.white, board.black
+        piece = move >> 12 & 15
+        captured = move >> 16 & 15
+        to_sq = move & 63
+        from_sq = move >> 6 & 63
+        to_bit = 1 << to_sq
+        move_bits = (1 << from_sq) | to_bit
+        is_white = piece <= WK
+        
+        pieces[piece] ^= move_bits
+        mailbox[from_sq] ^= piece
+        mailbox[to_sq] ^= piece ^ captured
+        piece_keys = ZOBRIST[piece]
+        key ^= piece_keys[from_sq] ^ piece_keys[to_sq] ^ ZOBRIST[captured][to_sq] ^ ZOBRIST_SIDE
+        if is_white:
+            white ^= move_bits
+        else:
+            black ^= move_bits
         
-        new_board[move.to_row][move.to_col] = move.piece
-        new_board[move.from_row][move.from_col] = "--"
+        if captured:
+            pieces[captured] ^= to_bit
+            if is_white:
+                black ^= to_bit
+            else:
+                white ^= to_bit
         
         # Handle special moves
-        if move.special_flag == "promotion":
-            new_board[move.to_row][move.to_col] = move.piece[0] + 'Q'
-        elif move.special_flag == "en_passant":
+        if move & FLAG_PROMOTION:
+            queen = WQ if is_white else BQ
+            pieces[piece] ^= to_bit
+            pieces[queen] ^= to_bit
+            mailbox[to_sq] ^= piece ^ queen
+            key ^= piece_keys[to_sq] ^ ZOBRIST[queen][to_sq]
+        elif move & FLAG_EN_PASSANT:
             # Remove captured pawn
-            capture_row = move.to_row + (1 if move.piece[0] == 'w' else -1)
-            new_board[capture_row][move.to_col] = "--"
-        elif move.special_flag == "castle":
+            capture_sq = to_sq + (8 if is_white else -8)
+            capture_bit = 1 << capture_sq
+            mailbox[capture_sq] ^= BP if is_white else WP
+            if is_white:
+                pieces[BP] ^= capture_bit
+                black ^= capture_bit
+                key ^= ZOBRIST[BP][capture_sq]
+            else:
+                pieces[WP] ^= capture_bit
+                white ^= capture_bit
+                key ^= ZOBRIST[WP][capture_sq]
+        elif move & FLAG_CASTLE:
             # Move rook
-            if move.to_col > move.from_col:  # Kingside
-                new_board[move.from_row][5] = new_board[move.from_row][7]
-                new_board[move.from_row][7] = "--"
+            row_start = from_sq & ~7
+            if to_sq > from_sq:  # Kingside
+                rook_from, rook_to = row_start + 7, row_start + 5
             else:  # Queenside
-                new_board[move.from_row][3] = new_board[move.from_row][0]
-                new_board[move.from_row][0] = "--"
+                rook_from, rook_to = row_start, row_start + 3
+            rook = WR if is_white else BR
+            rook_bits = (1 << rook_from) | (1 << rook_to)
+            pieces[rook] ^= rook_bits
+            mailbox[rook_from] ^= rook
+            mailbox[rook_to] ^= rook
+            key ^= ZOBRIST[rook][rook_from] ^ ZOBRIST[rook][rook_to]
+            if is_white:
+                white ^= rook_bits
+            else:
+                black ^= rook_bits
         
-        return new_board
+        board.white = white
+        board.black = black
+        return key
     
-    def _get_position_key(self, board: List[List[str]], is_white_turn: bool) -> int:
-        """Generate position hash key"""
-        key = 0
-        for row in range(8):
-            for col in range(8):
-                piece = board[row][col]
-                if piece != "--":
-                    key ^= hash((piece, row, col))
-        
-        if is_white_turn:
-            key ^= 1
-        
-        return key & 0x7FFFFFFF
+    def _undo_move(self, board: Bitboard, move: int):
+        """Take back a move played with _make_move"""
+        self._make_move(board, 0, move)
+    
+    def _get_position_key(self, board: Bitboard, is_white_turn: bool) -> int:
+        """Generate position hash key from scratch"""
+        return zobrist_key(board, is_white_turn)
     
-    def _is_king_in_check(self, board: List[List[str]], is_white_turn: bool) -> bool:
+    def _is_king_in_check(self, board: Bitboard, is_white_turn: bool) -> bool:
         """Check if king is in check"""
-        king_piece = 'wK' if is_white_turn else 'bK'
-        king_pos = None
+        king_bb = board.pieces[WK if is_white_turn else BK]
         
-        # Find king
-        for row in range(8):
-            for col in range(8):
-                if board[row][col] == king_piece:
-                    king_pos = (row, col)
-                    break
-        
-        if not king_pos:
+        if not king_bb:
             return False
         
-        # Check if any enemy piece attacks the king
-        enemy_moves = MoveGenerator.generate_moves(board, not is_white_turn, MoveType.ALL)
-        
-        for move in enemy_moves:
-            if move.to_row == king_pos[0] and move.to_col == king_pos[1]:
-                return True
-        
-        return False
+        return square_attacked(board, king_bb.bit_length() - 1, not is_white_turn)
     
-    def _has_non_pawn_pieces(self, board: List[List[str]], is_white_turn: bool) -> bool:
+    def _has_non_pawn_pieces(self, board: Bitboard, is_white_turn: bool) -> bool:
         """Check if side has non-pawn pieces"""
-        color = 'w' if is_white_turn else 'b'
-        
-        for row in range(8):
-            for col in range(8):
-                piece = board[row][col]
-                if piece != "--" and piece[0] == color and piece[1].lower() not in ['k', 'p']:
-                    return True
-        
-        return False
+        # Occupancy minus pawns and king is kept current by _make_move, so
+        # this needs no separate material counters
+        pieces = board.pieces
+        if is_white_turn:
+            return board.white != pieces[WP] | pieces[WK]
+        return board.black != pieces[BP] | pieces[BK]
     
     def _should_stop_search(self) -> bool:
         """Check if search should be stopped"""
+        if self.stop_signal is not None and self.stop_signal[0]:
+            self.cancel_search = True
         return (self.cancel_search or 
-                (time.time() - self.start_time) > self.config.time_limit)
+                (time.time() - self.start_time) > self.hard_limit)
     
-    def _convert_moves(self, board: List[List[str]], original_moves: List) -> List[Move]:
+    def _convert_moves(self, board: Bitboard, original_moves: List) -> List[int]:
         """Convert original moves to internal format"""
         moves = []
+        mailbox = board.mailbox
         for move in original_moves:
             # Extract move information
-            piece = board[move.start_row][move.start_col]
-            captured = board[move.end_row][move.end_col] if board[move.end_row][move.end_col] != "--" else ""
+            from_sq = move.start_row * 8 + move.start_col
+            to_sq = move.end_row * 8 + move.end_col
+            piece = mailbox[from_sq]
+            captured = mailbox[to_sq]
             
-            # Determine special flags
-            special_flag = ""
-            if hasattr(move, 'pawn_promotion') and move.pawn_promotion:
-                special_flag = "promotion"
-            elif hasattr(move, 'enPassant') and move.enPassant:
-                special_flag = "en_passant"
-            elif hasattr(move, 'is_castle_move') and move.is_castle_move:
-                special_flag = "castle"
+            # Determine special flags (core.move.Move always sets all three attributes)
+            if move.pawn_promotion:
+                flags = FLAG_PROMOTION
+            elif move.enPassant:
+                flags = FLAG_EN_PASSANT
+            elif move.is_castle_move:
+                flags = FLAG_CASTLE
+            else:
+                flags = 0
             
-            internal_move = Move(
-                move.start_row, move.start_col, move.end_row, move.end_col,
-                piece, captured, special_flag
-            )
+            internal_move = encode_move(from_sq, to_sq, piece, captured, flags)
             moves.append(internal_move)
         
         return moves
     
-    def _convert_back_to_original_move(self, internal_move: Move, original_moves: List):
-        """Convert internal move back to original format"""
-        for move in original_moves:
-            if (move.start_row == internal_move.from_row and 
-                move.start_col == internal_move.from_col and
-                move.end_row == internal_move.to_row and 
-                move.end_col == internal_move.to_col):
-                return move
-        
-        return None
+    def _convert_back_to_original_move(self, internal_move: int, move_index: Dict):
+        """Convert internal move back to original format (move_index from index_moves)"""
+        from_row, from_col = divmod(internal_move >> 6 & 63, 8)
+        to_row, to_col = divmod(internal_move & 63, 8)
+        return move_index.get((from_row, from_col, to_row, to_col))
     
     def _reset_stats(self):
         """Reset search statistics"""
@@ -875,6 +1290,30 @@ class SearchEngine:
         print(f"Null move cuts: {self.stats['null_move_cuts']}")
         print(f"LMR re-searches: {self.stats['lmr_saves']}")
 
+def _lazy_smp_helper(config: AIConfig, shm_name: str, generation: int, pieces: Tuple[int, ...],
+                     white: int, black: int, root_key: int, is_white_turn: bool,
+                     moves: Tuple[int, ...], start_time: float, time_limit: float,
+                     start_depth: int) -> Tuple[int, Optional[int], int]:
+    """Helper process: search the same root into the shared TT until the main search says stop
+    
+    Returns (deepest completed depth, its best move, nodes searched).
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    engine = SearchEngine(config, shm.buf)
+    stop_offset = 32 * engine.tt.buckets
+    engine.stop_signal = shm.buf[stop_offset:stop_offset + 1]
+    try:
+        engine.tt.generation = generation
+        engine.start_time = start_time
+        engine.soft_limit = engine.hard_limit = time_limit
+        best_move = engine._iterative_deepening(Bitboard(list(pieces), white, black), root_key,
+                                                is_white_turn, moves, start_depth, verbose=False)
+        return engine.completed_depth, best_move, engine.nodes_searched
+    finally:
+        engine.stop_signal.release()
+        engine.tt.table.release()
+        shm.close()
+
 class AdvancedChessAI:
     """Main Chess AI interface - refactored and optimized"""
     
@@ -898,14 +1337,16 @@ class AdvancedChessAI:
             "opening_book.json"
         ]
         
+        # Just try each path: opening it is the existence check
         for book_path in book_paths:
-            if os.path.exists(book_path):
-                try:
-                    self.opening_book = OpeningBook(book_path)
-                    print(f"✓ Opening book loaded from {book_path}")
-                    return
-                except Exception as e:
-                    print(f"Failed to load opening book from {book_path}: {e}")
+            try:
+                self.opening_book = OpeningBook(book_path, fallback_to_default=False)
+                print(f"✓ Opening book loaded from {book_path}")
+                return
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                print(f"Failed to load opening book from {book_path}: {e}")
         
         # Fallback to default book
         try:
@@ -915,8 +1356,12 @@ class AdvancedChessAI:
             print(f"Opening book initialization failed: {e}")
             self.opening_book = None
     
-    def find_best_move(self, game_state: GameState, valid_moves: List, return_queue) -> Optional:
-        """Main interface for finding best move"""
+    def find_best_move(self, game_state: GameState, valid_moves: List, return_queue=None,
+                       remaining_time: Optional[float] = None) -> Optional:
+        """Main interface for finding best move (remaining_time: AI's clock in seconds, if any)
+        
+        The move is returned and, if a return_queue is given, also put on it.
+        """
         self.gs = game_state
         
         # Check opening book first
@@ -925,15 +1370,17 @@ class AdvancedChessAI:
             
             book_move = self._try_opening_book(game_state, valid_moves)
             if book_move:
-                return_queue.put(book_move)
+                if return_queue is not None:
+                    return_queue.put(book_move)
                 return book_move
         
         # Use search engine
         best_move = self.search_engine.find_best_move(
-            game_state.board, game_state.white_to_move, valid_moves
+            game_state.board, game_state.white_to_move, valid_moves, remaining_time
         )
         
-        return_queue.put(best_move)
+        if return_queue is not None:
+            return_queue.put(best_move)
         return best_move
     
     def _try_opening_book(self, game_state: GameState, valid_moves: List):
@@ -944,26 +1391,24 @@ class AdvancedChessAI:
                 game_state.white_to_move,
                 game_state.current_castling_rights,
                 game_state.enPassant_possible,
-                game_state.move_log
+                game_state.move_log,
+                game_state.zobrist_key
             )
             
             if book_result:
                 from_pos, to_pos, opening_name = book_result
                 
                 # Find corresponding move
-                for move in valid_moves:
-                    if (move.start_row == from_pos[0] and 
-                        move.start_col == from_pos[1] and
-                        move.end_row == to_pos[0] and 
-                        move.end_col == to_pos[1]):
-                        
-                        # Print opening info
-                        if opening_name != self.last_opening_name:
-                            print(f"\n📖 Opening: {opening_name}")
-                            self.last_opening_name = opening_name
-                        
+                move = index_moves(valid_moves).get((from_pos[0], from_pos[1], to_pos[0], to_pos[1]))
+                if move:
+                    # Print opening info
+                    if opening_name != self.last_opening_name:
+                        print(f"\n📖 Opening: {opening_name}")
+                        self.last_opening_name = opening_name
+                    
+                    if self.opening_book.debug:
                         print(f"   Book move: {move.get_chess_notation()}")
-                        return move
+                    return move
         
         except Exception as e:
             print(f"Opening book error: {e}")
@@ -974,6 +1419,10 @@ class AdvancedChessAI:
         """Cancel current search"""
         self.search_engine.cancel_search = True
     
+    def shutdown(self):
+        """Release parallel search resources"""
+        self.search_engine.shutdown()
+    
     def set_difficulty(self, level: int):
         """Set AI difficulty level"""
         if level == 1:  # Easy
@@ -1060,7 +1509,7 @@ class AdvancedChessAI:
     # Backward compatibility methods
     def evaluate_position(self, board: List[List[str]], is_white_turn: bool) -> int:
         """Evaluate position (for backward compatibility)"""
-        return self.search_engine.evaluator.evaluate_position(board, is_white_turn)
+        return self.search_engine.evaluator.evaluate_position(Bitboard.from_board(board), is_white_turn)
     
     def copy_board(self, board: List[List[str]]) -> List[List[str]]:
         """Copy board (for backward compatibility)"""
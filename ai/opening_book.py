@@ -1,19 +1,47 @@
 """Chess opening book module for improved AI opening play"""
 
 import json
+import os
+import pickle
 import random
+from functools import lru_cache
+from itertools import accumulate
 from typing import Dict, List, Optional, Tuple
 
+from core.bitboard import ZOBRIST_SIDE, board_key
+
+# orjson parses and serializes several times faster; the stdlib json is the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Binary books hold the already-indexed positions; the header rejects files from
+# another format version or Zobrist table (the keys would not match)
+BINARY_BOOK_HEADER = (1, ZOBRIST_SIDE)
+BINARY_BOOK_SUFFIX = ".pickle"  # cache written next to a JSON book
+
+# In FEN: uppercase = white, lowercase = black; None marks an empty square
+PIECE_TO_FEN = {
+    "--": None,
+    "wp": "P", "wN": "N", "wB": "B", "wR": "R", "wQ": "Q", "wK": "K",
+    "bp": "p", "bN": "n", "bB": "b", "bR": "r", "bQ": "q", "bK": "k",
+}
+
 class OpeningBook:
     """Chess opening book with popular openings and variations"""
     
-    def __init__(self, book_file: str = None):
+    def __init__(self, book_file: str = None, fallback_to_default: bool = True):
         """Initialize opening book with default openings or from file"""
         self.book = {}
+        self.positions = {}  # Zobrist key -> (book moves, cumulative weights), built from the FEN-keyed book
+        self._alg_cache = {}  # book move string ("e2e4") -> board coordinates, built with positions
         self.max_depth = 12  # Maximum opening moves to follow
+        self.debug = False  # Per-probe tracing; printing dominates a dict lookup
         
         if book_file:
-            self.load_from_file(book_file)
+            self.load_from_file(book_file, fallback_to_default)
         else:
             self.initialize_default_book()
     
@@ -193,41 +221,73 @@ class OpeningBook:
         self.book = {}
         for fen, moves in self.opening_lines.items():
             self.book[fen] = moves
+        self._index_positions()
     
-    def get_fen_from_board(self, board, white_to_move: bool, 
-                        castle_rights, en_passant) -> str:
-        """Convert board position to FEN string for lookup"""
-        fen_rows = []
+    def _index_positions(self):
+        """Key every book position by its Zobrist hash so probes never build a FEN
         
-        for row in board:
-            fen_row = ""
-            empty_count = 0
-            
-            for square in row:
-                if square == "--":
-                    empty_count += 1
+        Cumulative weights are precomputed here for random.choices; positions
+        whose weights sum to zero are left out.
+        """
+        self.positions = {}
+        for fen, moves in self.book.items():
+            try:
+                key = self.fen_to_key(fen)
+            except (ValueError, KeyError, IndexError):
+                print(f"Skipping malformed opening book position: {fen}")
+                continue
+            moves = tuple(tuple(move) for move in moves)
+            cum_weights = tuple(accumulate(weight for _, weight, _ in moves))
+            if cum_weights and cum_weights[-1] > 0:
+                self.positions[key] = (moves, cum_weights)
+        self._index_coordinates()
+    
+    def _index_coordinates(self):
+        """Parse every book move's squares once, so probes are a dict lookup"""
+        self._alg_cache = {}
+        for moves, _ in self.positions.values():
+            for move_str, _, _ in moves:
+                if move_str not in self._alg_cache:
+                    try:
+                        coords = self._parse_algebraic(move_str)
+                    except ValueError:
+                        continue  # Unplayable; probes fall back to the position's first move
+                    if coords:
+                        self._alg_cache[move_str] = coords
+    
+    @staticmethod
+    def fen_to_key(fen: str) -> int:
+        """Zobrist key (see core.bitboard.board_key) of a FEN's placement, side, castling and en passant fields"""
+        fields = fen.split()
+        board = []
+        for fen_row in fields[0].split("/"):
+            row = []
+            for char in fen_row:
+                if char.isdigit():
+                    row.extend(["--"] * int(char))
+                elif char.isupper():
+                    row.append("w" + (char if char != "P" else "p"))
                 else:
-                    if empty_count > 0:
-                        fen_row += str(empty_count)
-                        empty_count = 0
-                    
-                    # Convert piece notation correctly
-                    color = square[0]  # 'w' or 'b'
-                    piece = square[1]  # 'p', 'R', 'N', 'B', 'Q', 'K'
-                    
-                    # In FEN: uppercase = white, lowercase = black
-                    if color == 'w':
-                        fen_row += piece.upper()  # Uppercase ALL white pieces
-                    else:
-                        fen_row += piece.lower()  # Lowercase ALL black pieces
-            
-            if empty_count > 0:
-                fen_row += str(empty_count)
-            
-            fen_rows.append(fen_row)
+                    row.append("b" + (char.upper() if char != "p" else "p"))
+            if len(row) != 8:
+                raise ValueError(f"Bad FEN rank: {fen_row}")
+            board.append(row)
+        if len(board) != 8:
+            raise ValueError(f"Bad FEN placement: {fields[0]}")
         
-        # Rest of the method stays the same...
-        fen = "/".join(fen_rows)
+        castle = fields[2] if len(fields) > 2 else "-"
+        castling = (("K" in castle) | ("Q" in castle) << 1 |
+                    ("k" in castle) << 2 | ("q" in castle) << 3)
+        en_passant = fields[3] if len(fields) > 3 else "-"
+        ep_col = "abcdefgh".index(en_passant[0]) if en_passant != "-" else -1
+        return board_key(board, fields[1] == "w", castling, ep_col)
+    
+    def get_fen_from_board(self, board, white_to_move: bool, 
+                        castle_rights, en_passant) -> str:
+        """Convert board position to FEN string for lookup"""
+        # Placement is memoized on the board contents; a 64-element tuple hash
+        # is cheaper than rebuilding the ranks when the same position is asked again
+        fen = self._placement_to_fen(tuple(map(tuple, board)))
         
         # Add side to move
         fen += " w" if white_to_move else " b"
@@ -252,53 +312,90 @@ class OpeningBook:
             fen += " -"
         
         return fen
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _placement_to_fen(board) -> str:
+        """FEN piece-placement field for a board given as a tuple of row tuples"""
+        fen_rows = []
+        
+        for row in board:
+            out = []
+            empty_count = 0
+            
+            for square in row:
+                fen_char = PIECE_TO_FEN[square]
+                if fen_char is None:
+                    empty_count += 1
+                else:
+                    if empty_count:
+                        out.append(str(empty_count))
+                        empty_count = 0
+                    out.append(fen_char)
+            
+            if empty_count:
+                out.append(str(empty_count))
+            
+            fen_rows.append("".join(out))
+        
+        return "/".join(fen_rows)
         
     def get_book_move(self, board, white_to_move: bool,
                     castle_rights, en_passant, 
-                    move_history) -> Optional[Tuple[Tuple[int, int], Tuple[int, int], str]]:
-        """Get a move from the opening book"""
+                    move_history, position_key: Optional[int] = None
+                    ) -> Optional[Tuple[Tuple[int, int], Tuple[int, int], str]]:
+        """Get a move from the opening book
+        
+        ``position_key`` is the caller's Zobrist key (GameState.zobrist_key);
+        without it the key is computed from the board.
+        """
         # Check if we're still in opening phase
         if move_history and len(move_history) > self.max_depth:
             return None
         
-        # Get FEN position
-        fen = self.get_fen_from_board(board, white_to_move, castle_rights, en_passant)
+        if position_key is None:
+            ep_col = en_passant[1] if en_passant else -1
+            castling = castle_rights.to_mask() if castle_rights else 0
+            position_key = board_key(board, white_to_move, castling, ep_col)
         
-        print(f"DEBUG: Current FEN: {fen}")
-        print(f"DEBUG: Move history length: {len(move_history) if move_history else 0}")
+        if self.debug:
+            print(f"DEBUG: Position key: {position_key:016x}")
+            print(f"DEBUG: Move history length: {len(move_history) if move_history else 0}")
 
         # Look up position in book
-        if fen in self.book:
-            moves = self.book[fen]
-            print(f"DEBUG: Found {len(moves)} book moves!")
-            
-            # Select move based on weights
-            total_weight = sum(weight for _, weight, _ in moves)
-            if total_weight == 0:
-                return None
+        entry = self.positions.get(position_key)
+        if entry:
+            moves, cum_weights = entry
+            if self.debug:
+                print(f"DEBUG: Found {len(moves)} book moves!")
             
-            # Random weighted selection
-            rand_val = random.random() * total_weight
-            cumulative = 0
+            # Random weighted selection (bisect over the precomputed cumulative weights)
+            move_str, _, name = random.choices(moves, cum_weights=cum_weights)[0]
             
-            for move_str, weight, name in moves:
-                cumulative += weight
-                if rand_val <= cumulative:
-                    # Convert algebraic to board coordinates
-                    coords = self.algebraic_to_move(move_str)
-                    if coords:
-                        return coords[0], coords[1], name
+            # Convert algebraic to board coordinates (every parsable book move is cached)
+            coords = self._alg_cache.get(move_str)
+            if coords:
+                return coords[0], coords[1], name
             
             # Fallback to first move
-            coords = self.algebraic_to_move(moves[0][0])
+            coords = self._alg_cache.get(moves[0][0])
             if coords:
                 return coords[0], coords[1], moves[0][2]
         
-        print(f"DEBUG: Position not in book")
+        if self.debug:
+            print("DEBUG: Position not in book")
         return None
     
     def algebraic_to_move(self, move_str: str) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
         """Convert algebraic notation (e2e4) to board coordinates"""
+        coords = self._alg_cache.get(move_str)
+        if coords is None:
+            coords = self._parse_algebraic(move_str)  # Not a book move
+        return coords
+    
+    @staticmethod
+    def _parse_algebraic(move_str: str) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Parse a move string without the cache"""
         if len(move_str) != 4:
             return None
         
@@ -311,23 +408,78 @@ class OpeningBook:
     
     def save_to_file(self, filename: str):
         """Save opening book to JSON file"""
-        with open(filename, 'w') as f:
-            json.dump({
-                'book': self.book,
-                'max_depth': self.max_depth
-            }, f, indent=2)
+        data = {
+            'book': self.book,
+            'max_depth': self.max_depth
+        }
+        if ORJSON_AVAILABLE:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=2)
+    
+    def save_binary(self, filename: str):
+        """Pickle the book with its Zobrist-keyed positions, so loading skips parsing and keying"""
+        with open(filename, 'wb') as f:
+            pickle.dump((BINARY_BOOK_HEADER, self.book, self.positions, self.max_depth),
+                        f, protocol=5)
     
-    def load_from_file(self, filename: str):
-        """Load opening book from JSON file"""
+    def load_binary(self, filename: str):
+        """Load a book written by save_binary (ValueError if it was built with other keys)"""
+        with open(filename, 'rb') as f:
+            header, book, positions, max_depth = pickle.loads(f.read())
+        if header != BINARY_BOOK_HEADER:
+            raise ValueError(f"{filename} was written by an incompatible version")
+        self.book = book
+        self.positions = positions
+        self.max_depth = max_depth
+        self._index_coordinates()
+    
+    def _load_cached(self, filename: str) -> bool:
+        """Load the binary cache of a JSON book if it is at least as new as the JSON"""
+        cache = filename + BINARY_BOOK_SUFFIX
+        try:
+            if os.stat(cache).st_mtime < os.stat(filename).st_mtime:
+                return False
+            self.load_binary(cache)
+            return True
+        except (OSError, ValueError, TypeError, EOFError, pickle.UnpicklingError):
+            return False
+    
+    def _save_cache(self, filename: str):
+        """Write the binary cache next to a JSON book; a read-only directory just means no cache"""
+        try:
+            self.save_binary(filename + BINARY_BOOK_SUFFIX)
+        except OSError:
+            pass
+    
+    def load_from_file(self, filename: str, fallback_to_default: bool = True):
+        """Load opening book from JSON file (errors propagate if fallback_to_default is False)
+        
+        The parsed and indexed book is cached next to the file (see save_binary)
+        and used instead of the JSON until the JSON is modified.
+        """
+        if self._load_cached(filename):
+            print(f"Loaded opening book with {len(self.book)} positions")
+            return
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
+            # Both parsers take the raw bytes; orjson.JSONDecodeError subclasses json's
+            with open(filename, 'rb') as f:
+                raw = f.read()
+                data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
                 self.book = data.get('book', {})
                 self.max_depth = data.get('max_depth', 12)
+                self._index_positions()
+                self._save_cache(filename)
                 print(f"Loaded opening book with {len(self.book)} positions")
         except FileNotFoundError:
+            if not fallback_to_default:
+                raise
             print(f"Opening book file {filename} not found. Using default openings.")
             self.initialize_default_book()
         except json.JSONDecodeError:
+            if not fallback_to_default:
+                raise
             print(f"Error reading opening book file {filename}. Using default openings.")
             self.initialize_default_book()
\ No newline at end of file
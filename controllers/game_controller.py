@@ -1,36 +1,146 @@
 """Game controller handling user input and game flow"""
 
 from __future__ import annotations
+import gc
+import logging
+import sys
 import threading
 import queue
-from typing import List, Dict, Any, Tuple
+from collections import deque
+from itertools import chain
+from random import choice as _choice
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from multiprocessing import RawArray, util
+from typing import List, Dict, Any, Optional, Tuple
 
 from core import GameState, Move, ConstantValues, SaveManager
+from core.bitboard import Bitboard
 from ai import AdvancedChessAI
+from ai.advanced_ai import AIConfig, Evaluator
+
+# Controller messages go through logging so they can be silenced (AI vs AI
+# would otherwise write to stdout on every move); by default they print as before
+logger = logging.getLogger('chess')
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+class FastQueue:
+    """Minimal thread-safe FIFO for handing the AI's move to the UI thread
+    
+    Same put/get_nowait/empty interface as queue.Queue (get_nowait raises
+    queue.Empty), without its condition variables; empty() is a plain
+    length check since the UI polls it every frame.
+    """
+    __slots__ = ('_dq', '_lock')
+    
+    def __init__(self):
+        self._dq = deque()
+        self._lock = threading.Lock()
+    
+    def put(self, item):
+        with self._lock:
+            self._dq.append(item)
+    
+    def get_nowait(self):
+        with self._lock:
+            try:
+                return self._dq.popleft()
+            except IndexError:
+                raise queue.Empty from None
+    
+    def empty(self) -> bool:
+        return not self._dq
+    
+    def reset(self):
+        """Drop everything queued, under a single lock acquisition"""
+        with self._lock:
+            self._dq.clear()
+
+# AIConfig fields the controller may change between moves; copied into the AI process per search
+AI_SEARCH_SETTINGS = ('max_depth', 'time_limit', 'use_opening_book', 'use_null_move_pruning',
+                      'use_lmr', 'use_killer_moves', 'search_workers')
+
+# The AI process's engine; it lives for the whole game so its TT carries over between moves
+_worker_ai = None
+
+def _init_ai_worker(config, stop_flag):
+    """AI process initializer: build the engine and wire up the cross-process stop flag"""
+    global _worker_ai
+    _worker_ai = AdvancedChessAI(GameState(), config)
+    _worker_ai.search_engine.stop_signal = stop_flag
+    util.Finalize(_worker_ai, _worker_ai.shutdown, exitpriority=10)
+    # The engine's tables live as long as the process; keep collections
+    # triggered by per-move allocations from rescanning them
+    gc.freeze()
+
+def _ai_worker(game_state: GameState, move_codes: List[int], config) -> Tuple[Optional[int], Dict]:
+    """Search in the AI process; moves cross the process boundary as Move.encode() ints
+    
+    Returns the chosen move's code (or None) and the search statistics.
+    """
+    for name in AI_SEARCH_SETTINGS:
+        setattr(_worker_ai.config, name, getattr(config, name))
+    board = game_state.board
+    move = _worker_ai.find_best_move(game_state, [Move.decode(code, board) for code in move_codes])
+    return (move.encode() if move else None), _worker_ai.get_search_stats()
+
+def _clear_ai_worker():
+    """Forget the previous game's positions (new or loaded game)"""
+    _worker_ai.tt.clear()
 
 class GameController:
+    # Fixed attribute set: the UI loop reads these every frame
+    __slots__ = (
+        'constants', 'game_state', 'ai_config', 'evaluator', 'save_manager', '_signed_values',
+        'valid_moves', '_move_index', 'sq_size', 'move_made', 'animate_move',
+        'game_over', 'sq_selected', 'player_clicks', 'return_queue',
+        'ai_is_thinking', 'undo_move_flag', '_ai_stop', '_ai_pool', '_ai_future',
+        '_ai_search_id', 'last_search_stats', 'player_one', 'player_two',
+        'random_turn', 'promote', 'ai_time_limit', 'ai_depth', 'total_ai_time',
+        'ai_moves_made', 'recent_moves', '_human_turn',
+        '_turn_handler', '_stage_settings',
+    )
+
     def __init__(self):
         """Initialize game controller with enhanced AI integration"""
         
         # Core game components
         self.constants = ConstantValues()
         self.game_state = GameState()
-        self.ai = AdvancedChessAI(self.game_state)
+        # Every search runs in the AI process, which builds the engine (TT, opening
+        # book) from this config; this side only needs the config and an evaluator
+        self.ai_config = AIConfig()
+        self.evaluator = Evaluator(self.ai_config)
         self.save_manager = SaveManager()
+        # Material value of each board string, signed by colour, for get_position_analysis
+        piece_values = self.ai_config.piece_values
+        self._signed_values = {"--": 0}
+        for piece, value in piece_values.items():
+            self._signed_values['w' + piece] = value
+            self._signed_values['b' + piece] = -value
         
         # Game state
-        self.valid_moves = self.game_state.get_valid_moves()
-        self.sq_size = self.constants.SQ_SIZE
+        self.refresh_valid_moves()
+        self.sq_size = ConstantValues.SQ_SIZE
         self.move_made = self.game_state.move_made
         self.animate_move = self.game_state.animate_move
         self.game_over = self.game_state.game_over
         self.sq_selected = self.game_state.sq_selected 
         self.player_clicks = self.game_state.player_clicks
         
-        # AI threading
-        self.return_queue = queue.Queue()
+        # AI process: the search runs outside this interpreter, so it never holds
+        # the GIL the render loop needs; results come back through return_queue
+        self.return_queue = FastQueue()
         self.ai_is_thinking = False
-        self.move_find_thread = None
+        self._ai_stop = RawArray('b', 1)  # set to stop the AI process's search
+        self._ai_pool = ProcessPoolExecutor(max_workers=1, initializer=_init_ai_worker,
+                                            initargs=(self.ai_config, self._ai_stop))
+        self._ai_future = None
+        self._ai_search_id = 0
+        self.last_search_stats = {}
         self.undo_move_flag = False
         
         # Game mode settings
@@ -38,14 +148,21 @@ class GameController:
         self.player_two = True   # Black player is human
         self.random_turn = False # Random move mode
         self.promote = True      # Pawn promotion UI flag
+        self._update_turn()
         
         # AI performance settings
         self.ai_time_limit = 5.0
         self.ai_depth = 6
+        self._update_stage_settings()
         
         # Statistics
         self.total_ai_time = 0.0
         self.ai_moves_made = 0
+        self.recent_moves = deque(maxlen=128)  # Notation of the latest moves, for the UI
+
+    def set_verbose(self, verbose: bool):
+        """Show (INFO) or hide (WARNING and up only) the controller's progress messages"""
+        logger.setLevel(logging.INFO if verbose else logging.WARNING)
 
     # Game mode setters
     def set_player_vs_player(self):
@@ -53,30 +170,40 @@ class GameController:
         self.player_one = True
         self.player_two = True
         self.random_turn = False
+        self.set_verbose(True)
+        self._update_turn()
 
     def set_ai_vs_ai(self):
         """Set game mode to AI vs AI"""
         self.player_one = False
         self.player_two = False
         self.random_turn = False
+        self.set_verbose(False)  # Per-move messages would dominate self-play
+        self._update_turn()
 
     def set_ai_black(self):
         """Set game mode to human vs AI (AI plays black)"""
         self.player_one = True
         self.player_two = False
         self.random_turn = False
+        self.set_verbose(True)
+        self._update_turn()
 
     def set_ai_white(self):
         """Set game mode to AI vs human (AI plays white)"""
         self.player_one = False
         self.player_two = True
         self.random_turn = False
+        self.set_verbose(True)
+        self._update_turn()
         
     def set_random_vs_ai(self):
         """Set game mode to random vs AI"""
         self.player_one = False
         self.player_two = True
         self.random_turn = True
+        self.set_verbose(True)
+        self._update_turn()
 
     # Getters for UI
     def needs_pawn_promotion(self) -> bool:
@@ -94,6 +221,14 @@ class GameController:
     def get_valid_moves(self) -> List[Move]:
         return self.valid_moves
 
+    def refresh_valid_moves(self):
+        """Regenerate the legal moves and index them by their squares (Move.encode() & 0xFFF)
+        
+        Squares identify a legal move uniquely (the promotion piece is chosen separately).
+        """
+        self.valid_moves = self.game_state.get_valid_moves()
+        self._move_index = {move.encode() & 0xFFF: move for move in self.valid_moves}
+
     def get_selected_square(self) -> Tuple[int, int]:
         return self.sq_selected
 
@@ -104,8 +239,21 @@ class GameController:
         return self.game_state.white_to_move
 
     def is_human_turn(self) -> bool:
-        return ((self.game_state.white_to_move and self.player_one) or 
-                (not self.game_state.white_to_move and self.player_two))
+        return self._human_turn
+
+    def _update_turn(self):
+        """Recompute is_human_turn() and the handler handle_turn() dispatches to
+        
+        Call after the side to move, the players, random mode or game_over change.
+        """
+        white_to_move = self.game_state.white_to_move
+        self._human_turn = self.player_one if white_to_move else self.player_two
+        if self.game_over:
+            self._turn_handler = self._run_idle
+        elif self._human_turn:
+            self._turn_handler = self._run_random if self.random_turn else self._run_idle
+        else:
+            self._turn_handler = self._run_ai
 
     def get_move_log(self) -> List[Move]:
         return self.game_state.move_log
@@ -114,127 +262,138 @@ class GameController:
     def handle_mouse_click(self, location: Tuple[int, int]):
         """Handle mouse clicks on the board"""
         if not self.game_over and not self.random_turn:
-            col = location[0] // self.sq_size
-            row = location[1] // self.sq_size
+            sq_size = self.sq_size
+            col = location[0] // sq_size
+            row = location[1] // sq_size
+            square = (row, col)
             
-            if self.sq_selected == (row, col):
+            if self.sq_selected == square:
                 # Deselect if clicking same square
                 self.sq_selected = ()
                 self.player_clicks = []
             else:
-                self.sq_selected = (row, col)
-                self.player_clicks.append(self.sq_selected)
+                self.sq_selected = square
+                clicks = self.player_clicks
+                clicks.append(square)
                 
                 # Process move if two squares selected
-                if len(self.player_clicks) == 2 and self.is_human_turn():
-                    attempted_move = Move(
-                        self.player_clicks[0], 
-                        self.player_clicks[1], 
-                        self.game_state.board
-                    )
-                    print(f"Player attempting: {attempted_move.get_chess_notation()}")
+                if len(clicks) == 2 and self.is_human_turn():
+                    game_state = self.game_state
+                    start, end = clicks
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("Player attempting: %s",
+                                    Move(start, end, game_state.board).get_chess_notation())
                     
                     # Find matching valid move
-                    for valid_move in self.valid_moves:
-                        if attempted_move == valid_move:
-                            self.promote = True
-                            self.game_state.make_move(valid_move)
-                            self.move_made = True
-                            valid_move.set_last_moved(self.game_state.turn_num)
-                            self.animate_move = True
-                            self.promote = False
-                            self.sq_selected = ()
-                            self.player_clicks = []
-                            print(f"Move executed: {valid_move.get_chess_notation()}")
-                            break
+                    valid_move = self._move_index.get((start[0] * 8 + start[1]) << 6 | row * 8 + col)
+                    if valid_move is not None:
+                        self.promote = True
+                        game_state.make_move(valid_move)
+                        self._update_turn()
+                        self.move_made = True
+                        valid_move.set_last_moved(game_state.turn_num)
+                        self.animate_move = True
+                        self.promote = False
+                        self.sq_selected = ()
+                        self.player_clicks = []
+                        notation = valid_move.get_chess_notation()
+                        self.recent_moves.append(notation)
+                        logger.info("Move executed: %s", notation)
                     
                     if not self.move_made:
                         # Invalid move, keep first click
-                        self.player_clicks = [self.sq_selected]
-
-    def handle_random_move(self):
-        """Handle random moves when in random mode"""
-        if self.random_turn and self.is_human_turn() and not self.game_over:
-            if self.valid_moves:
-                random_move = self.ai.find_random_move(self.valid_moves)
-                if random_move:
-                    print(f"Random move: {random_move.get_chess_notation()}")
-                    self.game_state.make_move(random_move)
-                    random_move.set_last_moved(self.game_state.turn_num)
-                    self.move_made = True
-                    self.animate_move = True
-                    self.ai_is_thinking = False
-                    self.promote = False
+                        self.player_clicks = [square]
+
+    def handle_turn(self):
+        """Let the side to move act (random mover or AI); called once per frame
+        
+        Human moves come through handle_mouse_click instead.
+        """
+        self._turn_handler()
+
+    def _run_idle(self):
+        """Turn handler while waiting for the human, or once the game is over"""
+
+    def _run_random(self):
+        """Turn handler for the random mover: play a random legal move"""
+        if self.valid_moves:
+            random_move = _choice(self.valid_moves)
+            notation = random_move.get_chess_notation()
+            self.recent_moves.append(notation)
+            logger.info("Random move: %s", notation)
+            self.game_state.make_move(random_move)
+            self._update_turn()
+            random_move.set_last_moved(self.game_state.turn_num)
+            self.move_made = True
+            self.animate_move = True
+            self.ai_is_thinking = False
+            self.promote = False
 
     def undo_move(self):
         """Undo the last move"""
         if self.game_state.turn_num > 0 and len(self.game_state.move_log) > 0:
-            print("Undoing move...")
+            logger.info("Undoing move...")
+            if self.recent_moves:
+                self.recent_moves.pop()
             self.game_state.turn_num -= 1
             self.game_state.move_log[-1].set_last_moved(self.game_state.turn_num)
             self.game_state.undo_move()
             self.move_made = True
             self.animate_move = False
             self.game_over = False
+            self._update_turn()
             
             # Cancel AI search if in progress
             if self.ai_is_thinking:
-                self.ai.cancel_search_now()
-                if self.move_find_thread and self.move_find_thread.is_alive():
-                    self.move_find_thread.join(timeout=0.5)
-                self.ai_is_thinking = False
-                print("AI search cancelled")
+                self._cancel_ai_search(timeout=0.5)
+                logger.info("AI search cancelled")
             
             self.undo_move_flag = True
 
-    def handle_ai_move(self):
-        """Handle AI move generation and execution"""
-        if not self.game_over and not self.undo_move_flag and not self.is_human_turn():
+    def _run_ai(self):
+        """Turn handler for the AI: start a search, or play its result once queued"""
+        # A move made this frame is processed (and valid_moves refreshed) by
+        # process_moves first, so valid_moves is current whenever a search starts
+        if not self.undo_move_flag and not self.move_made:
             if not self.ai_is_thinking:
                 # Start AI thinking
                 self.ai_is_thinking = True
                 
-                # Update valid moves
-                self.valid_moves = self.game_state.get_valid_moves()
-                
                 if not self.valid_moves:
-                    print("No valid moves available for AI")
+                    logger.info("No valid moves available for AI")
                     self.ai_is_thinking = False
                     return
                 
                 # Clear previous results
-                while not self.return_queue.empty():
-                    try:
-                        self.return_queue.get_nowait()
-                    except queue.Empty:
-                        break
+                self.return_queue.reset()
                 
                 # Configure AI for current position
                 self.configure_ai_for_position()
                 
-                print(f"AI thinking (depth={self.ai.max_depth}, time={self.ai.time_limit}s)...")
+                logger.info("AI thinking (depth=%s, time=%ss)...",
+                            self.ai_config.max_depth, self.ai_config.time_limit)
                 
-                # Start AI search thread
-                self.move_find_thread = threading.Thread(
-                    target=self.ai.find_best_move,
-                    args=(self.game_state, list(self.valid_moves), self.return_queue),
-                    daemon=True
-                )
-                self.move_find_thread.start()
+                self._start_ai_search()
                 
             # Check if AI search is complete
-            elif not self.move_find_thread.is_alive():
+            elif not self.return_queue.empty():
                 try:
-                    ai_move = self.return_queue.get_nowait()
+                    search_id, move_code = self.return_queue.get_nowait()
+                    if search_id != self._ai_search_id:
+                        return  # Result of a cancelled search
                     
+                    ai_move = None if move_code is None else self._move_index.get(move_code & 0xFFF)
                     if ai_move is None:
-                        print("AI returned no move, using random fallback")
-                        ai_move = self.ai.find_random_move(self.valid_moves)
+                        logger.warning("AI returned no move, using random fallback")
+                        ai_move = _choice(self.valid_moves) if self.valid_moves else None
                     
                     if ai_move:
-                        print(f"AI selected: {ai_move.get_chess_notation()}")
+                        notation = ai_move.get_chess_notation()
+                        self.recent_moves.append(notation)
+                        logger.info("AI selected: %s", notation)
                         self.promote = True
                         self.game_state.make_move(ai_move)
+                        self._update_turn()
                         ai_move.set_last_moved(self.game_state.turn_num)
                         self.move_made = True
                         self.animate_move = True
@@ -243,31 +402,80 @@ class GameController:
                         
                         # Update statistics
                         self.ai_moves_made += 1
-                        print(f"AI move #{self.ai_moves_made} completed")
+                        logger.info("AI move #%d completed", self.ai_moves_made)
                     else:
-                        print("No AI move available")
+                        logger.warning("No AI move available")
                         self.ai_is_thinking = False
                         
                 except queue.Empty:
                     # AI still thinking - this is normal
                     pass
 
+    def _start_ai_search(self):
+        """Submit the search to the AI process; the result is queued by a done-callback"""
+        self._ai_search_id += 1
+        search_id = self._ai_search_id
+        self._ai_stop[0] = 0
+        self._ai_future = self._submit_to_ai_pool(
+            _ai_worker, self.game_state, [move.encode() for move in self.valid_moves], self.ai_config)
+        if self._ai_future is None:
+            self.return_queue.put((search_id, None))
+            return
+        self._ai_future.add_done_callback(
+            lambda future: self.return_queue.put((search_id, self._ai_result(future))))
+
+    def _submit_to_ai_pool(self, fn, *args) -> Optional[Future]:
+        """Submit fn(*args) to the AI process (None if the process is gone)
+
+        A crashed worker breaks the pool, so a fresh one is started for the
+        next submit; it begins with an empty transposition table, so a dropped
+        clear needs no retry.
+        """
+        try:
+            return self._ai_pool.submit(fn, *args)
+        except Exception as e:
+            logger.warning("AI process unavailable: %s", e)
+            self._ai_pool.shutdown(wait=False, cancel_futures=True)
+            self._ai_pool = ProcessPoolExecutor(max_workers=1, initializer=_init_ai_worker,
+                                                initargs=(self.ai_config, self._ai_stop))
+            return None
+
+    def _ai_result(self, future: Future) -> Optional[int]:
+        """Move code from a finished AI future (None if it failed or was cancelled)"""
+        try:
+            move, self.last_search_stats = future.result()
+            return move
+        except Exception as e:
+            logger.warning("AI search failed: %s", e)
+            return None
+
+    def _cancel_ai_search(self, timeout: float):
+        """Stop the AI process's search and wait briefly for it to wind down"""
+        self._ai_stop[0] = 1
+        if self._ai_future is not None:
+            self._ai_future.cancel()
+            wait([self._ai_future], timeout=timeout)
+            self._ai_future = None
+        self.ai_is_thinking = False
+
+    def _update_stage_settings(self):
+        """Derive the (time_limit, max_depth) used in each game stage from
+        ai_time_limit/ai_depth; call whenever those change"""
+        time_limit, depth = self.ai_time_limit, self.ai_depth
+        self._stage_settings = (
+            (min(time_limit, 3.0), min(depth, 5)),              # Opening
+            (time_limit, depth),                                # Middlegame
+            (min(time_limit * 1.5, 8.0), min(depth + 1, 10)),  # Endgame
+        )
+
     def configure_ai_for_position(self):
         """Configure AI parameters based on game stage"""
-        # Count pieces to determine game stage
-        piece_count = sum(1 for row in self.game_state.board 
-                         for square in row if square != "--")
+        # Piece count (maintained by GameState) determines game stage
+        piece_count = self.game_state.piece_count
+        stage = 0 if piece_count > 24 else 1 if piece_count > 12 else 2
         
-        # Adjust AI parameters based on game stage
-        if piece_count > 24:  # Opening
-            self.ai.time_limit = min(self.ai_time_limit, 3.0)
-            self.ai.max_depth = min(self.ai_depth, 5)
-        elif piece_count > 12:  # Middlegame
-            self.ai.time_limit = self.ai_time_limit
-            self.ai.max_depth = self.ai_depth
-        else:  # Endgame
-            self.ai.time_limit = min(self.ai_time_limit * 1.5, 8.0)
-            self.ai.max_depth = min(self.ai_depth + 1, 10)
+        config = self.ai_config
+        config.time_limit, config.max_depth = self._stage_settings[stage]
 
     def process_moves(self, screen, clock, view):
         """Process move execution and game state updates"""
@@ -278,44 +486,35 @@ class GameController:
                 view.animate_move(self.game_state.move_log[-1], screen, 
                                 self.game_state.board, clock)
             
-            # Update valid moves and check for game end
-            self.valid_moves = self.game_state.get_valid_moves()
+            # Update valid moves; generating them also sets checkmate/stalemate
+            self.refresh_valid_moves()
             self.move_made = False
             self.animate_move = False
             self.undo_move_flag = False
-            
-            # Check for checkmate/stalemate
-            if len(self.valid_moves) == 0:
-                if self.game_state.in_check:
-                    self.game_state.checkmate = True
-                else:
-                    self.game_state.stalemate = True
         
         # Display game end messages
-        if self.game_state.checkmate:
-            self.game_over = True
-            winner = "Black" if self.game_state.white_to_move else "White"
-            view.draw_text(screen, f"{winner} wins by checkmate")
-        elif self.game_state.stalemate:
-            self.game_over = True
-            view.draw_text(screen, "Draw by stalemate")
+        if self.game_state.checkmate or self.game_state.stalemate:
+            if not self.game_over:
+                self.game_over = True
+                self._update_turn()
+            if self.game_state.checkmate:
+                winner = "Black" if self.game_state.white_to_move else "White"
+                view.draw_text(screen, f"{winner} wins by checkmate")
+            else:
+                view.draw_text(screen, "Draw by stalemate")
 
     # Game management
     def reset_game(self):
         """Reset the game to initial state"""
-        print("Resetting game...")
+        logger.info("Resetting game...")
         
         # Cancel any ongoing AI search
         if self.ai_is_thinking:
-            self.ai.cancel_search_now()
-            if self.move_find_thread and self.move_find_thread.is_alive():
-                self.move_find_thread.join(timeout=1.0)
-            self.ai_is_thinking = False
+            self._cancel_ai_search(timeout=1.0)
         
-        # Reset game state
-        self.game_state = GameState()
-        self.ai.gs = self.game_state  # Update AI reference
-        self.ai.tt.clear()   # Clear transposition table
+        # Reset game state and clear the AI process's transposition table
+        self.game_state.reset_in_place()
+        self._submit_to_ai_pool(_clear_ai_worker)
         
         # Reset controller state
         self.move_made = True
@@ -324,12 +523,14 @@ class GameController:
         self.undo_move_flag = True
         self.sq_selected = ()
         self.player_clicks = []
+        self._update_turn()
         
         # Reset statistics
         self.total_ai_time = 0.0
         self.ai_moves_made = 0
         
-        print("Game reset complete")
+        self.recent_moves.clear()
+        logger.info("Game reset complete")
 
     def save_game(self):
         """Save current game state"""
@@ -340,57 +541,68 @@ class GameController:
             'player_two': self.player_two
         }
         
+        # The file is written in the background; a failed write is reported
+        # by the next save, or on exit
         success = self.save_manager.save_game(self.game_state, ai_settings)
         if success:
-            print("Game saved successfully")
+            logger.info("Saving game...")
         else:
-            print("Failed to save game")
+            logger.warning("Failed to save game")
 
     def load_game(self):
         """Load saved game state"""
         save_data = self.save_manager.load_game()
         if save_data:
+            # A search started on the old position must not play into the loaded one
+            if self.ai_is_thinking:
+                self._cancel_ai_search(timeout=1.0)
+            self._ai_search_id += 1
             self.game_state = save_data['game_state']
             
             # Load AI settings if available
             ai_settings = save_data.get('ai_settings', {})
             self.ai_depth = ai_settings.get('ai_depth', 6)
             self.ai_time_limit = ai_settings.get('ai_time_limit', 5.0)
+            self._update_stage_settings()
             self.player_one = ai_settings.get('player_one', True)
             self.player_two = ai_settings.get('player_two', True)
+            self._update_turn()
             
-            # Update AI reference and clear cache
-            self.ai.gs = self.game_state
-            self.ai.tt.clear()
+            # Clear the AI process's transposition table
+            self._submit_to_ai_pool(_clear_ai_worker)
             
             # Update valid moves
-            self.valid_moves = self.game_state.get_valid_moves()
+            self.refresh_valid_moves()
             self.move_made = True
             
-            print("Game loaded successfully")
+            self.recent_moves = deque((move.get_chess_notation() for move in self.game_state.move_log),
+                                      maxlen=self.recent_moves.maxlen)
+            logger.info("Game loaded successfully")
         else:
-            print("Failed to load game")
+            logger.warning("Failed to load game")
 
     def set_ai_difficulty(self, level: int):
         """Set AI difficulty level (1=Easy, 2=Normal, 3=Hard)"""
         if level == 1:  # Easy
             self.ai_depth = 4
             self.ai_time_limit = 2.0
-            print("AI difficulty: Easy (depth=4, time=2s)")
+            logger.info("AI difficulty: Easy (depth=4, time=2s)")
         elif level == 2:  # Normal
             self.ai_depth = 6
             self.ai_time_limit = 5.0
-            print("AI difficulty: Normal (depth=6, time=5s)")
+            logger.info("AI difficulty: Normal (depth=6, time=5s)")
         elif level == 3:  # Hard
             self.ai_depth = 8
             self.ai_time_limit = 10.0
-            print("AI difficulty: Hard (depth=8, time=10s)")
+            logger.info("AI difficulty: Hard (depth=8, time=10s)")
         else:
             self.ai_depth = 6
             self.ai_time_limit = 5.0
+        self._update_stage_settings()
         
-        # Update AI settings
-        self.ai.set_difficulty(level)
+        # Update AI settings (per-stage values replace these before each search)
+        self.ai_config.max_depth = self.ai_depth
+        self.ai_config.time_limit = self.ai_time_limit
     
     def get_ai_stats(self) -> Dict[str, Any]:
         """Get AI performance statistics"""
@@ -399,28 +611,20 @@ class GameController:
             'average_time': self.total_ai_time / max(self.ai_moves_made, 1),
             'current_depth': self.ai_depth,
             'time_limit': self.ai_time_limit,
-            'tt_hit_rate': self.ai.tt.get_hit_rate(),
-            'nodes_searched': getattr(self.ai, 'nodes_searched', 0)
+            'tt_hit_rate': self.last_search_stats.get('tt_hit_rate', 0.0),
+            'nodes_searched': self.last_search_stats.get('nodes_searched', 0)
         }
 
     def get_position_analysis(self) -> Dict[str, Any]:
         """Get analysis of current position"""
-        # Quick position evaluation
-        board_copy = [row[:] for row in self.game_state.board]
-        evaluation = self.ai.evaluate_position(board_copy, self.game_state.white_to_move)
+        # Quick position evaluation (read-only: it builds its own bitboards from the board)
+        evaluation = self.evaluator.evaluate_position(Bitboard.from_board(self.game_state.board),
+                                                      self.game_state.white_to_move)
         
-        # Count material and pieces
-        material_balance = 0
-        piece_count = 0
-        for row in self.game_state.board:
-            for square in row:
-                if square != "--":
-                    piece_count += 1
-                    value = self.ai.piece_values.get(square[1], 0)
-                    if square[0] == 'w':
-                        material_balance += value
-                    else:
-                        material_balance -= value
+        # Count material; GameState already tracks the piece count
+        piece_count = self.game_state.piece_count
+        material_balance = sum(map(self._signed_values.__getitem__,
+                                   chain.from_iterable(self.game_state.board)))
         
         return {
             'evaluation': evaluation,
@@ -432,18 +636,18 @@ class GameController:
 
     def terminate(self):
         """Clean up resources when exiting"""
-        print("Terminating controller...")
+        logger.info("Terminating controller...")
         
         if self.ai_is_thinking:
-            print("Cancelling AI search...")
-            self.ai.cancel_search_now()
+            logger.info("Cancelling AI search...")
+            self._cancel_ai_search(timeout=2.0)
+        
+        self._ai_pool.shutdown(wait=False, cancel_futures=True)
         
-        if self.move_find_thread and self.move_find_thread.is_alive():
-            self.move_find_thread.join(timeout=2.0)
-            if self.move_find_thread.is_alive():
-                print("Warning: AI thread did not terminate cleanly")
+        if not self.save_manager.wait_for_save():
+            logger.warning("Failed to save game: %s", self.save_manager.last_save_error)
         
         # Print final statistics
         if self.ai_moves_made > 0:
             avg_time = self.total_ai_time / self.ai_moves_made
-            print(f"AI Statistics: {self.ai_moves_made} moves, {avg_time:.2f}s average")
\ No newline at end of file
+            logger.info("AI Statistics: %d moves, %.2fs average", self.ai_moves_made, avg_time)
\ No newline at end of file
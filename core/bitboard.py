@@ -0,0 +1,330 @@
+"""Bitboard primitives shared by the search engine and board analysis"""
+
+from __future__ import annotations
+import marshal
+import os
+import random
+import sys
+from dataclasses import dataclass, field
+from typing import List
+
+# Square indexing follows the GUI board: sq = row * 8 + col, so a8 is 0 and h1 is 63.
+# White pawns therefore advance towards lower square numbers.
+
+# Piece codes (0 is an empty square)
+EMPTY = 0
+WP, WN, WB, WR, WQ, WK = 1, 2, 3, 4, 5, 6
+BP, BN, BB, BR, BQ, BK = 7, 8, 9, 10, 11, 12
+
+PIECE_NAMES = ("--", "wp", "wN", "wB", "wR", "wQ", "wK",
+               "bp", "bN", "bB", "bR", "bQ", "bK")
+PIECE_CODES = {name: code for code, name in enumerate(PIECE_NAMES)}
+
+WHITE_PIECES = (WP, WN, WB, WR, WQ, WK)
+BLACK_PIECES = (BP, BN, BB, BR, BQ, BK)
+
+WHITE, BLACK = 0, 1
+
+
+def square(row: int, col: int) -> int:
+    return row * 8 + col
+
+
+def _leaper_attacks(offsets) -> tuple:
+    """Attack sets for a piece that jumps by fixed (row, col) offsets"""
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        bb = 0
+        for dr, dc in offsets:
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                bb |= 1 << (r * 8 + c)
+        table.append(bb)
+    return tuple(table)
+
+
+KNIGHT_ATTACKS = _leaper_attacks([(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+                                  (1, -2), (1, 2), (2, -1), (2, 1)])
+KING_ATTACKS = _leaper_attacks([(0, 1), (0, -1), (1, 0), (-1, 0),
+                                (1, 1), (1, -1), (-1, 1), (-1, -1)])
+# PAWN_ATTACKS[color][sq]: squares a pawn of that color on sq captures on
+PAWN_ATTACKS = (_leaper_attacks([(-1, -1), (-1, 1)]),
+                _leaper_attacks([(1, -1), (1, 1)]))
+
+# PAWN_SHIELD[color][sq]: the three squares directly in front of a king on sq
+PAWN_SHIELD = (_leaper_attacks([(-1, -1), (-1, 0), (-1, 1)]),
+               _leaper_attacks([(1, -1), (1, 0), (1, 1)]))
+
+ROOK_DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+FULL_BOARD = (1 << 64) - 1
+RANK_1 = 0xFF << 56
+RANK_3 = 0xFF << 40
+RANK_6 = 0xFF << 16
+RANK_8 = 0xFF
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+FILE_MASKS = tuple(FILE_A << col for col in range(8))
+
+
+def _passed_pawn_masks(direction: int) -> tuple:
+    """Squares ahead of a pawn on its own and adjacent files"""
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        mask = 0
+        r = row + direction
+        while 0 <= r < 8:
+            for c in (col - 1, col, col + 1):
+                if 0 <= c < 8:
+                    mask |= 1 << (r * 8 + c)
+            r += direction
+        table.append(mask)
+    return tuple(table)
+
+
+# PASSED_PAWN_MASKS[color][sq]: a pawn is passed when no enemy pawn is on its mask
+PASSED_PAWN_MASKS = (_passed_pawn_masks(-1), _passed_pawn_masks(1))
+
+# CASTLE_MASK[sq]: castling rights (CastleRights.to_mask() bits) that survive a move
+# from or to sq; moving a king or rook off its home square, or capturing on a
+# rook's home square, clears the rights that depend on it
+CASTLE_MASK = tuple(
+    15 & ~{56: 2, 60: 3, 63: 1, 0: 8, 4: 12, 7: 4}.get(sq, 0) for sq in range(64)
+)
+
+
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count  # Python 3.10+: a single POPCNT instead of a string count
+else:
+    def popcount(bb: int) -> int:
+        return bin(bb).count("1")
+
+
+def sliding_attacks(sq: int, occupied: int, directions) -> int:
+    """Ray attacks from sq, stopping at (and including) the first blocker"""
+    row, col = divmod(sq, 8)
+    attacks = 0
+    for dr, dc in directions:
+        r, c = row + dr, col + dc
+        while 0 <= r < 8 and 0 <= c < 8:
+            bit = 1 << (r * 8 + c)
+            attacks |= bit
+            if occupied & bit:
+                break
+            r += dr
+            c += dc
+    return attacks
+
+
+def _relevant_mask(sq: int, directions) -> int:
+    """Squares whose occupancy can block a slider on sq (board edges excluded)"""
+    row, col = divmod(sq, 8)
+    mask = 0
+    for dr, dc in directions:
+        r, c = row + dr, col + dc
+        while 0 <= r + dr < 8 and 0 <= c + dc < 8:
+            mask |= 1 << (r * 8 + c)
+            r += dr
+            c += dc
+    return mask
+
+
+def _slider_table(directions):
+    """Per-square masks and attack dicts keyed by the masked occupancy
+
+    This plays the role of magic/PEXT indexing: ``occupied & mask[sq]`` is the
+    key, and CPython's int hashing replaces the multiply-shift step.
+    """
+    masks = tuple(_relevant_mask(sq, directions) for sq in range(64))
+    tables = []
+    for sq in range(64):
+        mask = masks[sq]
+        attacks = {}
+        subset = 0
+        while True:  # Enumerate every subset of the mask (carry-rippler)
+            attacks[subset] = sliding_attacks(sq, subset, directions)
+            subset = (subset - mask) & mask
+            if not subset:
+                break
+        tables.append(attacks)
+    return masks, tuple(tables)
+
+
+# Building the slider tables takes a noticeable fraction of a second, so they are
+# cached next to the bytecode and loaded with marshal on later imports.
+_TABLE_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__",
+                            f"slider_tables.{sys.implementation.cache_tag}.marshal")
+
+
+def _load_slider_tables():
+    """Slider tables from the on-disk cache, rebuilt (and re-cached) if unusable"""
+    try:
+        with open(_TABLE_CACHE, "rb") as f:
+            tables = marshal.loads(f.read())  # marshal.load on the file object is ~10x slower
+        if len(tables) == 4 and all(len(table) == 64 for table in tables):
+            return tables
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    
+    tables = _slider_table(ROOK_DIRECTIONS) + _slider_table(BISHOP_DIRECTIONS)
+    try:
+        os.makedirs(os.path.dirname(_TABLE_CACHE), exist_ok=True)
+        temp_path = f"{_TABLE_CACHE}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            marshal.dump(tables, f)
+        os.replace(temp_path, _TABLE_CACHE)
+    except OSError:
+        pass  # Read-only install: just rebuild on every import
+    return tables
+
+
+ROOK_MASKS, ROOK_ATTACKS, BISHOP_MASKS, BISHOP_ATTACKS = _load_slider_tables()
+# Empty-board slider reach, for cheap "can this slider possibly hit sq" tests
+ROOK_RAYS = tuple(ROOK_ATTACKS[sq][0] for sq in range(64))
+BISHOP_RAYS = tuple(BISHOP_ATTACKS[sq][0] for sq in range(64))
+# DIRECTION_RAYS[(dr, dc)][sq]: empty-board ray from sq in one direction, for
+# splitting a slider's attack set back into its individual rays
+DIRECTION_RAYS = {
+    direction: tuple(sliding_attacks(sq, 0, (direction,)) for sq in range(64))
+    for direction in ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+}
+
+
+def rook_attacks(sq: int, occupied: int) -> int:
+    return ROOK_ATTACKS[sq][occupied & ROOK_MASKS[sq]]
+
+
+def bishop_attacks(sq: int, occupied: int) -> int:
+    return BISHOP_ATTACKS[sq][occupied & BISHOP_MASKS[sq]]
+
+
+def queen_attacks(sq: int, occupied: int) -> int:
+    return (ROOK_ATTACKS[sq][occupied & ROOK_MASKS[sq]] |
+            BISHOP_ATTACKS[sq][occupied & BISHOP_MASKS[sq]])
+
+
+def square_attacked(bb: Bitboard, sq: int, by_white: bool) -> bool:
+    """True if any piece of the given color attacks sq
+
+    Leapers are tested first with single table ANDs; the occupancy is only
+    built when a slider of that color could still reach sq.
+    """
+    pieces = bb.pieces
+    if by_white:
+        # A white pawn attacks sq from the squares a black pawn on sq would attack
+        if PAWN_ATTACKS[BLACK][sq] & pieces[WP] or KNIGHT_ATTACKS[sq] & pieces[WN]:
+            return True
+        if KING_ATTACKS[sq] & pieces[WK]:
+            return True
+        diagonal, straight = pieces[WB] | pieces[WQ], pieces[WR] | pieces[WQ]
+    else:
+        if PAWN_ATTACKS[WHITE][sq] & pieces[BP] or KNIGHT_ATTACKS[sq] & pieces[BN]:
+            return True
+        if KING_ATTACKS[sq] & pieces[BK]:
+            return True
+        diagonal, straight = pieces[BB] | pieces[BQ], pieces[BR] | pieces[BQ]
+    
+    if diagonal & BISHOP_RAYS[sq]:
+        if BISHOP_ATTACKS[sq][(bb.white | bb.black) & BISHOP_MASKS[sq]] & diagonal:
+            return True
+    if straight & ROOK_RAYS[sq]:
+        return bool(ROOK_ATTACKS[sq][(bb.white | bb.black) & ROOK_MASKS[sq]] & straight)
+    return False
+
+
+# Zobrist keys: ZOBRIST[piece][sq], row 0 (empty) stays zero so captures of EMPTY are no-ops
+_zobrist_rng = random.Random(0x1234)
+ZOBRIST = tuple(
+    tuple(0 for _ in range(64)) if code == EMPTY else
+    tuple(_zobrist_rng.getrandbits(64) for _ in range(64))
+    for code in range(13)
+)
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)  # XORed in when white is to move
+# Game-level keys (GameState, opening book) also fold in castling rights and the
+# en passant file; the search key does not track either
+ZOBRIST_CASTLE = tuple(_zobrist_rng.getrandbits(64) for _ in range(16))  # by CastleRights.to_mask()
+ZOBRIST_EP = tuple(_zobrist_rng.getrandbits(64) for _ in range(8))  # by en passant file
+
+
+def zobrist_key(bb: Bitboard, is_white_turn: bool) -> int:
+    """Full Zobrist key; the search updates it incrementally after this"""
+    key = ZOBRIST_SIDE if is_white_turn else 0
+    pieces = bb.pieces
+    for code in range(WP, BK + 1):
+        piece_bb = pieces[code]
+        keys = ZOBRIST[code]
+        while piece_bb:
+            sq = (piece_bb & -piece_bb).bit_length() - 1
+            piece_bb &= piece_bb - 1
+            key ^= keys[sq]
+    return key
+
+
+def board_key(board: List[List[str]], is_white_turn: bool, castling: int = 0, ep_col: int = -1) -> int:
+    """Full game-level Zobrist key of a GUI board (ep_col is -1 when there is no en passant square)"""
+    key = ZOBRIST_SIDE if is_white_turn else 0
+    for row in range(8):
+        board_row = board[row]
+        for col in range(8):
+            piece = board_row[col]
+            if piece != "--":
+                key ^= ZOBRIST[PIECE_CODES[piece]][row * 8 + col]
+    key ^= ZOBRIST_CASTLE[castling]
+    if ep_col >= 0:
+        key ^= ZOBRIST_EP[ep_col]
+    return key
+
+
+@dataclass
+class Bitboard:
+    """Twelve piece bitboards plus per-color occupancy
+
+    ``pieces`` is indexed by piece code so ``pieces[WN]`` holds every white
+    knight; slot 0 is unused and always zero. ``mailbox`` mirrors them as one
+    byte-sized piece code per square, so "what is on sq" is a single index.
+    """
+    pieces: List[int] = field(default_factory=lambda: [0] * 13)
+    white: int = 0
+    black: int = 0
+    mailbox: bytearray = None
+
+    def __post_init__(self):
+        if self.mailbox is None:
+            self.mailbox = bytearray(64)
+            for code in range(WP, BK + 1):
+                piece_bb = self.pieces[code]
+                while piece_bb:
+                    sq = (piece_bb & -piece_bb).bit_length() - 1
+                    piece_bb &= piece_bb - 1
+                    self.mailbox[sq] = code
+
+    @classmethod
+    def from_board(cls, board: List[List[str]]) -> Bitboard:
+        """Build bitboards from the GUI's 8x8 list-of-strings board"""
+        pieces = [0] * 13
+        mailbox = bytearray(64)
+        for row in range(8):
+            board_row = board[row]
+            for col in range(8):
+                piece = board_row[col]
+                if piece != "--":
+                    code = PIECE_CODES[piece]
+                    pieces[code] |= 1 << (row * 8 + col)
+                    mailbox[row * 8 + col] = code
+        white = pieces[WP] | pieces[WN] | pieces[WB] | pieces[WR] | pieces[WQ] | pieces[WK]
+        black = pieces[BP] | pieces[BN] | pieces[BB] | pieces[BR] | pieces[BQ] | pieces[BK]
+        return cls(pieces, white, black, mailbox)
+
+    @property
+    def occupied(self) -> int:
+        return self.white | self.black
+
+    def copy(self) -> Bitboard:
+        return Bitboard(self.pieces[:], self.white, self.black, self.mailbox[:])
+
+    def piece_at(self, sq: int) -> int:
+        """Piece code on sq, or EMPTY"""
+        return self.mailbox[sq]
@@ -1,29 +1,33 @@
 """Game constants and configuration values"""
 
 class ConstantValues:
-    def __init__(self):
-        """Constants for the chess game"""
-        
-        # Screen settings
-        self.WIDTH: int = 512
-        self.HEIGHT: int = self.WIDTH 
-        self.SIDE_SCREEN = 200
-        self.MENU_OFFSET = self.SIDE_SCREEN / 2
-        self.DIMENSION: int = 8
-        self.SQ_SIZE: int = self.HEIGHT // self.DIMENSION
-        self.MAX_FPS: int = 15
-        self.IMAGE: dict = {}
-        
-        # Board representation
-        self.EMPTY_POSITION = "--"
-        self.WHITE_PLAYER = 'w'
-        self.BLACK_PLAYER = 'b'
-        
-        # Colors
-        self.LIGHT_GRAY = (126, 135, 152)
-        self.DARK_BLUE = (43, 50, 64)
-        self.DIM_BLUE = (21, 28, 41)
-        self.WHITE = (255, 255, 255)
-        self.BLACK = (0, 0, 0)
-        self.DARK_GRAY = (36, 36, 36)
+    """Constants for the chess game
 
+    Everything is a class attribute, resolved once at import; instances
+    carry no state (``__slots__ = ()``) and only exist for code that
+    holds a ``constants`` object.
+    """
+    __slots__ = ()
+
+    # Screen settings
+    WIDTH: int = 512
+    HEIGHT: int = WIDTH
+    SIDE_SCREEN = 200
+    MENU_OFFSET = SIDE_SCREEN / 2
+    DIMENSION: int = 8
+    SQ_SIZE: int = HEIGHT // DIMENSION
+    MAX_FPS: int = 15
+    IMAGE: dict = {}  # Shared piece image cache, filled by the view
+
+    # Board representation
+    EMPTY_POSITION = "--"
+    WHITE_PLAYER = 'w'
+    BLACK_PLAYER = 'b'
+
+    # Colors
+    LIGHT_GRAY = (126, 135, 152)
+    DARK_BLUE = (43, 50, 64)
+    DIM_BLUE = (21, 28, 41)
+    WHITE = (255, 255, 255)
+    BLACK = (0, 0, 0)
+    DARK_GRAY = (36, 36, 36)
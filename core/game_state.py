@@ -1,32 +1,44 @@
 """Core chess game state management"""
 
 from __future__ import annotations
-from typing import Callable, List, Tuple
+from typing import Callable, List, Optional, Tuple
 from .constants import ConstantValues
 from .move import Move, CastleRights
+from .bitboard import (EMPTY, PIECE_CODES, WHITE, BLACK, WP, WN, WB, WR, WQ, WK, BP, BN, BB, BR, BQ, BK,
+                       CASTLE_MASK, DIRECTION_RAYS, FULL_BOARD, KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, ZOBRIST,
+                       ZOBRIST_CASTLE, ZOBRIST_EP, ZOBRIST_SIDE, Bitboard, board_key,
+                       bishop_attacks, popcount, queen_attacks, rook_attacks, square_attacked)
 
 class GameState:
+    # Fixed attribute layout: move generation reads these constantly
+    __slots__ = ('const', 'board', 'bitboard', 'white_to_move', 'move_log',
+                 'white_king_location', 'black_king_location', 'enPassant_possible',
+                 'current_castling_rights', 'pins', 'pin_directions', 'checks', 'sq_selected', 'player_clicks', 'promotion_piece',
+                 'ai_promotion_piece', 'player_promote', 'move_made', 'animate_move', 'game_over',
+                 'in_check', 'checkmate', 'stalemate', 'turn_num', 'piece_count',
+                 'zobrist_key', 'zobrist_log')
+
+    ROOK_DIRECTIONS = ((-1, 0), (0, -1), (1, 0), (0, 1))
+    BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+    START_BOARD = (
+        ("bR","bN","bB","bQ","bK","bB","bN","bR"),
+        ("bp","bp","bp","bp","bp","bp","bp","bp"),
+        ("--","--","--","--","--","--","--","--"),
+        ("--","--","--","--","--","--","--","--"),
+        ("--","--","--","--","--","--","--","--"),
+        ("--","--","--","--","--","--","--","--"),
+        ("wp","wp","wp","wp","wp","wp","wp","wp"),
+        ("wR","wN","wB","wQ","wK","wB","wN","wR")
+    )
+
     def __init__(self):
         """Initialize chess game state with proper move/undo handling"""
         self.const = ConstantValues()
         
-        # Initial chess board setup
-        self.board: List[List[str]] = [
-            ["bR","bN","bB","bQ","bK","bB","bN","bR"],
-            ["bp","bp","bp","bp","bp","bp","bp","bp"],
-            ["--","--","--","--","--","--","--","--"],
-            ["--","--","--","--","--","--","--","--"],
-            ["--","--","--","--","--","--","--","--"],
-            ["--","--","--","--","--","--","--","--"],
-            ["wp","wp","wp","wp","wp","wp","wp","wp"],
-            ["wR","wN","wB","wQ","wK","wB","wN","wR"]
-        ]
-        
-        # Move generation functions
-        self.move_functions: dict[str, Callable] = {
-            'p': self.get_pawn_move, 'R': self.get_rook_move, 'N': self.get_knight_move,
-            'B': self.get_bishop_move, 'Q': self.get_queen_move, 'K': self.get_king_move
-        }
+        # Initial chess board setup; the list board is what the GUI draws, the
+        # bitboards (kept in step by make_move/undo_move) drive piece iteration
+        self.board: List[List[str]] = [list(row) for row in self.START_BOARD]
+        self.bitboard = Bitboard.from_board(self.board)
         
         # Game state variables
         self.white_to_move: bool = True
@@ -34,12 +46,13 @@ class GameState:
         self.white_king_location = (7, 4)
         self.black_king_location = (0, 4)
         self.enPassant_possible: Tuple[int, int] = ()
-        self.enPassant_possible_log: List[Tuple[int, int]] = [self.enPassant_possible]
+        # Replaced, never edited in place (see update_castle_rights); each Move keeps
+        # the rights and en passant square from before it for undo_move
         self.current_castling_rights: CastleRights = CastleRights(True, True, True, True)
-        self.castle_rights_log: List[CastleRights] = [self.current_castling_rights.copy()]
         
         # Search state for move generation
         self.pins: List[Tuple[int, int]] = []
+        self.pin_directions: dict[int, Tuple[int, int]] = {}  # Pinned square -> pin direction
         self.checks: List[Tuple[int, int]] = []
         self.sq_selected: Tuple[int, int] = ()
         self.player_clicks: List[Tuple[int, int]] = []
@@ -57,15 +70,89 @@ class GameState:
         self.checkmate: bool = False
         self.stalemate: bool = False
         self.turn_num = 0
-        
-        # Performance optimization
-        self.hash_board = tuple(tuple(row) for row in self.board)
+        self.piece_count = 32  # Pieces on the board, kept current by make_move/undo_move
+        
+        # Position key, updated incrementally by make_move (see update_zobrist_key)
+        self.zobrist_key = self.compute_zobrist_key()
+        self.zobrist_log: List[int] = [self.zobrist_key]
+
+    def reset_in_place(self):
+        """Return to the starting position, reusing this object's board and logs
+        
+        For a new game without building another GameState; anything holding
+        this instance (the AI, the controller) stays valid.
+        """
+        for row, start_row in zip(self.board, self.START_BOARD):
+            row[:] = start_row
+        self.bitboard = Bitboard.from_board(self.board)
+        self.white_to_move = True
+        self.move_log.clear()
+        self.white_king_location = (7, 4)
+        self.black_king_location = (0, 4)
+        self.enPassant_possible = ()
+        self.current_castling_rights = CastleRights(True, True, True, True)
+        self.pins = []
+        self.pin_directions = {}
+        self.checks = []
+        self.sq_selected = ()
+        self.player_clicks.clear()
+        self.promotion_piece = "Q"
+        self.ai_promotion_piece = "Q"
+        self.player_promote = False
+        self.move_made = False
+        self.animate_move = False
+        self.game_over = False
+        self.in_check = False
+        self.checkmate = False
+        self.stalemate = False
+        self.turn_num = 0
+        self.piece_count = 32
+        self.zobrist_key = self.compute_zobrist_key()
+        self.zobrist_log[:] = [self.zobrist_key]
+
+    def __setstate__(self, state):
+        """Restore pickled games: slot state, or the __dict__ state of saves made
+        before __slots__ (and before Zobrist keys or bitboards existed)"""
+        if isinstance(state, tuple):
+            dict_state, slot_state = state
+            state = {**(dict_state or {}), **(slot_state or {})}
+        for name, value in state.items():
+            if name in GameState.__slots__:  # Skips e.g. the hash_board and move_functions older versions stored
+                setattr(self, name, value)
+        if 'zobrist_key' not in state:
+            self.zobrist_key = self.compute_zobrist_key()
+            self.zobrist_log = [self.zobrist_key]
+        if 'bitboard' not in state:
+            self.bitboard = Bitboard.from_board(self.board)
+        if 'piece_count' not in state:
+            self.piece_count = self.count_pieces()
+        if 'pin_directions' not in state:
+            self.pin_directions = {}
+
+    @property
+    def hash_board(self) -> Tuple[Tuple[str, ...], ...]:
+        """Hashable snapshot of the board, built only on request (zobrist_key is the
+        incrementally maintained position key)"""
+        return tuple(map(tuple, self.board))
+
+    def count_pieces(self) -> int:
+        """Pieces on the board, counted from the occupancy bitboards (piece_count is
+        the incremental version)"""
+        bb = self.bitboard
+        return popcount(bb.white | bb.black)
+
+    def compute_zobrist_key(self) -> int:
+        """Zobrist key of the position from scratch (pieces, side, castling, en passant)"""
+        ep_col = self.enPassant_possible[1] if self.enPassant_possible else -1
+        return board_key(self.board, self.white_to_move,
+                         self.current_castling_rights.to_mask(), ep_col)
 
     def make_move(self, move: Move):
         """Complete move handling with proper undo information"""
-        # Store state for undo BEFORE making changes
-        move.set_castle_rights_before(self.current_castling_rights)
-        move.set_en_passant_before(self.enPassant_possible)
+        # Store state for undo BEFORE making changes (the rights object is never
+        # mutated, so the move can hold it without a copy)
+        move.castle_rights_before = self.current_castling_rights
+        move.en_passant_before = self.enPassant_possible
         
         # Make the basic move
         self.board[move.end_row][move.end_col] = move.piece_moved
@@ -74,6 +161,8 @@ class GameState:
         # Add to move log
         self.move_log.append(move)
         self.white_to_move = not self.white_to_move
+        if move.piece_captured != self.const.EMPTY_POSITION:  # Includes en passant
+            self.piece_count -= 1
         
         # Handle special moves
         self.handle_king_move(move)
@@ -83,11 +172,91 @@ class GameState:
         
         # Update game state
         self.update_castle_rights(move)
-        self.castle_rights_log.append(self.current_castling_rights.copy())
-        self.enPassant_possible_log.append(self.enPassant_possible)
         
-        # Update hash for performance
-        self.hash_board = tuple(tuple(row) for row in self.board)
+        # Update the position key and bitboards incrementally
+        self.update_zobrist_key(move)
+        self.update_bitboard(move)
+
+    def update_bitboard(self, move: Move, undo: bool = False):
+        """XOR move into the bitboards after make_move, or back out of them after
+        undo_move (the XORs are their own inverse; the mailbox is set explicitly)"""
+        bb = self.bitboard
+        pieces = bb.pieces
+        mailbox = bb.mailbox
+        start = move.start_row * 8 + move.start_col
+        end = move.end_row * 8 + move.end_col
+        moved = PIECE_CODES[move.piece_moved]
+        # Piece that stands on the end square after the move (differs on promotion)
+        placed = mailbox[end] if undo else PIECE_CODES[self.board[move.end_row][move.end_col]]
+        captured = PIECE_CODES[move.piece_captured]
+        
+        own = (1 << start) | (1 << end)
+        pieces[moved] ^= 1 << start
+        pieces[placed] ^= 1 << end
+        mailbox[start] = moved if undo else EMPTY
+        mailbox[end] = EMPTY if undo else placed
+        
+        other = 0
+        if captured:
+            captured_sq = move.start_row * 8 + move.end_col if move.enPassant else end
+            other = 1 << captured_sq
+            pieces[captured] ^= other
+            if undo:
+                mailbox[captured_sq] = captured
+            elif move.enPassant:
+                mailbox[captured_sq] = EMPTY
+        
+        if move.is_castle_move:
+            if move.end_col - move.start_col == 2:  # Kingside
+                rook_from, rook_to = end + 1, end - 1
+            else:  # Queenside
+                rook_from, rook_to = end - 2, end + 1
+            rook = WR if moved == WK else BR
+            rook_bits = (1 << rook_from) | (1 << rook_to)
+            pieces[rook] ^= rook_bits
+            own ^= rook_bits
+            mailbox[rook_from] = rook if undo else EMPTY
+            mailbox[rook_to] = EMPTY if undo else rook
+        
+        if moved <= WK:
+            bb.white ^= own
+            bb.black ^= other
+        else:
+            bb.black ^= own
+            bb.white ^= other
+
+    def update_zobrist_key(self, move: Move):
+        """XOR the move just played into the Zobrist key instead of rehashing the board"""
+        board = self.board
+        start = move.start_row * 8 + move.start_col
+        end = move.end_row * 8 + move.end_col
+        
+        # The end square now holds the moved (or promoted) piece
+        key = self.zobrist_key ^ ZOBRIST_SIDE
+        key ^= ZOBRIST[PIECE_CODES[move.piece_moved]][start]
+        key ^= ZOBRIST[PIECE_CODES[board[move.end_row][move.end_col]]][end]
+        if move.enPassant:
+            key ^= ZOBRIST[PIECE_CODES[move.piece_captured]][move.start_row * 8 + move.end_col]
+        else:
+            key ^= ZOBRIST[PIECE_CODES[move.piece_captured]][end]
+        
+        if move.is_castle_move:
+            if move.end_col - move.start_col == 2:  # Kingside
+                rook_from, rook_to = end + 1, end - 1
+            else:  # Queenside
+                rook_from, rook_to = end - 2, end + 1
+            rook_keys = ZOBRIST[PIECE_CODES[board[move.end_row][rook_to - move.end_row * 8]]]
+            key ^= rook_keys[rook_from] ^ rook_keys[rook_to]
+        
+        key ^= (ZOBRIST_CASTLE[move.castle_rights_before.to_mask()] ^
+                ZOBRIST_CASTLE[self.current_castling_rights.to_mask()])
+        if move.en_passant_before:
+            key ^= ZOBRIST_EP[move.en_passant_before[1]]
+        if self.enPassant_possible:
+            key ^= ZOBRIST_EP[self.enPassant_possible[1]]
+        
+        self.zobrist_key = key
+        self.zobrist_log.append(key)
 
     def handle_king_move(self, move: Move):
         """Update king positions"""
@@ -157,42 +326,40 @@ class GameState:
         if move.pawn_promotion:
             # The end square gets whatever was captured (or empty)
             self.board[move.end_row][move.end_col] = move.piece_captured
+        elif move.enPassant:
+            # The captured pawn was beside the end square; undo_en_passant restores it
+            self.board[move.end_row][move.end_col] = self.const.EMPTY_POSITION
         else:
             # Normal move: restore captured piece
             self.board[move.end_row][move.end_col] = move.piece_captured
         
         # Restore game state
         self.white_to_move = not self.white_to_move
+        if move.piece_captured != self.const.EMPTY_POSITION:
+            self.piece_count += 1
         
         # Undo special moves
         self.undo_king_move(move)
         self.undo_en_passant(move)
         self.undo_castling(move)
         
-        # Restore state from stored information
-        if move.castle_rights_before:
-            self.current_castling_rights = move.castle_rights_before
-        else:
-            # Fallback: pop from log
-            if len(self.castle_rights_log) > 1:
-                self.castle_rights_log.pop()
-                self.current_castling_rights = self.castle_rights_log[-1]
-        
-        # Restore en passant
-        if hasattr(move, 'en_passant_before'):
-            self.enPassant_possible = move.en_passant_before
-        else:
-            # Fallback: pop from log
-            if len(self.enPassant_possible_log) > 1:
-                self.enPassant_possible_log.pop()
-                self.enPassant_possible = self.enPassant_possible_log[-1]
+        # Restore castling rights and en passant from the move
+        self.current_castling_rights = move.castle_rights_before
+        self.enPassant_possible = move.en_passant_before
+        
+        self.update_bitboard(move, undo=True)
         
         # Clear endgame flags
         self.checkmate = False
         self.stalemate = False
         
-        # Update hash
-        self.hash_board = tuple(tuple(row) for row in self.board)
+        # Restore the position key recorded before the move
+        if len(self.zobrist_log) > 1:
+            self.zobrist_log.pop()
+            self.zobrist_key = self.zobrist_log[-1]
+        else:  # Loaded game whose earlier keys were never recorded
+            self.zobrist_key = self.compute_zobrist_key()
+            self.zobrist_log = [self.zobrist_key]
         
         return True
 
@@ -232,45 +399,26 @@ class GameState:
                 self.board[move.end_row][move.end_col + 1] = self.const.EMPTY_POSITION
 
     def update_castle_rights(self, move: Move):
-        """Update castling rights based on move"""
-        # King moves
-        if move.piece_moved == 'wK':
-            self.current_castling_rights.wqs = False
-            self.current_castling_rights.wks = False
-        elif move.piece_moved == 'bK':
-            self.current_castling_rights.bqs = False
-            self.current_castling_rights.bks = False
-        
-        # Rook moves
-        elif move.piece_moved == 'wR':
-            if move.start_row == 7:
-                if move.start_col == 0:  # Queenside rook
-                    self.current_castling_rights.wqs = False
-                elif move.start_col == 7:  # Kingside rook
-                    self.current_castling_rights.wks = False
-        elif move.piece_moved == 'bR':
-            if move.start_row == 0:
-                if move.start_col == 0:  # Queenside rook
-                    self.current_castling_rights.bqs = False
-                elif move.start_col == 7:  # Kingside rook
-                    self.current_castling_rights.bks = False
-        
-        # Rook captures
-        if move.piece_captured == "wR":
-            if move.end_col == 0 and move.end_row == 7:
-                self.current_castling_rights.wqs = False
-            elif move.end_col == 7 and move.end_row == 7:
-                self.current_castling_rights.wks = False
-        elif move.piece_captured == "bR":
-            if move.end_col == 0 and move.end_row == 0:
-                self.current_castling_rights.bqs = False
-            elif move.end_col == 7 and move.end_row == 0:
-                self.current_castling_rights.bks = False
+        """Update castling rights based on move
+        
+        CASTLE_MASK clears the rights tied to the start and end squares, which
+        covers king moves, rook moves and rook captures. A change installs a
+        new CastleRights rather than editing the current one, which earlier
+        moves may still hold as their castle_rights_before.
+        """
+        mask = self.current_castling_rights.to_mask()
+        if mask:
+            new_mask = (mask & CASTLE_MASK[move.start_row * 8 + move.start_col]
+                        & CASTLE_MASK[move.end_row * 8 + move.end_col])
+            if new_mask != mask:
+                self.current_castling_rights = CastleRights.from_mask(new_mask)
 
     def get_valid_moves(self) -> List[Move]:
         """Get all legal moves for current position"""
         moves: List[Move] = []
         self.in_check, self.pins, self.checks = self.check_for_pins_and_checks()
+        # One lookup per piece in the generators instead of scanning the pin list
+        self.pin_directions = {row * 8 + col: (d_row, d_col) for row, col, d_row, d_col in self.pins}
 
         if self.white_to_move:
             king_row, king_col = self.white_king_location
@@ -279,27 +427,18 @@ class GameState:
 
         if self.in_check:
             if len(self.checks) == 1:  # Only one check - can block or capture
-                moves = self.get_all_possible_moves()
-                check = self.checks[0]
-                check_row, check_col = check[0], check[1]
-                piece_checking = self.board[check_row][check_col]
-                valid_squares = []
+                check_row, check_col, d_row, d_col = self.checks[0]
+                check_sq = check_row * 8 + check_col
                 
-                if piece_checking[1] == 'N':  # Knight check - must capture knight
-                    valid_squares = [(check_row, check_col)]
+                if self.board[check_row][check_col][1] == 'N':  # Knight check - must capture knight
+                    target_mask = 1 << check_sq
                 else:
-                    # Can block between king and checking piece
-                    for i in range(1, 8):
-                        valid_square = (king_row + check[2] * i, king_col + check[3] * i)
-                        valid_squares.append(valid_square)
-                        if valid_square[0] == check_row and valid_square[1] == check_col:
-                            break
+                    # Can block between king and checking piece, or capture it
+                    ray = DIRECTION_RAYS[(d_row, d_col)]
+                    target_mask = ray[king_row * 8 + king_col] & ~ray[check_sq]
                 
-                # Remove moves that don't address the check
-                for i in range(len(moves) - 1, -1, -1):
-                    if moves[i].piece_moved[1] != 'K':
-                        if not (moves[i].end_row, moves[i].end_col) in valid_squares:
-                            moves.remove(moves[i])
+                # Other pieces only generate moves that address the check
+                moves = self.get_all_possible_moves(target_mask)
             else:  # Double check - only king moves
                 self.get_king_move(king_row, king_col, moves)
         else:
@@ -321,230 +460,258 @@ class GameState:
 
         return moves
 
-    def get_all_possible_moves(self) -> List[Move]:
-        """Generate all possible moves for current player"""
+    def get_all_possible_moves(self, target_mask: int = FULL_BOARD) -> List[Move]:
+        """Generate all possible moves for current player
+        
+        Moves of pieces other than the king are limited to end squares in
+        target_mask (the block-or-capture squares when in single check).
+        """
         moves = []
-        for row in range(8):
-            for col in range(8):
-                turn = self.board[row][col][0]
-                if ((turn == self.const.WHITE_PLAYER and self.white_to_move) or 
-                    (turn == self.const.BLACK_PLAYER and not self.white_to_move)):
-                    piece = self.board[row][col][1]
-                    if piece in self.move_functions:
-                        self.move_functions[piece](row, col, moves)
+        bb = self.bitboard
+        mailbox = bb.mailbox
+        move_functions = self.MOVE_FUNCTIONS
+        # Visit the side's pieces lowest square first, the order a row-by-row scan
+        # gives (a pass per piece type would reorder the move list)
+        own = bb.white if self.white_to_move else bb.black
+        while own:
+            sq = (own & -own).bit_length() - 1
+            own &= own - 1
+            move_functions[mailbox[sq]](self, sq >> 3, sq & 7, moves, target_mask)
         return moves
 
     # Move generation methods (keeping your original implementations)
-    def get_pawn_move(self, r: int, c: int, moves: List[Move]):
-        """Generate pawn moves"""
-        piece_pinned = False
-        pin_direction = ()
-        
-        # Check for pins
-        for i in range(len(self.pins) - 1, -1, -1):
-            if self.pins[i][0] == r and self.pins[i][1] == c:
-                piece_pinned = True
-                pin_direction = (self.pins[i][2], self.pins[i][3])
-                self.pins.remove(self.pins[i])
-                break
+    def get_pawn_move(self, r: int, c: int, moves: List[Move], target_mask: int = FULL_BOARD):
+        """Generate pawn moves
+        
+        Pushes are bit tests against the occupancy; capture targets are the
+        PAWN_ATTACKS entry masked by the enemy pieces and the en passant square
+        (and by the pin ray when the pawn is pinned).
+        """
+        sq = r * 8 + c
+        pin_direction = self.pin_directions.get(sq)
+        board = self.board
+        bb = self.bitboard
+        occupied = bb.white | bb.black
         
         if self.white_to_move:
             move_amount = -1
             start_row = 6
             back_row = 0
-            enemy_color = self.const.BLACK_PLAYER
+            enemy = bb.black
+            attacks = PAWN_ATTACKS[WHITE][sq]
         else:
             move_amount = 1
             start_row = 1
             back_row = 7
-            enemy_color = self.const.WHITE_PLAYER
+            enemy = bb.white
+            attacks = PAWN_ATTACKS[BLACK][sq]
         
-        pawn_promotion = False
+        start = (r, c)
+        end_row = r + move_amount
+        pawn_promotion = end_row == back_row
         
         # Forward moves
-        if self.board[r + move_amount][c] == self.const.EMPTY_POSITION:
-            if not piece_pinned or pin_direction == (move_amount, 0):
-                if r + move_amount == back_row:
-                    pawn_promotion = True
-                moves.append(Move((r, c), (r + move_amount, c), self.board, pawn_promotion=pawn_promotion))
-                if r == start_row and self.board[r + 2 * move_amount][c] == self.const.EMPTY_POSITION:
-                    moves.append(Move((r, c), (r + 2 * move_amount, c), self.board))
-        
-        # Captures
-        if c - 1 >= 0:
-            if not piece_pinned or pin_direction == (move_amount, -1):
-                if self.board[r + move_amount][c - 1][0] == enemy_color:
-                    if r + move_amount == back_row:
-                        pawn_promotion = True
-                    moves.append(Move((r, c), (r + move_amount, c - 1), self.board, pawn_promotion=pawn_promotion))
-                if (r + move_amount, c - 1) == self.enPassant_possible:
-                    moves.append(Move((r, c), (r + move_amount, c - 1), self.board, enPassant=True))
-        
-        if c + 1 <= 7:
-            if not piece_pinned or pin_direction == (move_amount, 1):
-                if self.board[r + move_amount][c + 1][0] == enemy_color:
-                    if r + move_amount == back_row:
-                        pawn_promotion = True
-                    moves.append(Move((r, c), (r + move_amount, c + 1), self.board, pawn_promotion=pawn_promotion))
-                if (r + move_amount, c + 1) == self.enPassant_possible:
-                    moves.append(Move((r, c), (r + move_amount, c + 1), self.board, enPassant=True))
-
-    def get_rook_move(self, r: int, c: int, moves: List[Move]):
+        push = sq + 8 * move_amount
+        if not occupied >> push & 1:
+            if pin_direction is None or pin_direction == (move_amount, 0):
+                if target_mask >> push & 1:
+                    moves.append(Move(start, (end_row, c), board, pawn_promotion=pawn_promotion))
+                double_push = push + 8 * move_amount
+                if r == start_row and not occupied >> double_push & 1 and target_mask >> double_push & 1:
+                    moves.append(Move(start, (r + 2 * move_amount, c), board))
+        
+        # Captures, left file first
+        targets = attacks & enemy & target_mask
+        en_passant = self.enPassant_possible
+        ep_bit = 0
+        if en_passant:
+            ep_sq = en_passant[0] * 8 + en_passant[1]
+            captured_sq = r * 8 + en_passant[1]
+            # Allowed when it blocks a check or removes the checking pawn, and when
+            # taking both pawns off the rank doesn't open a line to the king
+            if (attacks >> ep_sq & 1 and (target_mask >> ep_sq & 1 or target_mask >> captured_sq & 1)
+                    and not self.en_passant_exposes_king(sq, ep_sq, captured_sq)):
+                ep_bit = 1 << ep_sq
+                targets |= ep_bit
+        if pin_direction is not None:
+            targets &= DIRECTION_RAYS[pin_direction][sq]
+        while targets:
+            target = targets & -targets
+            targets ^= target
+            end = (end_row, (target.bit_length() - 1) & 7)
+            if target == ep_bit:
+                moves.append(Move(start, end, board, enPassant=True))
+            else:
+                moves.append(Move(start, end, board, pawn_promotion=pawn_promotion))
+
+    def en_passant_exposes_king(self, from_sq: int, to_sq: int, captured_sq: int) -> bool:
+        """True if the en passant capture would leave the mover's king attacked by a slider
+
+        The capture empties two squares of one rank at once, which the pin scan
+        in check_for_pins_and_checks cannot see.
+        """
+        bb = self.bitboard
+        pieces = bb.pieces
+        if self.white_to_move:
+            king_row, king_col = self.white_king_location
+            straight, diagonal = pieces[BR] | pieces[BQ], pieces[BB] | pieces[BQ]
+        else:
+            king_row, king_col = self.black_king_location
+            straight, diagonal = pieces[WR] | pieces[WQ], pieces[WB] | pieces[WQ]
+        king_sq = king_row * 8 + king_col
+        occupied = ((bb.white | bb.black) & ~(1 << from_sq) & ~(1 << captured_sq)) | 1 << to_sq
+        return bool(rook_attacks(king_sq, occupied) & straight or bishop_attacks(king_sq, occupied) & diagonal)
+
+    def get_rook_move(self, r: int, c: int, moves: List[Move], target_mask: int = FULL_BOARD):
         """Generate rook moves"""
-        self.get_sliding_moves(r, c, moves, [(-1, 0), (0, -1), (1, 0), (0, 1)])
+        bb = self.bitboard
+        attacks = rook_attacks(r * 8 + c, bb.white | bb.black)
+        self.get_sliding_moves(r, c, moves, self.ROOK_DIRECTIONS, attacks & target_mask)
 
-    def get_bishop_move(self, r: int, c: int, moves: List[Move]):
+    def get_bishop_move(self, r: int, c: int, moves: List[Move], target_mask: int = FULL_BOARD):
         """Generate bishop moves"""
-        self.get_sliding_moves(r, c, moves, [(-1, -1), (-1, 1), (1, -1), (1, 1)])
+        bb = self.bitboard
+        attacks = bishop_attacks(r * 8 + c, bb.white | bb.black)
+        self.get_sliding_moves(r, c, moves, self.BISHOP_DIRECTIONS, attacks & target_mask)
 
-    def get_queen_move(self, r: int, c: int, moves: List[Move]):
+    def get_queen_move(self, r: int, c: int, moves: List[Move], target_mask: int = FULL_BOARD):
         """Generate queen moves"""
-        directions = [(-1, 0), (0, -1), (1, 0), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-        self.get_sliding_moves(r, c, moves, directions)
+        bb = self.bitboard
+        attacks = queen_attacks(r * 8 + c, bb.white | bb.black)
+        self.get_sliding_moves(r, c, moves, self.ROOK_DIRECTIONS + self.BISHOP_DIRECTIONS, attacks & target_mask)
 
-    def get_sliding_moves(self, r: int, c: int, moves: List[Move], directions):
-        """Generate moves for sliding pieces"""
-        piece_pinned = False
-        pin_direction = ()
+    def get_sliding_moves(self, r: int, c: int, moves: List[Move], directions, attacks: int):
+        """Generate moves for sliding pieces from their table-looked-up attack set
         
-        # Check for pins
-        for i in range(len(self.pins) - 1, -1, -1):
-            if self.pins[i][0] == r and self.pins[i][1] == c:
-                piece_pinned = True
-                pin_direction = (self.pins[i][2], self.pins[i][3])
-                if self.board[r][c][1] != 'Q':
-                    self.pins.remove(self.pins[i])
-                break
+        The attack set is split back into per-direction rays so moves come out
+        direction by direction, nearest square first, as a step-by-step walk gives.
+        """
+        pin_direction = self.pin_directions.get(r * 8 + c)
+        piece_pinned = pin_direction is not None
         
-        enemy_color = self.const.BLACK_PLAYER if self.white_to_move else self.const.WHITE_PLAYER
+        # Empty squares and enemy pieces (the first blocker on each ray)
+        targets = attacks & ~(self.bitboard.white if self.white_to_move else self.bitboard.black)
+        sq = r * 8 + c
+        start = (r, c)
+        board = self.board
         
         for direction in directions:
-            for i in range(1, 8):
-                end_row = r + direction[0] * i
-                end_col = c + direction[1] * i
-                
-                if 0 <= end_row < 8 and 0 <= end_col < 8:
-                    if not piece_pinned or pin_direction == direction or pin_direction == (-direction[0], -direction[1]):
-                        end_piece = self.board[end_row][end_col]
-                        if end_piece == self.const.EMPTY_POSITION:
-                            moves.append(Move((r, c), (end_row, end_col), self.board))
-                        elif end_piece[0] == enemy_color:
-                            moves.append(Move((r, c), (end_row, end_col), self.board))
-                            break
-                        else:
-                            break
-                else:
-                    break
+            if piece_pinned and pin_direction != direction and pin_direction != (-direction[0], -direction[1]):
+                continue
+            ray = targets & DIRECTION_RAYS[direction][sq]
+            if direction[0] * 8 + direction[1] > 0:  # Heading to higher squares: nearest is the lowest bit
+                while ray:
+                    end_sq = (ray & -ray).bit_length() - 1
+                    ray &= ray - 1
+                    moves.append(Move(start, divmod(end_sq, 8), board))
+            else:
+                while ray:
+                    end_sq = ray.bit_length() - 1
+                    ray ^= 1 << end_sq
+                    moves.append(Move(start, divmod(end_sq, 8), board))
 
-    def get_knight_move(self, r: int, c: int, moves: List[Move]):
+    def get_knight_move(self, r: int, c: int, moves: List[Move], target_mask: int = FULL_BOARD):
         """Generate knight moves"""
-        piece_pinned = False
-        for i in range(len(self.pins) - 1, -1, -1):
-            if self.pins[i][0] == r and self.pins[i][1] == c:
-                piece_pinned = True
-                self.pins.remove(self.pins[i])
-                break
-
-        knight_moves = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
-        ally_color = self.const.WHITE_PLAYER if self.white_to_move else self.const.BLACK_PLAYER
-        
-        for move in knight_moves:
-            end_row = r + move[0]
-            end_col = c + move[1]
-            if 0 <= end_row < 8 and 0 <= end_col < 8:
-                if not piece_pinned:
-                    end_piece = self.board[end_row][end_col]
-                    if end_piece[0] != ally_color:
-                        moves.append(Move((r, c), (end_row, end_col), self.board))
-
-    def get_king_move(self, r: int, c: int, moves: List[Move]):
-        """Generate king moves"""
-        row_moves = (-1, -1, -1, 0, 0, 1, 1, 1)
-        col_moves = (-1, 0, 1, -1, 1, -1, 0, 1)
-        ally_color = self.const.WHITE_PLAYER if self.white_to_move else self.const.BLACK_PLAYER
-        
-        for i in range(8):
-            end_row = r + row_moves[i]
-            end_col = c + col_moves[i]
-            if 0 <= end_row < 8 and 0 <= end_col < 8:
-                end_piece = self.board[end_row][end_col]
-                if end_piece[0] != ally_color:
-                    # Check if move puts king in check
-                    if ally_color == self.const.WHITE_PLAYER:
-                        self.white_king_location = (end_row, end_col)
-                    else:
-                        self.black_king_location = (end_row, end_col)
-                    
-                    in_check, pins, checks = self.check_for_pins_and_checks()
-                    if not in_check:
-                        moves.append(Move((r, c), (end_row, end_col), self.board))
-                    
-                    # Restore king position
-                    if ally_color == self.const.WHITE_PLAYER:
-                        self.white_king_location = (r, c)
-                    else:
-                        self.black_king_location = (r, c)
+        if r * 8 + c in self.pin_directions:
+            return  # A pinned knight can never stay on the pin line
+
+        # Attack squares not holding our own pieces; set bits come out in the
+        # order the offset loop used to produce them
+        own = self.bitboard.white if self.white_to_move else self.bitboard.black
+        targets = KNIGHT_ATTACKS[r * 8 + c] & ~own & target_mask
+        board = self.board
+        while targets:
+            sq = (targets & -targets).bit_length() - 1
+            targets &= targets - 1
+            moves.append(Move((r, c), divmod(sq, 8), board))
+
+    def get_king_move(self, r: int, c: int, moves: List[Move], target_mask: int = FULL_BOARD):
+        """Generate king moves (target_mask does not apply: the king steps out of check itself)"""
+        bb = self.bitboard
+        white = self.white_to_move
+        king_bit = 1 << (r * 8 + c)
+        targets = KING_ATTACKS[r * 8 + c] & ~(bb.white if white else bb.black)
+        
+        # Lift the king off the occupancy while testing destinations, so it
+        # cannot shield a square on the ray of the slider checking it
+        if white:
+            bb.white ^= king_bit
+        else:
+            bb.black ^= king_bit
+        board = self.board
+        while targets:
+            sq = (targets & -targets).bit_length() - 1
+            targets &= targets - 1
+            if not square_attacked(bb, sq, not white):
+                moves.append(Move((r, c), divmod(sq, 8), board))
+        if white:
+            bb.white ^= king_bit
+        else:
+            bb.black ^= king_bit
+
+    # Move generators by bitboard piece code: EMPTY, then pawn..king for white and
+    # for black; shared by all instances and called with the GameState explicitly
+    MOVE_FUNCTIONS: Tuple[Optional[Callable], ...] = (
+        (None,) + (get_pawn_move, get_knight_move, get_bishop_move,
+                   get_rook_move, get_queen_move, get_king_move) * 2
+    )
 
     def check_for_pins_and_checks(self) -> Tuple[bool, List[Tuple[int, int]], List[Tuple[int, int]]]:
-        """Check for pins and checks"""
+        """Check for pins and checks
+        
+        Rook and bishop attacks are cast from the king through its own pieces
+        (only enemy pieces block them). An enemy slider reached that way gives
+        check if none of our pieces stands in between, and pins the piece if
+        exactly one does. Entries are (row, col, d_row, d_col), the direction
+        pointing from the king.
+        """
         pins = []
         checks = []
-        in_check = False
+        bb = self.bitboard
+        pieces = bb.pieces
         
         if self.white_to_move:
-            enemy_color = self.const.BLACK_PLAYER
-            ally_color = self.const.WHITE_PLAYER
-            start_row, start_col = self.white_king_location
+            king_row, king_col = self.white_king_location
+            king_sq = king_row * 8 + king_col
+            own, enemy = bb.white, bb.black
+            straight, diagonal = pieces[BR] | pieces[BQ], pieces[BB] | pieces[BQ]
+            # Leapers (and the enemy king) that could only check from next to the king
+            adjacent = (PAWN_ATTACKS[WHITE][king_sq] & pieces[BP]) | (KING_ATTACKS[king_sq] & pieces[BK])
+            knights = KNIGHT_ATTACKS[king_sq] & pieces[BN]
         else:
-            enemy_color = self.const.WHITE_PLAYER
-            ally_color = self.const.BLACK_PLAYER
-            start_row, start_col = self.black_king_location
-        
-        directions = [(-1, 0), (0, -1), (1, 0), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-        
-        for j in range(len(directions)):
-            direction = directions[j]
-            possible_pin = ()
-            for i in range(1, 8):
-                end_row = start_row + direction[0] * i
-                end_col = start_col + direction[1] * i
-                if 0 <= end_row < 8 and 0 <= end_col < 8:
-                    end_piece = self.board[end_row][end_col]
-                    if end_piece[0] == ally_color and end_piece[1] != 'K':
-                        if possible_pin == ():
-                            possible_pin = (end_row, end_col, direction[0], direction[1])
-                        else:
-                            break
-                    elif end_piece[0] == enemy_color:
-                        piece_type = end_piece[1]
-                        # Check if this piece can attack in this direction
-                        if ((0 <= j <= 3 and piece_type == 'R') or 
-                            (4 <= j <= 7 and piece_type == 'B') or 
-                            (i == 1 and piece_type == 'p' and 
-                             ((enemy_color == self.const.WHITE_PLAYER and 6 <= j <= 7) or 
-                              (enemy_color == self.const.BLACK_PLAYER and 4 <= j <= 5))) or 
-                            (piece_type == 'Q') or (i == 1 and piece_type == 'K')):
-                            if possible_pin == ():
-                                in_check = True
-                                checks.append((end_row, end_col, direction[0], direction[1]))
-                            else:
-                                pins.append(possible_pin)
-                        break
-                else:
-                    break
-        
-        # Check for knight checks
-        knight_moves = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
-        for move in knight_moves:
-            end_row = start_row + move[0]
-            end_col = start_col + move[1]
-            if 0 <= end_row < 8 and 0 <= end_col < 8:
-                end_piece = self.board[end_row][end_col]
-                if end_piece[0] == enemy_color and end_piece[1] == 'N':
-                    in_check = True
-                    checks.append((end_row, end_col, move[0], move[1]))
-        
-        return in_check, pins, checks
+            king_row, king_col = self.black_king_location
+            king_sq = king_row * 8 + king_col
+            own, enemy = bb.black, bb.white
+            straight, diagonal = pieces[WR] | pieces[WQ], pieces[WB] | pieces[WQ]
+            adjacent = (PAWN_ATTACKS[BLACK][king_sq] & pieces[WP]) | (KING_ATTACKS[king_sq] & pieces[WK])
+            knights = KNIGHT_ATTACKS[king_sq] & pieces[WN]
+        
+        sliders = (rook_attacks(king_sq, enemy) & straight) | (bishop_attacks(king_sq, enemy) & diagonal)
+        while sliders:
+            sq = (sliders & -sliders).bit_length() - 1
+            sliders &= sliders - 1
+            row, col = divmod(sq, 8)
+            d_row, d_col = (row > king_row) - (row < king_row), (col > king_col) - (col < king_col)
+            blockers = own & DIRECTION_RAYS[(d_row, d_col)][king_sq] & DIRECTION_RAYS[(-d_row, -d_col)][sq]
+            if not blockers:
+                checks.append((row, col, d_row, d_col))
+            elif not blockers & (blockers - 1):  # Exactly one of our pieces in the way
+                pin_row, pin_col = divmod(blockers.bit_length() - 1, 8)
+                pins.append((pin_row, pin_col, d_row, d_col))
+        
+        while adjacent:
+            sq = (adjacent & -adjacent).bit_length() - 1
+            adjacent &= adjacent - 1
+            row, col = divmod(sq, 8)
+            checks.append((row, col, row - king_row, col - king_col))
+        
+        while knights:
+            sq = (knights & -knights).bit_length() - 1
+            knights &= knights - 1
+            row, col = divmod(sq, 8)
+            checks.append((row, col, row - king_row, col - king_col))
+        
+        return bool(checks), pins, checks
 
     def get_castle_moves(self, row: int, col: int, moves: List[Move]):
         """Generate castling moves"""
@@ -577,15 +744,12 @@ class GameState:
                 moves.append(Move((row, col), (row, col - 2), self.board, is_castle_move=True))
 
     def square_under_attack(self, row: int, col: int) -> bool:
-        """Check if square is under attack by opponent"""
-        self.white_to_move = not self.white_to_move
-        opponent_moves = self.get_all_possible_moves()
-        self.white_to_move = not self.white_to_move
+        """Check if square is under attack by opponent
         
-        for move in opponent_moves:
-            if move.end_row == row and move.end_col == col:
-                return True
-        return False
+        Shoots each piece type's attack pattern from the square and tests it
+        against the opponent's bitboards (core.bitboard.square_attacked).
+        """
+        return square_attacked(self.bitboard, row * 8 + col, not self.white_to_move)
 
     def is_valid_move(self, move: Move) -> bool:
         """Check if a move is valid in current position"""
@@ -593,17 +757,38 @@ class GameState:
         return move in valid_moves
 
     def copy(self):
-        """Create a deep copy of the game state"""
-        new_gs = GameState()
+        """Create a deep copy of the game state
+        
+        Built with __new__ rather than GameState(), so no starting board,
+        bitboards or Zobrist key are computed only to be overwritten. The
+        position is copied; selection, promotion and status flags start fresh.
+        """
+        new_gs = GameState.__new__(GameState)
+        new_gs.const = self.const
         new_gs.board = [row[:] for row in self.board]
+        new_gs.bitboard = self.bitboard.copy()
         new_gs.white_to_move = self.white_to_move
         new_gs.move_log = self.move_log[:]
         new_gs.white_king_location = self.white_king_location
         new_gs.black_king_location = self.black_king_location
         new_gs.enPassant_possible = self.enPassant_possible
-        new_gs.current_castling_rights = self.current_castling_rights.copy()
+        new_gs.current_castling_rights = self.current_castling_rights  # Never edited in place
+        new_gs.pins = []
+        new_gs.pin_directions = {}
+        new_gs.checks = []
+        new_gs.sq_selected = ()
+        new_gs.player_clicks = []
+        new_gs.promotion_piece = "Q"
+        new_gs.ai_promotion_piece = "Q"
+        new_gs.player_promote = False
+        new_gs.move_made = False
+        new_gs.animate_move = False
+        new_gs.game_over = False
+        new_gs.in_check = self.in_check
         new_gs.checkmate = self.checkmate
         new_gs.stalemate = self.stalemate
-        new_gs.in_check = self.in_check
         new_gs.turn_num = self.turn_num
-        return new_gs
\ No newline at end of file
+        new_gs.piece_count = self.piece_count
+        new_gs.zobrist_key = self.zobrist_key
+        new_gs.zobrist_log = self.zobrist_log[:]
+        return new_gs
@@ -7,6 +7,8 @@ if TYPE_CHECKING:
     from .constants import CastleRights
 
 class CastleRights:
+    __slots__ = ('wks', 'bks', 'wqs', 'bqs')
+
     def __init__(self, wks: bool, bks: bool, wqs: bool, bqs: bool):
         """Castling rights for both sides"""
         self.wks = wks  # White kingside
@@ -14,6 +16,14 @@ class CastleRights:
         self.wqs = wqs  # White queenside
         self.bqs = bqs  # Black queenside
     
+    def __setstate__(self, state):
+        """Unpickle both slot state and the __dict__ state of saves made before __slots__"""
+        if isinstance(state, tuple):
+            dict_state, slot_state = state
+            state = {**(dict_state or {}), **(slot_state or {})}
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __eq__(self, other):
         """Equality comparison for castle rights"""
         if not isinstance(other, CastleRights):
@@ -24,6 +34,15 @@ class CastleRights:
     def copy(self):
         """Create a copy of castle rights"""
         return CastleRights(self.wks, self.bks, self.wqs, self.bqs)
+    
+    def to_mask(self) -> int:
+        """Rights as a 4-bit mask (wks=1, wqs=2, bks=4, bqs=8), e.g. for Zobrist keys"""
+        return self.wks | self.wqs << 1 | self.bks << 2 | self.bqs << 3
+
+    @classmethod
+    def from_mask(cls, mask: int) -> CastleRights:
+        """Rights from a to_mask() value"""
+        return cls(bool(mask & 1), bool(mask & 4), bool(mask & 2), bool(mask & 8))
 
 
 class Move:
@@ -31,6 +50,13 @@ class Move:
     rows_to_ranks = {v: k for k, v in ranks_to_rows.items()}
     files_to_cols = {"a": 0, "b": 1, "c": 2, "d": 3, "e": 4, "f": 5, "g": 6, "h": 7}
     cols_to_files = {v: k for k, v in files_to_cols.items()}
+    # Indexed by row * 8 + col: "a8", "b8", ..., "h1"
+    SQUARE_NAMES = tuple(file + rank for rank in "87654321" for file in "abcdefgh")
+
+    # Fixed attribute layout: no per-instance __dict__ for the many moves generated per turn
+    __slots__ = ('start_row', 'start_col', 'end_row', 'end_col', 'piece_moved', 'piece_captured',
+                 'enPassant', 'pawn_promotion', 'is_castle_move', 'promoted_to', 'last_moved',
+                 'castle_rights_before', 'en_passant_before', 'fifty_move_counter')
 
     def __init__(self, start_sq: tuple[int, int], end_sq: tuple[int, int], 
                  board: list[list[str]], enPassant: bool = False, 
@@ -58,10 +84,52 @@ class Move:
         self.castle_rights_before = None
         self.en_passant_before = None
         self.fifty_move_counter = 0
-        
-        # Move identification
-        self.move_id = self.start_row * 1000 + self.start_col * 100 + self.end_row * 10 + self.end_col
-        self.special_id = self.get_special_id()
+
+    def __setstate__(self, state):
+        """Unpickle both slot state and the __dict__ state of saves made before __slots__"""
+        if isinstance(state, tuple):
+            dict_state, slot_state = state
+            state = {**(dict_state or {}), **(slot_state or {})}
+        for name, value in state.items():
+            if name not in ('move_id', 'special_id'):  # Stored by older versions, now computed
+                setattr(self, name, value)
+
+    def __reduce__(self):
+        """Pickle as encode() plus the fields it leaves out, instead of one named
+        entry per slot (saved games hold the whole move log)"""
+        rights = self.castle_rights_before
+        return (Move._unpickle, (self.encode(), self.piece_moved, self.piece_captured, self.promoted_to,
+                                 self.last_moved, None if rights is None else rights.to_mask(),
+                                 self.en_passant_before, self.fifty_move_counter))
+
+    @classmethod
+    def _unpickle(cls, code: int, piece_moved: str, piece_captured: str, promoted_to, last_moved: int,
+                  castle_mask, en_passant_before, fifty_move_counter: int) -> Move:
+        """Rebuild a move pickled by __reduce__"""
+        move = cls.__new__(cls)
+        move.start_row, move.start_col = divmod(code >> 6 & 63, 8)
+        move.end_row, move.end_col = divmod(code & 63, 8)
+        move.piece_moved = piece_moved
+        move.piece_captured = piece_captured
+        move.enPassant = bool(code & cls.EN_PASSANT_BIT)
+        move.pawn_promotion = bool(code & cls.PROMOTION_BIT)
+        move.is_castle_move = bool(code & cls.CASTLE_BIT)
+        move.promoted_to = promoted_to
+        move.last_moved = last_moved
+        move.castle_rights_before = None if castle_mask is None else CastleRights.from_mask(castle_mask)
+        move.en_passant_before = en_passant_before
+        move.fifty_move_counter = fifty_move_counter
+        return move
+
+    # Identifiers are derived on demand: move generation builds far more moves
+    # than ever get compared, so they are not computed in __init__
+    @property
+    def move_id(self) -> int:
+        return self.start_row * 1000 + self.start_col * 100 + self.end_row * 10 + self.end_col
+
+    @property
+    def special_id(self) -> int:
+        return self.get_special_id()
 
     def get_special_id(self):
         """Create unique identifier including special move types"""
@@ -77,6 +145,26 @@ class Move:
         special_id += ord(self.piece_captured[0]) + ord(self.piece_captured[1])
         return special_id
 
+    # Compact form: bits 0-5 end square, 6-11 start square (row * 8 + col), then flags.
+    # The pieces are not stored; decode() reads them from the board the move is played on.
+    PROMOTION_BIT = 1 << 12
+    EN_PASSANT_BIT = 1 << 13
+    CASTLE_BIT = 1 << 14
+
+    def encode(self) -> int:
+        """Pack the move into a 16-bit int (the low 12 bits are the squares alone)"""
+        return ((self.start_row * 8 + self.start_col) << 6 | self.end_row * 8 + self.end_col |
+                self.pawn_promotion * self.PROMOTION_BIT | self.enPassant * self.EN_PASSANT_BIT |
+                self.is_castle_move * self.CASTLE_BIT)
+
+    @classmethod
+    def decode(cls, code: int, board: list[list[str]]) -> Move:
+        """Rebuild a move packed by encode() against the position it is played from"""
+        return cls(divmod(code >> 6 & 63, 8), divmod(code & 63, 8), board,
+                   enPassant=bool(code & cls.EN_PASSANT_BIT),
+                   pawn_promotion=bool(code & cls.PROMOTION_BIT),
+                   is_castle_move=bool(code & cls.CASTLE_BIT))
+
     def set_promotion_piece(self, piece: str):
         """Set what piece the pawn promotes to"""
         self.promoted_to = piece
@@ -103,18 +191,18 @@ class Move:
                 self.enPassant == other.enPassant and self.is_castle_move == other.is_castle_move)
 
     def __hash__(self) -> int:
-        """Hash for use in sets and dictionaries"""
-        return hash((self.start_row, self.start_col, self.end_row, self.end_col, 
-                    self.piece_moved, self.piece_captured, self.enPassant, 
-                    self.pawn_promotion, self.is_castle_move))
+        """Hash for use in sets and dictionaries, over exactly the fields __eq__ compares"""
+        return hash((self.start_row, self.start_col, self.end_row, self.end_col,
+                     self.piece_moved, self.enPassant, self.pawn_promotion, self.is_castle_move))
         
     def get_chess_notation(self) -> str:
         """Get algebraic notation for the move"""
-        return self.get_rank_file(self.start_row, self.start_col) + self.get_rank_file(self.end_row, self.end_col)
+        names = self.SQUARE_NAMES
+        return names[self.start_row * 8 + self.start_col] + names[self.end_row * 8 + self.end_col]
     
     def get_rank_file(self, r: int, c: int) -> str:
         """Convert row/col to chess notation"""
-        return self.cols_to_files[c] + self.rows_to_ranks[r]
+        return self.SQUARE_NAMES[r * 8 + c]
 
     def is_valid(self) -> bool:
         """Check if move coordinates are valid"""
@@ -1,6 +1,10 @@
 """Game save/load functionality"""
 
+import gzip
+import os
 import pickle
+import pickletools
+import threading
 import time
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -12,10 +16,21 @@ class SaveManager:
         self.data_dir = Path("data/saves")
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.default_save_file = self.data_dir / "database.pkl"
+        self._write_lock = threading.Lock()  # One save file write at a time
+        self._pending_write: Optional[threading.Thread] = None
+        self.last_save_error: Optional[Exception] = None  # Why the last background write failed
+        self._saves_cache: Optional[list[str]] = None  # list_saves() result, dropped when files change
     
     def save_game(self, game_state: GameState, ai_settings: Optional[Dict] = None, 
                   filename: Optional[str] = None) -> bool:
-        """Save game state with metadata"""
+        """Save game state with metadata
+        
+        The state is pickled here, so the snapshot is consistent and pickling
+        errors are reported; optimizing, compressing and writing the bytes
+        happen on a background thread so the game loop does not wait on them.
+        True means the save was started: a failed write is recorded in
+        last_save_error and reported by the next wait_for_save or save_game.
+        """
         try:
             save_path = self.data_dir / filename if filename else self.default_save_file
             
@@ -26,17 +41,56 @@ class SaveManager:
                 'ai_settings': ai_settings or {}
             }
             
-            with open(save_path, 'wb') as f:
-                pickle.dump(save_data, f)
+            data = pickle.dumps(save_data, protocol=pickle.HIGHEST_PROTOCOL)
+            if not self.wait_for_save():
+                print(f"Previous save was not written: {self.last_save_error}")
+            self.last_save_error = None
+            # Not a daemon: an exit while it runs waits for the file to be complete
+            self._pending_write = threading.Thread(target=self._write_save, args=(save_path, data))
+            self._pending_write.start()
             return True
             
         except Exception as e:
             print(f"Error saving game: {e}")
             return False
     
+    def _write_save(self, save_path: Path, data: bytes):
+        """Strip unused memo PUTs from pickled save data, gzip it and write it
+        (runs on the save thread)
+
+        The bytes go to a temporary file that then replaces the save, so a
+        failed write leaves the previous save intact.
+        """
+        temp_path = save_path.with_name(save_path.name + ".tmp")
+        try:
+            data = gzip.compress(pickletools.optimize(data), compresslevel=1)
+            with self._write_lock:
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, save_path)
+                self._saves_cache = None
+        except Exception as e:
+            self.last_save_error = e
+            print(f"Error saving game: {e}")
+            try:
+                temp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+    
+    def wait_for_save(self) -> bool:
+        """Block until a save still being written has finished
+        
+        Returns False if the last write failed (last_save_error says why).
+        """
+        if self._pending_write is not None:
+            self._pending_write.join()
+            self._pending_write = None
+        return self.last_save_error is None
+    
     def load_game(self, filename: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Load game state and metadata"""
         try:
+            self.wait_for_save()
             load_path = self.data_dir / filename if filename else self.default_save_file
             
             if not load_path.exists():
@@ -44,7 +98,11 @@ class SaveManager:
                 return None
             
             with open(load_path, 'rb') as f:
-                save_data = pickle.load(f)
+                data = f.read()
+            # Saves are gzipped pickles; older ones are plain pickles
+            if data[:2] == b'\x1f\x8b':
+                data = gzip.decompress(data)
+            save_data = pickle.loads(data)
                 
             # Handle different save formats
             if isinstance(save_data, dict):
@@ -58,15 +116,23 @@ class SaveManager:
             return None
     
     def list_saves(self) -> list[str]:
-        """List all available save files"""
-        return [f.name for f in self.data_dir.glob("*.pkl")]
+        """List all available save files (the listing is cached until a save or delete)"""
+        # A save still being written would land after the scan and leave it stale
+        self.wait_for_save()
+        if self._saves_cache is None:
+            with os.scandir(self.data_dir) as entries:
+                self._saves_cache = [entry.name for entry in entries
+                                     if entry.name.endswith(".pkl") and entry.is_file()]
+        return list(self._saves_cache)
     
     def delete_save(self, filename: str) -> bool:
         """Delete a save file"""
         try:
+            self.wait_for_save()
             save_path = self.data_dir / filename
             if save_path.exists():
                 save_path.unlink()
+                self._saves_cache = None
                 return True
             return False
         except Exception as e:
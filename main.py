@@ -1,9 +1,16 @@
 """Main entry point for the chess game"""
 
 if __name__ == "__main__":
+    import atexit
+    import pygame as p
     from ui.game_view import GameView
     from ui.menu_system import MainMenu
+
+    # Start pygame once for the whole run; closing the window anywhere
+    # raises SystemExit, so it is shut down here on the way out
+    p.init()
+    atexit.register(p.quit)
     
     game = GameView()
     menu = MainMenu(game)
-    menu.draw_main_menu()
\ No newline at end of file
+    menu.run()
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""Shared helpers for the test suite"""
+
+from core.bitboard import Bitboard
+from core.game_state import GameState
+from core.move import CastleRights
+
+
+def position_from_fen(fen: str) -> GameState:
+    """GameState for the piece placement, side, castling and en passant fields of a FEN"""
+    placement, side, castling, en_passant = fen.split()[:4]
+    gs = GameState()
+    board = []
+    for fen_row in placement.split('/'):
+        row = []
+        for ch in fen_row:
+            if ch.isdigit():
+                row += ["--"] * int(ch)
+            else:
+                # Board strings use a lower-case 'p' for pawns and upper case otherwise
+                row.append(('w' if ch.isupper() else 'b') + ('p' if ch in 'pP' else ch.upper()))
+        board.append(row)
+    gs.board[:] = board
+    for r, row in enumerate(board):
+        for c, piece in enumerate(row):
+            if piece == "wK":
+                gs.white_king_location = (r, c)
+            elif piece == "bK":
+                gs.black_king_location = (r, c)
+    gs.white_to_move = side == 'w'
+    gs.current_castling_rights = CastleRights('K' in castling, 'k' in castling,
+                                              'Q' in castling, 'q' in castling)
+    if en_passant != '-':
+        gs.enPassant_possible = (8 - int(en_passant[1]), ord(en_passant[0]) - ord('a'))
+    gs.bitboard = Bitboard.from_board(gs.board)
+    gs.piece_count = gs.count_pieces()
+    gs.zobrist_key = gs.compute_zobrist_key()
+    gs.zobrist_log = [gs.zobrist_key]
+    return gs
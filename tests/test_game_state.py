@@ -0,0 +1,128 @@
+"""GameState make/undo: incremental Zobrist keys and pickling"""
+
+import pickle
+import random
+import unittest
+
+from core.game_state import GameState
+from tests import position_from_fen
+from tests.test_moves import KIWIPETE, POSITION_3, POSITION_4
+
+
+def play(gs: GameState, notations):
+    """Make the valid moves given in get_chess_notation() form, in order"""
+    for notation in notations:
+        moves = {move.get_chess_notation(): move for move in gs.get_valid_moves()}
+        gs.make_move(moves[notation])
+
+
+class TestZobristKey(unittest.TestCase):
+    def walk(self, gs: GameState, seed: int, plies: int):
+        """Random make/undo walk checking the incremental key at every step
+
+        Returns how many castling, en passant and promotion moves were made.
+        """
+        rnd = random.Random(seed)
+        start_board = [row[:] for row in gs.board]
+        start_key = gs.zobrist_key
+        specials = {'castle': 0, 'en_passant': 0, 'promotion': 0}
+        for _ in range(plies):
+            moves = gs.get_valid_moves()
+            if not moves:
+                break
+            if gs.move_log and rnd.random() < 0.2:
+                gs.undo_move()
+            else:
+                move = rnd.choice(moves)
+                gs.ai_promotion_piece = rnd.choice("QRBN")
+                gs.make_move(move)
+                specials['castle'] += move.is_castle_move
+                specials['en_passant'] += move.enPassant
+                specials['promotion'] += move.pawn_promotion
+            self.assertEqual(gs.zobrist_key, gs.compute_zobrist_key())
+        while gs.move_log:
+            gs.undo_move()
+            self.assertEqual(gs.zobrist_key, gs.compute_zobrist_key())
+        self.assertEqual(gs.board, start_board)
+        self.assertEqual(gs.zobrist_key, start_key)
+        return specials
+
+    def test_random_walks(self):
+        totals = {'castle': 0, 'en_passant': 0, 'promotion': 0}
+        for fen in (KIWIPETE, POSITION_3, POSITION_4):
+            for seed in range(10):
+                for kind, count in self.walk(position_from_fen(fen), seed, 80).items():
+                    totals[kind] += count
+        # The walks must actually exercise every special move
+        for kind, count in totals.items():
+            with self.subTest(kind=kind):
+                self.assertGreater(count, 0)
+
+    def test_castling_en_passant_and_promotion(self):
+        gs = GameState()
+        keys = [gs.zobrist_key]
+        # 5.O-O castles, 6.exf6 takes en passant, 8.gxh8=Q promotes
+        moves = ["e2e4", "a7a6", "g1f3", "a6a5", "f1c4", "a5a4", "e4e5", "b7b6",
+                 "e1g1", "f7f5", "e5f6", "b8c6", "f6g7", "a4a3", "g7h8"]
+        for notation in moves:
+            play(gs, [notation])
+            keys.append(gs.zobrist_key)
+            self.assertEqual(gs.zobrist_key, gs.compute_zobrist_key())
+        self.assertTrue(gs.move_log[8].is_castle_move)
+        self.assertTrue(gs.move_log[10].enPassant)
+        self.assertTrue(gs.move_log[14].pawn_promotion)
+        self.assertEqual(gs.board[0][7], "wQ")
+        while gs.move_log:
+            keys.pop()
+            gs.undo_move()
+            self.assertEqual(gs.zobrist_key, keys[-1])
+            self.assertEqual(gs.zobrist_key, gs.compute_zobrist_key())
+
+
+class TestPickle(unittest.TestCase):
+    def test_round_trip_with_move_log(self):
+        gs = GameState()
+        play(gs, ["e2e4", "d7d5", "e4e5", "f7f5", "e5f6", "e8f7", "f1c4", "d5c4",
+                  "g1f3", "g8f6", "e1g1"])
+        restored = pickle.loads(pickle.dumps(gs, protocol=pickle.HIGHEST_PROTOCOL))
+
+        self.assertEqual(restored.board, gs.board)
+        self.assertEqual(restored.white_to_move, gs.white_to_move)
+        self.assertEqual(restored.zobrist_key, gs.zobrist_key)
+        self.assertEqual(restored.zobrist_log, gs.zobrist_log)
+        self.assertEqual(restored.piece_count, gs.piece_count)
+        self.assertEqual(restored.current_castling_rights, gs.current_castling_rights)
+        self.assertEqual(len(restored.move_log), len(gs.move_log))
+        for original, copy in zip(gs.move_log, restored.move_log):
+            self.assertEqual(copy, original)
+            self.assertEqual(copy.piece_captured, original.piece_captured)
+            self.assertEqual(copy.enPassant, original.enPassant)
+            self.assertEqual(copy.is_castle_move, original.is_castle_move)
+            self.assertEqual(copy.castle_rights_before, original.castle_rights_before)
+            self.assertEqual(copy.en_passant_before, original.en_passant_before)
+        self.assertEqual([m.get_chess_notation() for m in restored.get_valid_moves()],
+                         [m.get_chess_notation() for m in gs.get_valid_moves()])
+
+        # The unpickled moves carry everything undo_move needs
+        while restored.move_log:
+            restored.undo_move()
+            self.assertEqual(restored.zobrist_key, restored.compute_zobrist_key())
+        fresh = GameState()
+        self.assertEqual(restored.board, fresh.board)
+        self.assertEqual(restored.zobrist_key, fresh.zobrist_key)
+        self.assertEqual(restored.current_castling_rights, fresh.current_castling_rights)
+
+    def test_promotion_move_round_trip(self):
+        gs = position_from_fen(POSITION_4)
+        gs.ai_promotion_piece = "N"
+        play(gs, ["c4c5", "b2a1"])
+        restored = pickle.loads(pickle.dumps(gs))
+        self.assertEqual(restored.board[7][0], "bN")
+        self.assertEqual(restored.move_log[-1].promoted_to, gs.move_log[-1].promoted_to)
+        restored.undo_move()
+        self.assertEqual(restored.board[6][1], "bp")
+        self.assertEqual(restored.board[7][0], "wR")
+
+
+if __name__ == '__main__':
+    unittest.main()
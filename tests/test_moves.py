@@ -0,0 +1,81 @@
+"""Move generation: perft node counts against published reference values"""
+
+import unittest
+
+from core.game_state import GameState
+from tests import position_from_fen
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+# En passant pinned along the rank, and en passant out of a pawn check
+POSITION_3 = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+# Promotions (including capture-promotions) and castling through attacked squares
+POSITION_4 = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+POSITION_5 = "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"
+
+
+def perft(gs: GameState, depth: int) -> int:
+    """Count leaf nodes; a promotion is played once per piece it can become
+
+    GameState generates one move per promotion square and takes the piece
+    from ai_promotion_piece when the move is made, so each choice is tried here.
+    """
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in gs.get_valid_moves():
+        for piece in ("QRBN" if move.pawn_promotion else "Q"):
+            gs.ai_promotion_piece = piece
+            gs.make_move(move)
+            nodes += perft(gs, depth - 1)
+            gs.undo_move()
+    gs.ai_promotion_piece = "Q"
+    return nodes
+
+
+class TestPerft(unittest.TestCase):
+    def assert_perft(self, gs: GameState, expected):
+        for depth, nodes in enumerate(expected, start=1):
+            with self.subTest(depth=depth):
+                self.assertEqual(perft(gs, depth), nodes)
+
+    def test_start_position(self):
+        self.assert_perft(GameState(), [20, 400, 8902])
+
+    def test_kiwipete(self):
+        self.assert_perft(position_from_fen(KIWIPETE), [48, 2039, 97862])
+
+    def test_position_3(self):
+        self.assert_perft(position_from_fen(POSITION_3), [14, 191, 2812, 43238])
+
+    def test_position_4(self):
+        self.assert_perft(position_from_fen(POSITION_4), [6, 264, 9467])
+
+    def test_position_5(self):
+        self.assert_perft(position_from_fen(POSITION_5), [44, 1486, 62379])
+
+    def test_perft_restores_position(self):
+        gs = position_from_fen(KIWIPETE)
+        board = [row[:] for row in gs.board]
+        key = gs.zobrist_key
+        perft(gs, 2)
+        self.assertEqual(gs.board, board)
+        self.assertEqual(gs.zobrist_key, key)
+
+
+class TestSpecialMoves(unittest.TestCase):
+    def test_en_passant_captures_checking_pawn(self):
+        # Black's d7-d5 checks the king on e4; e5xd6 removes the checker
+        gs = position_from_fen("7k/8/8/3pP3/4K3/8/8/8 w - d6 0 1")
+        notations = {move.get_chess_notation() for move in gs.get_valid_moves()}
+        self.assertTrue(gs.in_check)
+        self.assertIn("e5d6", notations)
+
+    def test_en_passant_rank_pin(self):
+        # Taking en passant would leave the rook on a5 attacking the king on h5
+        gs = position_from_fen("8/8/8/r2pP2K/8/8/8/7k w - d6 0 1")
+        notations = {move.get_chess_notation() for move in gs.get_valid_moves()}
+        self.assertNotIn("e5d6", notations)
+
+
+if __name__ == '__main__':
+    unittest.main()
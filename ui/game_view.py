@@ -1,12 +1,11 @@
 """Main game view and rendering"""
 
 from __future__ import annotations
+import sys
 import pygame as p
-import math
 from typing import TYPE_CHECKING
 
 from controllers.game_controller import GameController
-from .menu_system import MainMenu
 from .ui_components import Button
 
 if TYPE_CHECKING:
@@ -29,11 +28,43 @@ class GameView:
         self.clock = p.time.Clock()
         self.screen = p.display.set_mode((self.width + self.constants.SIDE_SCREEN, self.height))
         p.display.set_caption("Advanced Chess Engine")
+        self.board_surface = self.build_board_surface()
+        # Translucent square overlays: selected piece, its destinations, last move
+        self.selected_overlay = self.build_highlight((0, 0, 128))
+        self.valid_move_overlay = self.build_highlight((135, 206, 250))
+        self.last_move_overlay = self.build_highlight((0, 255, 0))
+        # Destinations of the valid moves grouped by start square, rebuilt
+        # whenever the controller hands over a new valid move list
+        self.indexed_moves = None
+        self.moves_by_start = {}
+        # frame_state() of the last frame drawn; None forces the next frame to draw
+        self.drawn_state = None
+        # Rendered move log entries and AI stats, with what they were rendered from
+        self.move_log_surface = None
+        self.move_log_key = None
+        self.ai_stats_surface = None
+        self.ai_stats_lines = None
         
         # UI state
         self.promote = self.controller.promote
+        # Pawn promotion choice, shown over the board while the game loop keeps running
+        self.choosing_promotion = False
+        self.promotion_buttons = {
+            "Q": Button((105, 105, 105), self.width/2 - 30, self.height/2, 60, 60, "Q"),
+            "R": Button((105, 105, 105), self.width/2 + 30, self.height/2, 60, 60, "R"),
+            "B": Button((105, 105, 105), self.width/2 - 30, self.height/2 - 70, 60, 60, "B"),
+            "N": Button((105, 105, 105), self.width/2 + 30, self.height/2 - 70, 60, 60, "N"),
+        }
         self.save_button = Button(self.constants.DARK_GRAY, 550, 400, 100, 50, "save")
         self.load_button = Button(self.constants.DARK_GRAY, 550, 460, 100, 50, "load")
+        self.turn_panel_rect = p.Rect(537, 50, 150, 100)
+        
+        # Fonts and fixed text, created by load_fonts once pygame is initialized
+        self.log_font = None
+        self.stats_font = None
+        self.message_font = None
+        self.turn_texts = {}
+        self.move_log_title = None
 
     def load_images(self):
         """Load piece images based on board pieces"""
@@ -41,40 +72,60 @@ class GameView:
         for piece in pieces:
             try:
                 image_path = f"assets/images/pieces/{piece}.png"
+                # Converted to the display's pixel format (keeping per-pixel alpha)
+                # so each per-frame blit needs no format conversion
                 self.images[piece] = p.transform.scale(
                     p.image.load(image_path), 
                     (self.sq_size, self.sq_size)
-                )
+                ).convert_alpha()
             except Exception as e:
                 print(f"Error loading image {piece}: {e}")
                 # Create a placeholder colored rectangle
-                placeholder = p.Surface((self.sq_size, self.sq_size))
+                placeholder = p.Surface((self.sq_size, self.sq_size)).convert()
                 color = (255, 255, 255) if piece[0] == 'w' else (0, 0, 0)
                 placeholder.fill(color)
                 self.images[piece] = placeholder
 
+    def load_fonts(self):
+        """Create the panel fonts and render the fixed labels once, instead of on every frame"""
+        turn_font = p.font.SysFont('Arial', 24)
+        self.log_font = p.font.SysFont(None, 24)
+        self.stats_font = p.font.SysFont(None, 20)
+        self.message_font = p.font.SysFont("Helvetica", 32, True, False)
+        # Keyed by whether it is white's turn (dark text on the white box, light on the black)
+        self.turn_texts = {
+            True: turn_font.render("White's Turn", True, self.constants.BLACK),
+            False: turn_font.render("Black's Turn", True, self.constants.WHITE),
+        }
+        self.move_log_title = self.log_font.render("Move Log", True, self.constants.WHITE)
+
     def main(self):
         """Main game loop"""
-        p.init()
         screen = self.screen
         clock = self.clock
         screen.fill(self.constants.DIM_BLUE)
         self.load_images()
-        running = True
+        self.load_fonts()
+        self.drawn_state = None
         
-        while running:
+        while True:
             # Handle events
             for event in p.event.get():
                 if event.type == p.QUIT:
-                    running = False
                     self.controller.terminate()
-                    p.quit()
+                    sys.exit()
 
                 elif event.type == p.MOUSEBUTTONDOWN:
                     location = p.mouse.get_pos()
-                    if location[0] < self.constants.WIDTH:
-                        self.controller.handle_mouse_click(location)
-                    self.check_save_buttons(location)
+                    if self.choosing_promotion:
+                        self.check_promotion_buttons(location)
+                    else:
+                        if location[0] < self.constants.WIDTH:
+                            self.controller.handle_mouse_click(location)
+                        self.check_save_buttons(location)
+                    
+                elif event.type == p.WINDOWEXPOSED:
+                    self.drawn_state = None
                     
                 elif event.type == p.KEYDOWN:
                     if event.key == p.K_z:  # Undo move
@@ -83,24 +134,40 @@ class GameView:
                         self.controller.reset_game()
                     elif event.key == p.K_ESCAPE:  # Return to menu
                         self.controller.reset_game()
-                        menu = MainMenu(self)
-                        menu.draw_main_menu()
-                        
-                # Handle pawn promotion
-                if self.controller.needs_pawn_promotion() and self.promote:
+                        return
+            
+            # Offer the promotion choice; its clicks are handled by the event loop above
+            if self.promote and not self.choosing_promotion and self.controller.needs_pawn_promotion():
+                self.choosing_promotion = True
+            
+            # Redraw only when something visible changed; otherwise the window
+            # keeps the last frame and nothing is repainted or flipped
+            state = self.frame_state()
+            redraw = state is None or state != self.drawn_state
+            if redraw:
+                self.draw_game_state(screen, self.controller.get_valid_moves(), 
+                                   self.controller.get_selected_square())
+                if self.choosing_promotion:
                     self.draw_pawn_promotion()
-                    
-            # Update game state
-            self.draw_game_state(screen, self.controller.get_valid_moves(), 
-                               self.controller.get_selected_square())
+                self.drawn_state = state
             clock.tick(self.max_fps)
             
             # Handle AI moves
-            self.controller.handle_random_move()
-            self.controller.handle_ai_move()
+            self.controller.handle_turn()
             self.controller.process_moves(screen, clock, self)
 
-            p.display.flip()
+            if redraw:
+                p.display.flip()
+
+    def frame_state(self):
+        """What the frame shows: position, move count and selection, or None when
+        it has to be redrawn every frame (AI stats updating, end-of-game message
+        drawn over the board, promotion choice open)"""
+        controller = self.controller
+        if controller.ai_is_thinking or controller.game_over or self.choosing_promotion:
+            return None
+        return (controller.game_state.zobrist_key, len(controller.get_move_log()),
+                controller.get_selected_square())
 
     def draw_game_state(self, screen: p.surface, valid_moves: list[Move], sq_selected: tuple[int,int]):
         """Draw the current state of the game"""
@@ -113,40 +180,64 @@ class GameView:
         """Highlight selected square and valid moves"""
         if sq_selected != ():
             r, c = sq_selected
-            if self.controller.get_board()[r][c][0] == ('w' if self.controller.is_white_turn() else 'b'): 
+            controller = self.controller
+            sq_size = self.sq_size
+            if controller.get_board()[r][c][0] == ('w' if controller.is_white_turn() else 'b'): 
                 # Highlight selected square
-                surface = p.Surface((self.sq_size, self.sq_size))
-                surface.set_alpha(100)
-                surface.fill((0, 0, 128))
-                screen.blit(surface, (c * self.sq_size, r * self.sq_size))
+                screen.blit(self.selected_overlay, (c * sq_size, r * sq_size))
                 
                 # Highlight valid moves
-                surface.fill((135, 206, 250))
-                for move in valid_moves:
-                    if move.start_row == r and move.start_col == c:
-                        screen.blit(surface, (move.end_col * self.sq_size, move.end_row * self.sq_size))
+                if valid_moves is not self.indexed_moves:
+                    moves_by_start = {}
+                    for move in valid_moves:
+                        moves_by_start.setdefault((move.start_row, move.start_col), []).append(move)
+                    self.moves_by_start = moves_by_start
+                    self.indexed_moves = valid_moves
+                overlay = self.valid_move_overlay
+                for move in self.moves_by_start.get(sq_selected, ()):
+                    screen.blit(overlay, (move.end_col * sq_size, move.end_row * sq_size))
                 
                 # Highlight last move
-                move_log = self.controller.get_move_log()
+                move_log = controller.get_move_log()
                 if len(move_log) != 0:
                     last_move = move_log[-1]
-                    surface.fill((0, 255, 0))
-                    screen.blit(surface, (last_move.end_col * self.sq_size, last_move.end_row * self.sq_size))
+                    screen.blit(self.last_move_overlay, (last_move.end_col * sq_size, last_move.end_row * sq_size))
 
-    def draw_board(self, screen: p.surface):
-        """Draw the chess board squares"""
+    def build_highlight(self, color: tuple[int, int, int]) -> p.Surface:
+        """One square of translucent color, built once and blitted wherever needed
+        
+        An opaque display-format surface with whole-surface alpha: SDL blends
+        that with one alpha value rather than reading alpha per pixel.
+        """
+        surface = p.Surface((self.sq_size, self.sq_size)).convert()
+        surface.set_alpha(100)
+        surface.fill(color)
+        return surface
+
+    def build_board_surface(self) -> p.Surface:
+        """Render the 64 squares once; the board never changes, so frames just blit it"""
+        surface = p.Surface((self.width, self.height)).convert()
         for r in range(self.dimension):
             for c in range(self.dimension):
                 color = self.colors[((r + c) % 2)]
-                p.draw.rect(screen, color, p.Rect(c * self.sq_size, r * self.sq_size, self.sq_size, self.sq_size))
+                p.draw.rect(surface, color, p.Rect(c * self.sq_size, r * self.sq_size, self.sq_size, self.sq_size))
+        return surface
+
+    def draw_board(self, screen: p.surface):
+        """Draw the chess board squares"""
+        screen.blit(self.board_surface, (0, 0))
 
     def draw_pieces(self, screen: p.surface, board: list[list[str]]):
         """Draw pieces on the board"""
-        for r in range(self.dimension):
-            for c in range(self.dimension):
-                piece = board[r][c]
-                if piece != self.constants.EMPTY_POSITION:
-                    screen.blit(self.images[piece], p.Rect(c * self.sq_size, r * self.sq_size, self.sq_size, self.sq_size))
+        blit = screen.blit
+        images = self.images
+        sq_size = self.sq_size
+        empty = self.constants.EMPTY_POSITION
+        for r, row in enumerate(board):
+            y = r * sq_size
+            for c, piece in enumerate(row):
+                if piece != empty:
+                    blit(images[piece], (c * sq_size, y))
     
     def draw_side_panel(self, screen: p.surface):
         """Draw the side information panel"""
@@ -159,49 +250,59 @@ class GameView:
 
     def draw_turn_indicator(self, screen):
         """Draw whose turn it is"""
-        color = self.constants.WHITE if self.controller.is_white_turn() else self.constants.BLACK
-        p.draw.rect(screen, color, p.Rect(537, 50, 150, 100))
+        white_turn = self.controller.is_white_turn()
+        color = self.constants.WHITE if white_turn else self.constants.BLACK
+        p.draw.rect(screen, color, self.turn_panel_rect)
         
         # Add text
-        font = p.font.SysFont('Arial', 24)
-        turn_text = "White" if self.controller.is_white_turn() else "Black"
-        text_color = self.constants.BLACK if self.controller.is_white_turn() else self.constants.WHITE
-        text_surface = font.render(f"{turn_text}'s Turn", True, text_color)
-        screen.blit(text_surface, (545, 90))
+        screen.blit(self.turn_texts[white_turn], (545, 90))
         
     def draw_move_log(self, screen):
         """Draw the move history"""
         move_log = self.controller.get_move_log()
-        font = p.font.SysFont(None, 24)
-        title = font.render("Move Log", True, self.constants.WHITE)
-        screen.blit(title, (612 - 40, 180))
+        screen.blit(self.move_log_title, (612 - 40, 180))
         
-        # Display last 16 moves
-        limit = 12
-        if len(move_log) > limit:
-            move_log = move_log[-limit:]
+        # Re-render the entries only when the log has changed (length and last move)
+        key = (len(move_log), move_log[-1] if move_log else None)
+        if self.move_log_surface is None or key[0] != self.move_log_key[0] or key[1] is not self.move_log_key[1]:
+            font = self.log_font
+            surface = p.Surface((200, 100), p.SRCALPHA)
             
-        for i, move in enumerate(move_log):
-            text = move.get_chess_notation() + ","
-            img = font.render(text, True, self.constants.WHITE)
-            screen.blit(img, (520 + 45 * (i % 4), 200 + 25 * math.ceil((i + 1) / 4)))
+            # Display last 12 moves
+            limit = 12
+            if len(move_log) > limit:
+                move_log = move_log[-limit:]
+                
+            for i, move in enumerate(move_log):
+                text = move.get_chess_notation() + ","
+                img = font.render(text, True, self.constants.WHITE)
+                surface.blit(img, (8 + 45 * (i & 3), 25 * ((i >> 2) + 1)))
+            self.move_log_surface = surface
+            self.move_log_key = key
+        screen.blit(self.move_log_surface, (512, 200))
 
     def draw_ai_stats(self, screen):
         """Draw AI performance statistics"""
         stats = self.controller.get_ai_stats()
-        font = p.font.SysFont(None, 20)
         y_offset = 300
         
-        stat_lines = [
+        stat_lines = (
             f"AI Moves: {stats.get('moves_made', 0)}",
             f"Avg Time: {stats.get('average_time', 0):.1f}s",
             f"Depth: {stats.get('current_depth', 0)}",
             f"Nodes: {stats.get('nodes_searched', 0):,}"
-        ]
+        )
         
-        for i, line in enumerate(stat_lines):
-            text_surface = font.render(line, True, self.constants.WHITE)
-            screen.blit(text_surface, (520, y_offset + i * 20))
+        # Re-render only when a line has changed
+        if stat_lines != self.ai_stats_lines:
+            font = self.stats_font
+            surface = p.Surface((192, 20 * len(stat_lines)), p.SRCALPHA)
+            for i, line in enumerate(stat_lines):
+                text_surface = font.render(line, True, self.constants.WHITE)
+                surface.blit(text_surface, (0, i * 20))
+            self.ai_stats_surface = surface
+            self.ai_stats_lines = stat_lines
+        screen.blit(self.ai_stats_surface, (520, y_offset))
 
     def draw_save_buttons(self, save_button: Button, load_button: Button, screen):
         """Draw save and load buttons"""
@@ -216,43 +317,54 @@ class GameView:
             self.controller.load_game()
 
     def animate_move(self, move: Move, screen: p.surface, board: list[list[str]], clock: p.time.Clock):
-        """Animate a move being played"""
+        """Animate a move being played
+        
+        Everything except the moving piece is static, so it is composed once
+        (board, pieces, emptied end square, captured piece) and each frame is
+        one blit of that plus the piece at its interpolated position.
+        """
         colors = self.colors
+        sq_size = self.sq_size
         dR = move.end_row - move.start_row
         dC = move.end_col - move.start_col
         frame_per_square = 6  # Frames per square moved
         frame_count = (abs(dR) + abs(dC)) * frame_per_square
         
+        background = self.board_surface.copy()
+        self.draw_pieces(background, board)
+        
+        # Clear the destination square
+        color = colors[(move.end_row + move.end_col) % 2]
+        end_square = p.Rect(move.end_col * sq_size, move.end_row * sq_size, sq_size, sq_size)
+        p.draw.rect(background, color, end_square)
+        
+        # Draw captured piece (if any)
+        if move.piece_captured != self.constants.EMPTY_POSITION:
+            if move.enPassant:
+                enPassantRow = move.end_row + 1 if move.piece_captured[0] == 'b' else move.end_row - 1
+                end_square = p.Rect(move.end_col * sq_size, enPassantRow * sq_size, sq_size, sq_size)
+            background.blit(self.images[move.piece_captured], end_square)
+        
+        piece_image = self.images[move.piece_moved]
+        row_step = dR / frame_count
+        col_step = dC / frame_count
         for frame in range(frame_count + 1):
-            r = move.start_row + dR * frame / frame_count
-            c = move.start_col + dC * frame / frame_count
-            
-            self.draw_board(screen)
-            self.draw_pieces(screen, board)
-            
-            # Clear the destination square
-            color = colors[(move.end_row + move.end_col) % 2]
-            end_square = p.Rect(move.end_col * self.sq_size, move.end_row * self.sq_size, self.sq_size, self.sq_size)
-            p.draw.rect(screen, color, end_square)
-            
-            # Draw captured piece (if any)
-            if move.piece_captured != self.constants.EMPTY_POSITION:
-                if move.enPassant:
-                    enPassantRow = move.end_row + 1 if move.piece_captured[0] == 'b' else move.end_row - 1
-                    end_square = p.Rect(move.end_col * self.sq_size, enPassantRow * self.sq_size, self.sq_size, self.sq_size)
-                screen.blit(self.images[move.piece_captured], end_square)
+            r = move.start_row + row_step * frame
+            c = move.start_col + col_step * frame
+            screen.blit(background, (0, 0))
             
             # Draw moving piece
-            screen.blit(self.images[move.piece_moved], p.Rect(c * self.sq_size, r * self.sq_size, self.sq_size, self.sq_size))
+            screen.blit(piece_image, (c * sq_size, r * sq_size))
             p.display.flip()
             clock.tick(60)
-        
+        # The last frame still shows the captured piece, so the next frame must redraw
+        self.drawn_state = None
+
     def draw_text(self, screen: p.surface, text: str):
         """Draw centered text (for game over messages)"""
-        font = p.font.SysFont("Helvetica", 32, True, False)
-        text_object = font.render(text, True, p.Color('Black'))
-        text_location = p.Rect(0, 0, self.width, self.height).move(
-            self.width/2 - text_object.get_width()/2, 
+        text_object = self.message_font.render(text, True, p.Color('Black'))
+        text_location = (
+            self.width/2 - text_object.get_width()/2,
             self.height/2 - text_object.get_height()/2
         )
         screen.blit(text_object, text_location)
@@ -265,25 +377,15 @@ class GameView:
         n.draw(self.screen)
 
     def draw_pawn_promotion(self):
-        """Handle pawn promotion UI"""
-        q = Button((105, 105, 105), self.width/2 - 30, self.height/2, 60, 60, "Q")
-        r = Button((105, 105, 105), self.width/2 + 30, self.height/2, 60, 60, "R")
-        b = Button((105, 105, 105), self.width/2 - 30, self.height/2 - 70, 60, 60, "B")
-        n = Button((105, 105, 105), self.width/2 + 30, self.height/2 - 70, 60, 60, "N")
-        
-        running = True
-        while running:
-            for event in p.event.get():
-                if event.type == p.QUIT:
-                    running = False
-                    
-                elif event.type == p.MOUSEBUTTONDOWN:
-                    location = p.mouse.get_pos()
-                    if q.is_over(location):
-                        self.controller.set_promotion_piece("Q")
-                        running = False
-                        self.promote = False
-                    elif r.is_over(location):
-                        self.controller.set_promotion_piece("R")
-                        running = False
-                        self.promote = False
\ No newline at end of file
+        """Draw the pawn promotion choice over the board (clicks go to check_promotion_buttons)"""
+        self.draw_promotion_buttons(*self.promotion_buttons.values())
+
+    def check_promotion_buttons(self, location):
+        """Handle a click while the promotion choice is open"""
+        for piece, button in self.promotion_buttons.items():
+            if button.is_over(location):
+                self.controller.set_promotion_piece(piece)
+                self.choosing_promotion = False
+                self.promote = False
+                self.drawn_state = None
+                break
@@ -1,11 +1,94 @@
 """Menu system for chess game navigation"""
 
+import sys
+from functools import cached_property
+
 import pygame as p
 from .ui_components import Button
 
 class MainMenu:
+    # The only events the menu loops read; WINDOWEXPOSED asks for a full repaint
+    MENU_EVENT_TYPES = (p.QUIT, p.KEYDOWN, p.MOUSEBUTTONDOWN, p.WINDOWEXPOSED)
+
+    # Menu buttons as (name, label, vertical offset from the window middle)
+    BUTTON_SPECS = (
+        # Main menu
+        ('play', "Play", 60),
+        ('rules', "Rules", 140),
+        ('controls', "Controls", -20),
+        # Play menu
+        ('pvp', "Player vs Player", 60),
+        ('pva', "Player vs AI", -20),
+        ('ai_menu', "AI Options", 140),
+        # AI colour
+        ('ai_black', "AI Black", 60),
+        ('ai_white', "AI White", -20),
+        # Difficulty
+        ('easy', "Easy", -20),
+        ('normal', "Normal", 60),
+        ('hard', "Hard", 140),
+        # AI vs AI
+        ('ai_random', "AI vs Random", 60),
+        ('ai_ai', "AI vs AI", -20),
+    )
+
+    # Pages of the rules and controls screens, one line per row
+    RULES_TEXT = (
+        (
+            "CHESS RULES",
+            "",
+            "OBJECTIVE: Checkmate the opponent's king",
+            "",
+            "PIECE MOVEMENTS:",
+            "• Pawn: Forward 1, or 2 on first move",
+            "• Rook: Horizontal and vertical lines",
+            "• Bishop: Diagonal lines",
+            "• Knight: L-shape (2+1 squares)",
+            "• Queen: Any direction, any distance",
+            "• King: One square in any direction",
+            "",
+            "Click for next page",
+        ),
+        (
+            "SPECIAL MOVES:",
+            "• Castling: King and rook move together",
+            "• En passant: Pawn captures sideways",
+            "• Promotion: Pawn reaches end of board",
+            "",
+            "Press ESCAPE to return to menu",
+        ),
+    )
+    CONTROLS_TEXT = (
+        (
+            "GAME CONTROLS",
+            "",
+            "MOUSE:",
+            "• Click to select piece",
+            "• Click destination to move",
+            "• Click save/load buttons",
+            "",
+            "KEYBOARD:",
+            "• Z - Undo last move",
+            "• R - Reset game",
+            "• ESC - Return to menu",
+            "",
+            "Click for next page",
+        ),
+        (
+            "PAWN PROMOTION:",
+            "• Click Q, R, B, or N when prompted",
+            "",
+            "Press ESCAPE to return to menu",
+        ),
+    )
+
     def __init__(self, game_view):
         """Main menu system for the chess game"""
+        # Let SDL drop everything no screen handles (mouse motion above all) when it
+        # would be queued; the game view also redraws on WINDOWEXPOSED
+        p.event.set_blocked(None)
+        p.event.set_allowed(self.MENU_EVENT_TYPES)
+        
         self.view = game_view
         self.controller = game_view.controller
         self.constants = self.view.constants
@@ -18,427 +101,251 @@ class MainMenu:
         button_width = self.screen_width // 2
         button_height = self.screen_height // 8
         
-        # Main menu buttons
-        self.button_play = Button(
-            self.button_color, 
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 + 60, 
-            button_width, button_height, "Play"
-        )
-        self.button_rules = Button(
-            self.button_color,
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 + 140,
-            button_width, button_height, "Rules"
-        )
-        self.button_controls = Button(
-            self.button_color,
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 - 20,
-            button_width, button_height, "Controls"
-        )
-        
-        # Play menu buttons
-        self.button_pvp = Button(
-            self.button_color,
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 + 60,
-            button_width, button_height, "Player vs Player"
-        )
-        self.button_pva = Button(
-            self.button_color,
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 - 20,
-            button_width, button_height, "Player vs AI"
-        )
-        self.button_ai_menu = Button(
-            self.button_color,
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 + 140,
-            button_width, button_height, "AI Options"
-        )
-        
-        # AI selection buttons
-        self.button_ai_black = Button(
-            self.button_color,
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 + 60,
-            button_width, button_height, "AI Black"
-        )
-        self.button_ai_white = Button(
-            self.button_color,
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 - 20,
-            button_width, button_height, "AI White"
-        )
+        # All menu buttons share one column; BUTTON_SPECS gives the rest
+        x = self.screen_width//4 + self.constants.MENU_OFFSET
+        self.buttons = {
+            name: Button(self.button_color, x, self.screen_height//2 + dy,
+                         button_width, button_height, label)
+            for name, label, dy in self.BUTTON_SPECS
+        }
         
-        # Difficulty buttons
-        self.button_easy = Button(
-            self.button_color,
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 - 20,
-            button_width, button_height, "Easy"
-        )
-        self.button_normal = Button(
-            self.button_color,
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 + 60,
-            button_width, button_height, "Normal"
-        )
-        self.button_hard = Button(
-            self.button_color,
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 + 140,
-            button_width, button_height, "Hard"
-        )
-        
-        # AI vs AI buttons
-        self.button_ai_random = Button(
-            self.button_color,
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 + 60,
-            button_width, button_height, "AI vs Random"
-        )
-        self.button_ai_ai = Button(
-            self.button_color,
-            self.screen_width//4 + self.constants.MENU_OFFSET,
-            self.screen_height//2 - 20,
-            button_width, button_height, "AI vs AI"
-        )
-        
-        # Load background and logo images
+        # Rendered rules/controls pages, built on first visit
+        self._rules_pages = None
+        self._controls_pages = None
+
+    @cached_property
+    def image(self):
+        """Menu logo, loaded and converted on first use"""
         try:
-            self.image = p.transform.scale(
+            return p.transform.scale(
                 p.image.load("assets/images/menu/main_logo.png"), 
                 (int(self.screen_width//3 + self.constants.SIDE_SCREEN), int(self.screen_height//2.5))
-            )
-            self.background = p.transform.scale(
+            ).convert_alpha()
+        except:
+            # Create placeholder graphics if image not found
+            image = p.Surface((200, 100)).convert()
+            image.fill(self.constants.WHITE)
+            return image
+
+    @cached_property
+    def background(self):
+        """Menu background, loaded and converted on first use"""
+        try:
+            return p.transform.scale(
                 p.image.load("assets/images/menu/background.jpg"),
                 (self.screen_width + self.constants.SIDE_SCREEN, self.screen_height + 5)
-            )
+            ).convert()
         except:
-            # Create placeholder graphics if images not found
-            self.image = p.Surface((200, 100))
-            self.image.fill(self.constants.WHITE)
-            self.background = p.Surface((self.screen_width + self.constants.SIDE_SCREEN, self.screen_height))
-            self.background.fill(self.constants.DIM_BLUE)
+            # Create placeholder graphics if image not found
+            background = p.Surface((self.screen_width + self.constants.SIDE_SCREEN, self.screen_height)).convert()
+            background.fill(self.constants.DIM_BLUE)
+            return background
 
-    def draw_main_menu(self):
-        """Display the main menu"""
-        p.init()
-        running = True
-        self.screen.fill(self.constants.DARK_BLUE)
-        
-        while running:
-            self.screen.blit(self.background, p.Rect(0, 0, self.screen_width, self.screen_height))
-            self.screen.blit(self.image, (
-                (self.constants.WIDTH + self.constants.SIDE_SCREEN - self.image.get_width())//2, 25
-            ))
-            
-            for event in p.event.get():
-                if event.type == p.QUIT:
-                    running = False
-                    p.quit()
-                elif event.type == p.MOUSEBUTTONDOWN:
-                    location = p.mouse.get_pos()
-                    if self.button_play.is_over(location):
-                        running = False
-                        self.draw_play_menu()
-                    elif self.button_rules.is_over(location):
-                        running = False
-                        self.draw_rules_menu()
-                    elif self.button_controls.is_over(location):
-                        running = False
-                        self.draw_controls_menu()
-                        
-            # Draw buttons
-            self.button_play.draw(self.screen)
-            self.button_rules.draw(self.screen)
-            self.button_controls.draw(self.screen)
-            p.display.flip()
+    @cached_property
+    def _menu_bg(self):
+        """Background with the logo already on it, so each menu frame starts
+        with a single blit; it covers the whole window, so no fill is needed
+        """
+        menu_bg = self.background.copy()
+        menu_bg.blit(self.image, (
+            (self.constants.WIDTH + self.constants.SIDE_SCREEN - self.image.get_width())//2, 25
+        ))
+        return menu_bg
 
-    def draw_play_menu(self):
-        """Display play options menu"""
-        p.display.init()
-        running = True
-        
-        while running:
-            self.screen.fill(self.constants.DARK_BLUE)
-            self.screen.blit(self.background, p.Rect(0, 0, self.screen_width, self.screen_height))
-            self.screen.blit(self.image, (
-                (self.constants.WIDTH + self.constants.SIDE_SCREEN - self.image.get_width())//2, 25
-            ))
+    def _menu_events(self, wait: bool) -> list:
+        """Return the menu events to handle on this pass of a menu loop
 
-            for event in p.event.get():
+        Once a menu has been drawn (``wait``) nothing on it changes without
+        input, so block in SDL until an event arrives instead of redrawing and
+        flipping as fast as the loop can spin.
+        """
+        events = p.event.get(self.MENU_EVENT_TYPES)
+        if events or not wait:
+            return events
+        event = p.event.wait()
+        if event.type in self.MENU_EVENT_TYPES:
+            events.append(event)
+        return events + p.event.get(self.MENU_EVENT_TYPES)
+
+    def run_button_menu(self, buttons, escape_to=None):
+        """Run a menu of (button, action) pairs until a button is clicked
+
+        Returns what the clicked button's action returns (the next screen's
+        name), or escape_to when ESC is pressed on a menu that has one. The
+        whole window is repainted for the first frame and on WINDOWEXPOSED;
+        other wake-ups redraw and update just the buttons.
+        """
+        button_rects = [button.rect for button, _ in buttons]
+        full_redraw = True
+        
+        while True:
+            for event in self._menu_events(not full_redraw):
                 if event.type == p.QUIT:
-                    running = False
-                    p.display.quit()
+                    sys.exit()
+                elif event.type == p.WINDOWEXPOSED:
+                    full_redraw = True
                 elif event.type == p.KEYDOWN:
-                    if event.key == p.K_ESCAPE:
-                        running = False
-                        self.draw_main_menu()
+                    if event.key == p.K_ESCAPE and escape_to:
+                        return escape_to
                 elif event.type == p.MOUSEBUTTONDOWN:
                     location = p.mouse.get_pos()
-                    if self.button_pvp.is_over(location):
-                        self.controller.set_player_vs_player()
-                        running = False
-                        self.view.main()
-                        p.display.quit()
-                    elif self.button_pva.is_over(location):
-                        running = False
-                        self.draw_difficulty_menu(True)
-                    elif self.button_ai_menu.is_over(location):
-                        running = False
-                        self.draw_difficulty_menu(False)
+                    for button, action in buttons:
+                        if button.is_over(location):
+                            return action()
             
-            # Draw play menu buttons
-            self.button_pvp.draw(self.screen)
-            self.button_pva.draw(self.screen)
-            self.button_ai_menu.draw(self.screen)
-            p.display.flip()
+            if full_redraw:
+                self.screen.blit(self._menu_bg, (0, 0))
+            for button, _ in buttons:
+                button.draw(self.screen)
+            if full_redraw:
+                p.display.flip()
+            else:
+                p.display.update(button_rects)
+            full_redraw = False
 
-    def draw_difficulty_menu(self, is_human_vs_ai: bool):
-        """Display AI difficulty selection"""
-        p.display.init()
-        running = True
+    def run_text_menu(self, pages):
+        """Show pre-rendered full-window pages, turning the page on each click, until ESC
+
+        Only a page turn or WINDOWEXPOSED repaints the window, with one blit.
+        """
+        full_redraw = True
+        page = 0
         
-        while running:
-            self.screen.fill(self.constants.DARK_BLUE)
-            self.screen.blit(self.background, p.Rect(0, 0, self.screen_width, self.screen_height))
-            self.screen.blit(self.image, (
-                (self.constants.WIDTH + self.constants.SIDE_SCREEN - self.image.get_width())//2, 25
-            ))
-            
-            for event in p.event.get():
+        while True:
+            for event in self._menu_events(not full_redraw):
                 if event.type == p.QUIT:
-                    running = False
-                    p.display.quit()
+                    sys.exit()
+                elif event.type == p.WINDOWEXPOSED:
+                    full_redraw = True
                 elif event.type == p.KEYDOWN:
                     if event.key == p.K_ESCAPE:
-                        running = False
-                        self.draw_play_menu()
+                        return 'main'
                 elif event.type == p.MOUSEBUTTONDOWN:
-                    location = p.mouse.get_pos()
-                    if self.button_easy.is_over(location):
-                        self.controller.set_ai_difficulty(1)
-                        running = False
-                        if is_human_vs_ai:
-                            self.draw_ai_color_menu()
-                        else:
-                            self.draw_ai_vs_ai_menu()
-                    elif self.button_normal.is_over(location):
-                        self.controller.set_ai_difficulty(2)
-                        running = False
-                        if is_human_vs_ai:
-                            self.draw_ai_color_menu()
-                        else:
-                            self.draw_ai_vs_ai_menu()
-                    elif self.button_hard.is_over(location):
-                        self.controller.set_ai_difficulty(3)
-                        running = False
-                        if is_human_vs_ai:
-                            self.draw_ai_color_menu()
-                        else:
-                            self.draw_ai_vs_ai_menu()
+                    page = (page + 1) % len(pages)
+                    full_redraw = True
             
-            # Draw difficulty buttons
-            self.button_easy.draw(self.screen)
-            self.button_normal.draw(self.screen)
-            self.button_hard.draw(self.screen)
-            p.display.flip()
+            if full_redraw:
+                self.screen.blit(pages[page], (0, 0))
+                p.display.flip()
+            full_redraw = False
+
+    def start_game(self, set_mode):
+        """Button action: configure the game mode with set_mode, then play"""
+        set_mode()
+        return 'game'
+
+    def run(self, state='main'):
+        """Show menu screens until the program exits
+
+        Each screen returns the name of the next one, so moving between menus
+        and games never nests calls; closing the window raises SystemExit.
+        """
+        screens = {
+            'main': self.draw_main_menu,
+            'play': self.draw_play_menu,
+            'rules': self.draw_rules_menu,
+            'controls': self.draw_controls_menu,
+            'human_vs_ai_difficulty': lambda: self.draw_difficulty_menu(True),
+            'ai_vs_ai_difficulty': lambda: self.draw_difficulty_menu(False),
+            'ai_color': self.draw_ai_color_menu,
+            'ai_vs_ai': self.draw_ai_vs_ai_menu,
+            'game': self.play_game,
+        }
+        while state:
+            state = screens[state]()
+
+    def play_game(self):
+        """Run the game view until the player returns to the menu"""
+        self.view.main()
+        return 'main'
+
+    def draw_main_menu(self):
+        """Display the main menu"""
+        return self.run_button_menu([
+            (self.buttons['play'], lambda: 'play'),
+            (self.buttons['rules'], lambda: 'rules'),
+            (self.buttons['controls'], lambda: 'controls'),
+        ])
+
+    def draw_play_menu(self):
+        """Display play options menu"""
+        return self.run_button_menu([
+            (self.buttons['pvp'], lambda: self.start_game(self.controller.set_player_vs_player)),
+            (self.buttons['pva'], lambda: 'human_vs_ai_difficulty'),
+            (self.buttons['ai_menu'], lambda: 'ai_vs_ai_difficulty'),
+        ], escape_to='main')
+
+    def draw_difficulty_menu(self, is_human_vs_ai: bool):
+        """Display AI difficulty selection"""
+        next_menu = 'ai_color' if is_human_vs_ai else 'ai_vs_ai'
+
+        def choose(level):
+            self.controller.set_ai_difficulty(level)
+            return next_menu
+
+        return self.run_button_menu([
+            (self.buttons['easy'], lambda: choose(1)),
+            (self.buttons['normal'], lambda: choose(2)),
+            (self.buttons['hard'], lambda: choose(3)),
+        ], escape_to='play')
 
     def draw_ai_color_menu(self):
         """Let player choose AI color"""
-        p.display.init()
-        running = True
-        
-        while running:
-            self.screen.fill(self.constants.DARK_BLUE)
-            self.screen.blit(self.background, p.Rect(0, 0, self.screen_width, self.screen_height))
-            self.screen.blit(self.image, (
-                (self.constants.WIDTH + self.constants.SIDE_SCREEN - self.image.get_width())//2, 25
-            ))
-            
-            for event in p.event.get():
-                if event.type == p.QUIT:
-                    running = False
-                    p.display.quit()
-                elif event.type == p.KEYDOWN:
-                    if event.key == p.K_ESCAPE:
-                        running = False
-                        self.draw_play_menu()
-                elif event.type == p.MOUSEBUTTONDOWN:
-                    location = p.mouse.get_pos()
-                    if self.button_ai_black.is_over(location):
-                        self.controller.set_ai_black()
-                        running = False
-                        self.view.main()
-                        p.display.quit()
-                    elif self.button_ai_white.is_over(location):
-                        self.controller.set_ai_white()
-                        running = False
-                        self.view.main()
-                        p.display.quit()
-            
-            self.button_ai_black.draw(self.screen)
-            self.button_ai_white.draw(self.screen)
-            p.display.flip()
+        return self.run_button_menu([
+            (self.buttons['ai_black'], lambda: self.start_game(self.controller.set_ai_black)),
+            (self.buttons['ai_white'], lambda: self.start_game(self.controller.set_ai_white)),
+        ], escape_to='play')
 
     def draw_ai_vs_ai_menu(self):
         """AI vs AI options"""
-        p.display.init()
-        running = True
-        
-        while running:
-            self.screen.fill(self.constants.DARK_BLUE)
-            self.screen.blit(self.background, p.Rect(0, 0, self.screen_width, self.screen_height))
-            self.screen.blit(self.image, (
-                (self.constants.WIDTH + self.constants.SIDE_SCREEN - self.image.get_width())//2, 25
-            ))
-            
-            for event in p.event.get():
-                if event.type == p.QUIT:
-                    running = False
-                    p.display.quit()
-                elif event.type == p.KEYDOWN:
-                    if event.key == p.K_ESCAPE:
-                        running = False
-                        self.draw_play_menu()
-                elif event.type == p.MOUSEBUTTONDOWN:
-                    location = p.mouse.get_pos()
-                    if self.button_ai_random.is_over(location):
-                        self.controller.set_random_vs_ai()
-                        running = False
-                        self.view.main()
-                        p.display.quit()
-                    elif self.button_ai_ai.is_over(location):
-                        self.controller.set_ai_vs_ai()
-                        running = False
-                        self.view.main()
-                        p.display.quit()
-            
-            self.button_ai_random.draw(self.screen)
-            self.button_ai_ai.draw(self.screen)
-            p.display.flip()
+        return self.run_button_menu([
+            (self.buttons['ai_random'], lambda: self.start_game(self.controller.set_random_vs_ai)),
+            (self.buttons['ai_ai'], lambda: self.start_game(self.controller.set_ai_vs_ai)),
+        ], escape_to='play')
 
-    def draw_rules_menu(self):
-        """Display chess rules"""
-        p.init()
-        running = True
-        font = p.font.SysFont('Arial', 24)
-        flag = True
+    def render_text_pages(self, pages, title, headings, color, background_color) -> list:
+        """Render each page of a text menu once onto its own full-window surface
 
-        
-        while running:
-            self.screen.fill(self.constants.DARK_BLUE)
-            if flag:
-                rules_text = [
-                    "CHESS RULES",
-                    "",
-                    "OBJECTIVE: Checkmate the opponent's king",
-                    "",
-                    "PIECE MOVEMENTS:",
-                    "• Pawn: Forward 1, or 2 on first move",
-                    "• Rook: Horizontal and vertical lines", 
-                    "• Bishop: Diagonal lines",
-                    "• Knight: L-shape (2+1 squares)",
-                    "• Queen: Any direction, any distance",
-                    "• King: One square in any direction",
-                    "",
-                    "Click for next page"
-                    ""
-                ]
-            else:
-                rules_text=[
-                "SPECIAL MOVES:",
-                "• Castling: King and rook move together",
-                "• En passant: Pawn captures sideways",
-                "• Promotion: Pawn reaches end of board",
-                "",
-                "Press ESCAPE to return to menu"]
-            
-            for event in p.event.get():
-                if event.type == p.QUIT:
-                    running = False
-                    p.quit()
-                elif event.type == p.KEYDOWN:
-                    if event.key == p.K_ESCAPE:
-                        running = False
-                        self.draw_main_menu()
-                elif event.type == p.MOUSEBUTTONDOWN:
-                    flag = not flag
-            
-            # Draw rules text
+        The title line gets the large bold font and lines starting with one of
+        the headings the smaller bold one; blank lines only take up space.
+        """
+        font = p.font.SysFont('Arial', 24)
+        title_font = p.font.SysFont('Arial', 32, bold=True)
+        heading_font = p.font.SysFont('Arial', 26, bold=True)
+        rendered = []
+        for page in pages:
+            surface = p.Surface(self.screen.get_size()).convert()
+            surface.fill(background_color)
             y_offset = 50
-            for line in rules_text:
-                if line.startswith("CHESS RULES"):
-                    text_surface = p.font.SysFont('Arial', 32, bold=True).render(line, True, self.constants.WHITE)
-                elif line.startswith(("OBJECTIVE:", "PIECE MOVEMENTS:", "SPECIAL MOVES:")):
-                    text_surface = p.font.SysFont('Arial', 26, bold=True).render(line, True, self.constants.WHITE)
-                else:
-                    text_surface = font.render(line, True, self.constants.WHITE)
-                
-                self.screen.blit(text_surface, (50, y_offset))
+            for line in page:
+                if line:
+                    if line.startswith(title):
+                        line_font = title_font
+                    elif line.startswith(headings):
+                        line_font = heading_font
+                    else:
+                        line_font = font
+                    surface.blit(line_font.render(line, True, color), (50, y_offset))
                 y_offset += 30
-            
-            p.display.flip()
+            rendered.append(surface)
+        return rendered
+
+    def draw_rules_menu(self):
+        """Display chess rules"""
+        if self._rules_pages is None:
+            self._rules_pages = self.render_text_pages(
+                self.RULES_TEXT, "CHESS RULES",
+                ("OBJECTIVE:", "PIECE MOVEMENTS:", "SPECIAL MOVES:"),
+                self.constants.WHITE, self.constants.DARK_BLUE
+            )
+        return self.run_text_menu(self._rules_pages)
 
     def draw_controls_menu(self):
         """Display game controls"""
-        p.display.init()
-        running = True
-        font = p.font.SysFont('Arial', 24)
-        flag = True
-
-        
-        while running:
-            self.screen.fill(self.constants.WHITE)
-            if flag:
-                controls_text = [
-                    "GAME CONTROLS",
-                    "",
-                    "MOUSE:",
-                    "• Click to select piece",
-                    "• Click destination to move",
-                    "• Click save/load buttons",
-                    "",
-                    "KEYBOARD:",
-                    "• Z - Undo last move",
-                    "• R - Reset game", 
-                    "• ESC - Return to menu",
-                    "",
-                    "Click for next page"
-                    ]
-            else:
-                controls_text= [
-                "PAWN PROMOTION:",
-                "• Click Q, R, B, or N when prompted",
-                "",
-                "Press ESCAPE to return to menu"
-                    ]
-            
-            for event in p.event.get():
-                if event.type == p.QUIT:
-                    running = False
-                    p.display.quit()
-                elif event.type == p.KEYDOWN:
-                    if event.key == p.K_ESCAPE:
-                        running = False
-                        self.draw_main_menu()
-                elif event.type == p.MOUSEBUTTONDOWN:
-                    flag = not flag
-            
-            # Draw controls text
-            y_offset = 50
-            for line in controls_text:
-                if line.startswith("GAME CONTROLS"):
-                    text_surface = p.font.SysFont('Arial', 32, bold=True).render(line, True, self.constants.BLACK)
-                elif line.startswith(("MOUSE:", "KEYBOARD:", "PAWN PROMOTION:")):
-                    text_surface = p.font.SysFont('Arial', 26, bold=True).render(line, True, self.constants.BLACK)
-                else:
-                    text_surface = font.render(line, True, self.constants.BLACK)
-                
-                self.screen.blit(text_surface, (50, y_offset))
-                y_offset += 30
-            
-            p.display.flip()
\ No newline at end of file
+        if self._controls_pages is None:
+            self._controls_pages = self.render_text_pages(
+                self.CONTROLS_TEXT, "GAME CONTROLS",
+                ("MOUSE:", "KEYBOARD:", "PAWN PROMOTION:"),
+                self.constants.BLACK, self.constants.WHITE
+            )
+        return self.run_text_menu(self._controls_pages)
@@ -2,6 +2,18 @@
 
 import pygame as p
 
+# Fonts shared by every button, keyed by (name, size)
+_FONT_CACHE = {}
+
+
+def get_font(name, size):
+    """Return the SysFont for name/size, creating it on first use"""
+    font = _FONT_CACHE.get((name, size))
+    if font is None:
+        font = _FONT_CACHE[(name, size)] = p.font.SysFont(name, size)
+    return font
+
+
 class Button:
     def __init__(self, color, x, y, width, height, text=''):
         """Button class for UI elements"""
@@ -11,23 +23,26 @@ class Button:
         self.width = width
         self.height = height
         self.text = text
+        self.rect = p.Rect(x, y, width, height)
+        self.outline_rect = p.Rect(x-2, y-2, width+4, height+4)
+        # Rendered label and where it goes, filled in by the first draw
+        self.text_surface = None
+        self.text_pos = None
 
     def draw(self, win, outline=None):
         """Draw the button on the screen"""
         if outline:
-            p.draw.rect(win, outline, (self.x-2, self.y-2, self.width+4, self.height+4), 0)
-            
-        p.draw.rect(win, self.color, (self.x, self.y, self.width, self.height), 0)
-        
+            p.draw.rect(win, outline, self.outline_rect, 0)
+
+        p.draw.rect(win, self.color, self.rect, 0)
+
         if self.text != '':
-            font = p.font.SysFont('garamond', 40)
-            text = font.render(self.text, 1, (255, 255, 255))
-            win.blit(text, (self.x + (self.width/2 - text.get_width()/2), 
-                           self.y + (self.height/2 - text.get_height()/2)))
+            if self.text_surface is None:
+                self.text_surface = get_font('garamond', 40).render(self.text, 1, (255, 255, 255))
+                self.text_pos = (self.x + (self.width/2 - self.text_surface.get_width()/2),
+                                 self.y + (self.height/2 - self.text_surface.get_height()/2))
+            win.blit(self.text_surface, self.text_pos)
 
     def is_over(self, pos):
         """Check if position is over the button"""
-        if pos[0] > self.x and pos[0] < self.x + self.width:
-            if pos[1] > self.y and pos[1] < self.y + self.height:
-                return True
-        return False
\ No newline at end of file
+        return self.rect.collidepoint(pos)